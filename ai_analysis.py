@@ -0,0 +1,195 @@
+"""
+Analisis kondisi ternak dengan model bahasa untuk dashboard Streamlit (main.py).
+
+Hasil analisis di-cache berdasarkan jenis ternak dan snapshot data terbaru yang
+dikuantisasi, sehingga klik berulang pada data yang belum berubah tidak memakai
+kuota API. Permintaan yang sama dari beberapa sesi sekaligus hanya memicu satu
+panggilan ke model (single-flight). Backend bisa diganti, misalnya ke server
+model palsu lokal (fake_model_server.py) saat pengujian.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# Lama hasil analisis dianggap masih berlaku (detik)
+ANALYSIS_TTL_SECONDS = 600
+
+# Resolusi kuantisasi tiap parameter; perubahan lebih kecil dianggap data yang sama
+QUANTIZATION_STEPS = {
+    "suhu": 0.5,
+    "kelembapan": 2.0,
+    "kualitas_udara": 10.0,
+    "jarak_pakan": 1.0,
+}
+
+
+def quantize(value, step):
+    """Bulatkan value ke kelipatan step terdekat"""
+    return round(round(float(value) / step) * step, 6)
+
+
+def snapshot_key(ternak, readings, activity):
+    """Kunci cache: jenis ternak + pembacaan sensor terkuantisasi + aktivitas"""
+    quantized = tuple(sorted(
+        (name, quantize(value, QUANTIZATION_STEPS.get(name, 1.0)))
+        for name, value in readings.items()
+    ))
+    return ternak, quantized, str(activity).strip().lower()
+
+
+def build_prompt(ternak, readings, activity):
+    """Prompt analisis dalam format Markdown untuk model bahasa"""
+    jarak_pakan = f"- Jarak Pakan: {readings['jarak_pakan']} cm" if "jarak_pakan" in readings else ""
+    return f"""
+    Analisis kondisi ternak {ternak.capitalize()} berdasarkan data berikut:
+
+    **Data Sensor:**
+    - Suhu: {readings.get('suhu')}°C
+    - Kelembapan: {readings.get('kelembapan')}%
+    - Kualitas Udara: {readings.get('kualitas_udara')} ppm
+    {jarak_pakan}
+
+    **Aktivitas Terdeteksi:**
+    - {activity}
+
+    Berikan analisis dalam format Markdown yang terstruktur dengan bagian:
+
+    ## Status Kesehatan
+    *[sehat/waspada/kritis]* - Deskripsi singkat status kesehatan ternak.
+
+    ## Indikator Utama
+    *Jelaskan parameter yang paling perlu diperhatikan dengan format bullet points*
+
+    ## Rekomendasi Tindakan
+    *Minimal 3 poin tindakan konkret dengan format numbered list*
+    1. Tindakan pertama
+    2. Tindakan kedua
+    3. Tindakan ketiga
+
+    ## Antisipasi
+    *Langkah-langkah antisipasi dengan format bullet points*
+
+    Gunakan format Markdown dengan heading, list, dan emphasis. Pastikan responsmu terstruktur sesuai format di atas.
+    """
+
+
+class GeminiBackend:
+    """Backend Google Gemini; klien dibuat sekali dan dipakai ulang"""
+
+    def __init__(self, api_key, model=DEFAULT_MODEL):
+        from google import genai
+
+        self.model = model
+        self.client = genai.Client(api_key=api_key)
+
+    def generate(self, prompt):
+        response = self.client.models.generate_content(model=self.model, contents=prompt)
+        return response.text
+
+
+class HttpBackend:
+    """Backend HTTP sederhana: POST {"model", "prompt"} -> {"text"}.
+
+    Dipakai untuk server model lokal, misalnya fake_model_server.py saat pengujian.
+    """
+
+    def __init__(self, url, model=DEFAULT_MODEL, timeout=60):
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def generate(self, prompt):
+        response = self.session.post(self.url, json={"model": self.model, "prompt": prompt},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["text"]
+
+
+def create_backend(kind="gemini", api_key=None, url=None, model=DEFAULT_MODEL):
+    """Buat backend berdasarkan nama: 'gemini' atau 'http'"""
+    if kind == "gemini":
+        return GeminiBackend(api_key, model)
+    if kind == "http":
+        if not url:
+            raise ValueError("URL backend http belum diatur")
+        return HttpBackend(url, model)
+    raise ValueError(f"Backend AI tidak dikenal: {kind}")
+
+
+class _Pending:
+    """Panggilan ke model yang sedang berjalan untuk satu kunci cache"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.text = None
+        self.error = None
+
+
+class AnalysisCache:
+    """Cache hasil analisis dengan TTL dan single-flight antar sesi.
+
+    Error tidak di-cache, sehingga klik berikutnya akan mencoba lagi.
+    """
+
+    def __init__(self, backend, ttl=ANALYSIS_TTL_SECONDS, max_entries=256):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, ternak, readings, activity):
+        """Kembalikan (teks analisis, True jika berasal dari cache)"""
+        key = snapshot_key(ternak, readings, activity)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1], True
+
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = _Pending()
+                self._inflight[key] = pending
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            # Sesi lain sedang meminta analisis yang sama, tunggu hasilnya
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.text, True
+
+        try:
+            pending.text = self.backend.generate(build_prompt(ternak, readings, activity))
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                if pending.error is None:
+                    self._entries[key] = (time.monotonic(), pending.text)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                del self._inflight[key]
+            pending.event.set()
+        return pending.text, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -8,6 +8,10 @@ from PIL import Image, ImageDraw, ImageFont
 import tempfile
 import logging
 import sys
+import threading
+from tiling import run_tiled_inference, DEFAULT_TILE_SIZE, DEFAULT_TILE_OVERLAP
+from rendering import draw_detections
+from yolo_hub import DEFAULT_WEIGHTS, SPECIES_MODELS, hub_load, hub_source
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO,
@@ -15,87 +19,177 @@ logging.basicConfig(level=logging.INFO,
                    handlers=[logging.StreamHandler(sys.stdout)])
 logger = logging.getLogger(__name__)
 
-# Konfigurasi untuk YOLO
-MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
-os.makedirs(MODEL_DIR, exist_ok=True)
-
+# Konfigurasi untuk YOLO (repo dan bobot lokal, lihat yolo_hub.py)
 # Daftar model yang tersedia
-AVAILABLE_MODELS = {
-    "sapi": os.path.join(MODEL_DIR, "sapi.pt"),
-    "ayam": os.path.join(MODEL_DIR, "ayam.pt"),
-    "kambing": os.path.join(MODEL_DIR, "kambing.pt"),
-    "yolov5s": "yolov5s"  # Model default
-}
+AVAILABLE_MODELS = dict(SPECIES_MODELS, yolov5s="yolov5s")  # yolov5s: model default
 
 # Dictionary untuk menyimpan model yang sudah di-load
 yolo_models = {}
 
+# Status kesiapan tiap model untuk tab Status Sistem
+model_state = {name: "menunggu" for name in AVAILABLE_MODELS}
+model_load_lock = threading.Lock()
+
+# Satu lock per model: batch untuk model yang sama dijalankan bergantian,
+# model yang berbeda boleh berjalan paralel
+model_locks = {}
+model_locks_guard = threading.Lock()
+
+# Pengaturan antrian Gradio: jumlah worker antrian dan ukuran batch maksimum
+QUEUE_CONCURRENCY = int(os.environ.get("FACTS_QUEUE_CONCURRENCY", "2"))
+QUEUE_MAX_SIZE = int(os.environ.get("FACTS_QUEUE_MAX_SIZE", "64"))
+STATUS_REFRESH_SECONDS = 5
+
+# Default checkbox render gambar hasil; nonaktifkan (0) jika hanya butuh JSON
+RENDER_DETECTIONS = os.environ.get("FACTS_RENDER_DETECTIONS", "1") != "0"
+MAX_BATCH_SIZE = int(os.environ.get("FACTS_MAX_BATCH_SIZE", "8"))
+
+def get_model_lock(model_type):
+    with model_locks_guard:
+        return model_locks.setdefault(model_type, threading.Lock())
+
 def load_model(model_type):
-    """Load model YOLO sesuai jenis yang dipilih"""
-    if model_type not in yolo_models:
+    """Load model YOLO sesuai jenis yang dipilih.
+    
+    Model kustom yang tidak ada atau gagal di-load memakai model default yang
+    sama (tidak di-load ulang), sehingga request tidak pernah mengunduh model.
+    """
+    if model_type in yolo_models:
+        return yolo_models[model_type]
+    
+    with model_load_lock:
+        if model_type in yolo_models:
+            return yolo_models[model_type]
+        
+        model_state[model_type] = "memuat"
         logger.info(f"Loading model: {model_type}")
+        model_path = AVAILABLE_MODELS.get(model_type)
         
         # Jika menggunakan model default
         if model_type == "yolov5s":
             try:
-                model = torch.hub.load('ultralytics/yolov5', 'yolov5s', pretrained=True)
-                yolo_models[model_type] = model
+                # Bobot diunduh sekali ke MODEL_DIR lalu dipakai dari cache
+                model = hub_load(DEFAULT_WEIGHTS)
                 logger.info(f"Model {model_type} loaded successfully")
+                model_state[model_type] = "siap"
             except Exception as e:
                 logger.error(f"Error loading default model: {str(e)}")
+                model_state[model_type] = f"gagal: {e}"
                 raise
         # Jika menggunakan model kustom
+        elif model_path and os.path.exists(model_path):
+            try:
+                model = hub_load(model_path)
+                logger.info(f"Custom model {model_type} loaded successfully")
+                model_state[model_type] = "siap"
+            except Exception as e:
+                logger.error(f"Error loading custom model {model_type}: {str(e)}")
+                model = None
         else:
-            model_path = AVAILABLE_MODELS.get(model_type)
-            if os.path.exists(model_path):
-                try:
-                    model = torch.hub.load('ultralytics/yolov5', 'custom', path=model_path)
-                    yolo_models[model_type] = model
-                    logger.info(f"Custom model {model_type} loaded successfully")
-                except Exception as e:
-                    logger.error(f"Error loading custom model {model_type}: {str(e)}")
-                    # Fallback ke model default
-                    model = torch.hub.load('ultralytics/yolov5', 'yolov5s', pretrained=True)
-                    yolo_models[model_type] = model
-                    logger.info(f"Fallback to default model")
-            else:
-                logger.warning(f"Model {model_type} not found at {model_path}, using default")
-                model = torch.hub.load('ultralytics/yolov5', 'yolov5s', pretrained=True)
-                yolo_models[model_type] = model
-                
-    return yolo_models[model_type]
-
-def detect_objects(image, model_type="yolov5s"):
-    """Deteksi objek pada gambar menggunakan model yang dipilih"""
+            logger.warning(f"Model {model_type} not found at {model_path}, using default")
+            model = None
+    
+    if model is None:
+        # Fallback ke model default (lock sudah dilepas, load_model default aman dipanggil)
+        model = load_model("yolov5s")
+        model_state[model_type] = "fallback ke yolov5s"
+        logger.info(f"Fallback to default model")
+    
+    yolo_models[model_type] = model
+    return model
+
+def prewarm_models():
+    """Load semua model di background saat aplikasi mulai"""
+    for model_type in AVAILABLE_MODELS:
+        try:
+            load_model(model_type)
+        except Exception as e:
+            logger.error(f"Prewarm model {model_type} gagal: {str(e)}")
+
+def start_prewarm():
+    thread = threading.Thread(target=prewarm_models, name="model-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+def to_numpy(image):
+    """Gambar input sebagai array numpy RGB (PIL dikonversi, numpy dipakai langsung)"""
+    return np.array(image) if isinstance(image, Image.Image) else image
+
+def format_detections(preds, names):
+    """Ubah prediksi Nx6 (xyxy, conf, cls) menjadi list dict"""
+    detections = []
+    for pred in preds:
+        x1, y1, x2, y2, conf, cls_id = pred
+        detections.append({
+            'class': names[int(cls_id)],
+            'confidence': float(conf),
+            'bbox': [float(x1), float(y1), float(x2), float(y2)]
+        })
+    return detections
+
+def summarize_detections(detections, inference_time, batch_size=1):
+    """Teks ringkasan hasil deteksi untuk ditampilkan"""
+    timing = f"waktu: {inference_time:.2f}s" if batch_size == 1 else f"waktu batch {batch_size} gambar: {inference_time:.2f}s"
+    if not detections:
+        return f"Tidak ada objek yang terdeteksi ({timing})"
+    result_text = f"Terdeteksi {len(detections)} objek ({timing}):\n"
+    for i, det in enumerate(detections, 1):
+        result_text += f"{i}. {det['class']} ({det['confidence']:.2f})\n"
+    return result_text
+
+def detect_batch(images, model_type="yolov5s", render=True):
+    """Deteksi banyak gambar sekaligus dalam satu forward pass model.
+    
+    Mengembalikan list (gambar hasil numpy atau None jika render=False, deteksi)
+    dan waktu inferensi batch.
+    """
+    model = load_model(model_type)
+    images_np = [to_numpy(image) for image in images]
+    
+    with get_model_lock(model_type):
+        start_time = time.time()
+        results = model(images_np)
+        inference_time = time.time() - start_time
+    logger.info(f"Batch inference of {len(images_np)} images completed in {inference_time:.2f} seconds")
+    
+    outputs = []
+    for i, image_np in enumerate(images_np):
+        preds = results.xyxy[i].cpu().numpy()
+        rendered = draw_detections(image_np, preds, results.names) if render else None
+        outputs.append((rendered, format_detections(preds, results.names)))
+    return outputs, inference_time
+
+def detect_objects(image, model_type="yolov5s", tiled=False,
+                   tile_size=DEFAULT_TILE_SIZE, tile_overlap=DEFAULT_TILE_OVERLAP, render=True):
+    """Deteksi objek pada gambar menggunakan model yang dipilih.
+    
+    Jika tiled=True, gambar dipotong menjadi tile yang tumpang tindih dan
+    diproses sebagai satu batch, cocok untuk gambar kamera resolusi tinggi.
+    Dengan render=False gambar hasil tidak dibuat (None), cukup untuk API JSON.
+    """
     try:
         # Load model
         model = load_model(model_type)
         
         # Convert PIL Image ke numpy array jika perlu
-        if isinstance(image, Image.Image):
-            image_np = np.array(image)
-        else:
-            image_np = image
+        image_np = to_numpy(image)
             
         # Jalankan deteksi
-        start_time = time.time()
-        results = model(image_np)
-        inference_time = time.time() - start_time
-        logger.info(f"Inference completed in {inference_time:.2f} seconds")
+        with get_model_lock(model_type):
+            start_time = time.time()
+            if tiled:
+                preds, names = run_tiled_inference(model, image_np, int(tile_size), float(tile_overlap))
+            else:
+                results = model(image_np)
+                preds, names = results.xyxy[0].cpu().numpy(), results.names
+            inference_time = time.time() - start_time
+        logger.info(f"Inference completed in {inference_time:.2f} seconds (tiled: {tiled})")
         
-        # Visualisasi hasil
-        results_image = Image.fromarray(results.render()[0])
+        # Visualisasi hasil langsung pada array numpy dengan OpenCV
+        results_image = draw_detections(image_np, preds, names) if render else None
         
         # Ambil hasil deteksi
-        detections = []
-        for pred in results.xyxy[0].cpu().numpy():
-            x1, y1, x2, y2, conf, cls_id = pred
-            class_name = results.names[int(cls_id)]
-            detections.append({
-                'class': class_name,
-                'confidence': float(conf),
-                'bbox': [float(x1), float(y1), float(x2), float(y2)]
-            })
+        detections = format_detections(preds, names)
             
         return results_image, detections, inference_time
     
@@ -103,46 +197,92 @@ def detect_objects(image, model_type="yolov5s"):
         logger.error(f"Error in detection: {str(e)}")
         return None, [], 0
 
-def process_image(input_image, model_selection):
+def process_image(input_image, model_selection, tiled=False,
+                  tile_size=DEFAULT_TILE_SIZE, tile_overlap=DEFAULT_TILE_OVERLAP, render=True):
     """Fungsi utama untuk memproses gambar"""
     try:
         if input_image is None:
             return None, "Tidak ada gambar yang diupload", None
         
         # Proses deteksi
-        output_image, detections, inference_time = detect_objects(input_image, model_selection)
-        
-        if not detections:
-            result_text = f"Tidak ada objek yang terdeteksi (waktu: {inference_time:.2f}s)"
-        else:
-            result_text = f"Terdeteksi {len(detections)} objek (waktu: {inference_time:.2f}s):\n"
-            for i, det in enumerate(detections, 1):
-                result_text += f"{i}. {det['class']} ({det['confidence']:.2f})\n"
+        output_image, detections, inference_time = detect_objects(
+            input_image, model_selection, tiled, tile_size, tile_overlap, render
+        )
         
-        return output_image, result_text, detections
+        return output_image, summarize_detections(detections, inference_time), detections
     
     except Exception as e:
         logger.error(f"Error processing image: {str(e)}")
         return None, f"Error: {str(e)}", None
 
+def run_batch(input_images, model_selections, tiled_flags, tile_sizes, tile_overlaps, render_flags):
+    """Proses satu batch request, kembalikan list (gambar, teks, deteksi) per request.
+    
+    Request non-tiled dikelompokkan per model (dan flag render) lalu dijalankan
+    dalam satu forward pass; request tiled sudah diproses sebagai batch tile
+    sehingga dijalankan satu per satu.
+    """
+    outputs = [None] * len(input_images)
+    groups = {}
+    for i, (image, model_type, tiled, render) in enumerate(
+            zip(input_images, model_selections, tiled_flags, render_flags)):
+        if image is None:
+            outputs[i] = (None, "Tidak ada gambar yang diupload", None)
+        elif tiled:
+            outputs[i] = process_image(image, model_type, True, tile_sizes[i], tile_overlaps[i], render)
+        else:
+            groups.setdefault((model_type, bool(render)), []).append(i)
+    
+    for (model_type, render), indices in groups.items():
+        try:
+            results, inference_time = detect_batch([input_images[i] for i in indices], model_type, render)
+            for i, (output_image, detections) in zip(indices, results):
+                outputs[i] = (output_image, summarize_detections(detections, inference_time, len(indices)), detections)
+        except Exception as e:
+            logger.error(f"Error in batch detection: {str(e)}")
+            for i in indices:
+                outputs[i] = (None, f"Error: {str(e)}", None)
+    return outputs
+
+def process_image_batch(input_images, model_selections, tiled_flags, tile_sizes, tile_overlaps, render_flags):
+    """Versi batch process_image untuk antrian Gradio (batch=True).
+    
+    Setiap argumen berupa list dengan satu elemen per request.
+    """
+    outputs = run_batch(input_images, model_selections, tiled_flags, tile_sizes, tile_overlaps, render_flags)
+    output_images, result_texts, detections = (list(column) for column in zip(*outputs))
+    return output_images, result_texts, detections
+
+def detect_json_batch(input_images, model_selections, tiled_flags, tile_sizes, tile_overlaps):
+    """Endpoint API JSON saja: hanya list deteksi, tanpa render gambar"""
+    outputs = run_batch(input_images, model_selections, tiled_flags, tile_sizes, tile_overlaps,
+                        [False] * len(input_images))
+    return [[detections for _, _, detections in outputs]]
+
 def check_model_status():
     """Cek status model YOLO"""
     status = {}
     
     for name, path in AVAILABLE_MODELS.items():
         if name == "yolov5s":
-            status[name] = {"available": True, "loaded": name in yolo_models}
+            status[name] = {"available": True, "loaded": name in yolo_models,
+                            "state": model_state.get(name, "menunggu")}
         else:
             status[name] = {
                 "available": os.path.exists(path),
                 "path": path,
-                "loaded": name in yolo_models
+                "loaded": name in yolo_models,
+                "state": model_state.get(name, "menunggu")
             }
     
     # Cek juga versi torch dan sistem
+    repo, source = hub_source()
     system_info = {
         "torch_version": torch.__version__,
-        "cuda_available": torch.cuda.is_available()
+        "cuda_available": torch.cuda.is_available(),
+        "hub_source": source,
+        "hub_repo": repo,
+        "default_weights_cached": os.path.exists(DEFAULT_WEIGHTS)
     }
     
     return {"models": status, "system": system_info}
@@ -152,15 +292,16 @@ def get_system_status():
     status = check_model_status()
     
     status_text = "### Status Model\n\n"
+    ready = sum(1 for info in status["models"].values() if info["loaded"])
+    status_text += f"**Kesiapan**: {ready}/{len(status['models'])} model siap\n\n"
     for name, info in status["models"].items():
-        if name == "yolov5s":
-            status_text += f"- **{name}**: {'✅ Tersedia' if info['available'] else '❌ Tidak tersedia'} | {'✅ Loaded' if info['loaded'] else '❓ Belum diload'}\n"
-        else:
-            status_text += f"- **{name}**: {'✅ Tersedia' if info['available'] else '❌ Tidak tersedia'} | {'✅ Loaded' if info['loaded'] else '❓ Belum diload'}\n"
+        status_text += f"- **{name}**: {'✅ Tersedia' if info['available'] else '❌ Tidak tersedia'} | {'✅' if info['loaded'] else '⏳'} {info['state']}\n"
     
     status_text += "\n### Sistem\n\n"
     status_text += f"- **PyTorch Version**: {status['system']['torch_version']}\n"
     status_text += f"- **CUDA Available**: {'✅ Ya' if status['system']['cuda_available'] else '❌ Tidak'}\n"
+    status_text += f"- **Sumber YOLOv5**: {status['system']['hub_source']} ({status['system']['hub_repo']})\n"
+    status_text += f"- **Bobot yolov5s di cache**: {'✅ Ya' if status['system']['default_weights_cached'] else '❌ Belum'}\n"
     
     return status_text
 
@@ -172,33 +313,62 @@ with gr.Blocks(title="FACTS API - Animal Detection") as demo:
     with gr.Tab("Deteksi Hewan"):
         with gr.Row():
             with gr.Column():
-                input_image = gr.Image(type="pil", label="Upload Gambar")
+                input_image = gr.Image(type="numpy", label="Upload Gambar")
                 model_selection = gr.Dropdown(
                     choices=list(AVAILABLE_MODELS.keys()), 
                     value="yolov5s", 
                     label="Pilih Model"
                 )
+                with gr.Accordion("Mode Tiled (kamera resolusi tinggi)", open=False):
+                    tiled_mode = gr.Checkbox(value=False, label="Aktifkan inferensi tiled")
+                    tile_size = gr.Slider(320, 1280, value=DEFAULT_TILE_SIZE, step=32, label="Ukuran Tile (px)")
+                    tile_overlap = gr.Slider(0.0, 0.5, value=DEFAULT_TILE_OVERLAP, step=0.05, label="Overlap Tile")
+                render_boxes = gr.Checkbox(value=RENDER_DETECTIONS, label="Tampilkan gambar hasil (bounding box)")
                 detect_button = gr.Button("Deteksi Objek", variant="primary")
             
             with gr.Column():
-                output_image = gr.Image(type="pil", label="Hasil Deteksi")
+                output_image = gr.Image(type="numpy", label="Hasil Deteksi")
                 result_text = gr.Textbox(label="Hasil", lines=5)
                 json_output = gr.JSON(label="Detail Deteksi")
         
+        # Urutan pendaftaran event menentukan fn_index yang dipakai klien lama
+        # (facts-dashboard/src/services/api.js): 0 = detect, 1 = status. Event
+        # baru harus didaftarkan setelah keduanya.
+        # Request dari banyak pengguna digabung antrian menjadi satu batch
         detect_button.click(
-            process_image, 
-            inputs=[input_image, model_selection], 
-            outputs=[output_image, result_text, json_output]
+            process_image_batch, 
+            inputs=[input_image, model_selection, tiled_mode, tile_size, tile_overlap, render_boxes], 
+            outputs=[output_image, result_text, json_output],
+            batch=True,
+            max_batch_size=MAX_BATCH_SIZE,
+            api_name="detect"
         )
     
     with gr.Tab("Status Sistem"):
         status_text = gr.Markdown()
         refresh_button = gr.Button("Refresh Status")
-        refresh_button.click(get_system_status, inputs=[], outputs=[status_text])
+        refresh_button.click(get_system_status, inputs=[], outputs=[status_text], api_name="status")
     
-    # Inisialisasi status
-    demo.load(get_system_status, inputs=[], outputs=[status_text])
+    # Inisialisasi status, diperbarui berkala selama model masih di-load
+    demo.load(get_system_status, inputs=[], outputs=[status_text], every=STATUS_REFRESH_SECONDS)
+    
+    # Endpoint API JSON saja (/detect_json): gambar hasil tidak dirender sama sekali.
+    # Didaftarkan paling akhir supaya fn_index event yang sudah ada tidak bergeser.
+    json_api_button = gr.Button(visible=False)
+    json_api_button.click(
+        detect_json_batch,
+        inputs=[input_image, model_selection, tiled_mode, tile_size, tile_overlap],
+        outputs=[json_output],
+        batch=True,
+        max_batch_size=MAX_BATCH_SIZE,
+        api_name="detect_json"
+    )
+
+# Antrian dengan batas concurrency agar request bersamaan tidak berebut model
+demo.queue(concurrency_count=QUEUE_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
 
 # Jalankan aplikasi Gradio
 if __name__ == "__main__":
+    # Model di-load di background supaya request pertama tidak menunggu download/load
+    start_prewarm()
     demo.launch()
\ No newline at end of file
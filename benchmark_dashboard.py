@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# benchmark_dashboard.py
+# Ukur waktu tiap tahap rerun dashboard (main.py) tanpa Streamlit: baca JSON, filter,
+# parse timestamp, ringkasan, dan pembuatan grafik Plotly untuk riwayat besar
+#
+# Jalankan:  python benchmark_dashboard.py --rows 10000 100000 1000000 --repeat 3
+# Profil:    python benchmark_dashboard.py --rows 100000 --profile-dir profiles --profiler pyinstrument
+# Data sintetis ditulis ke folder sementara dengan format yang sama seperti data/sensor_data.json.
+
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from dashboard_charts import (
+    SENSOR_CHARTS, sensor_chart_figure, all_parameters_figure, confidence_figure, hourly_activity_figure
+)
+from dashboard_data import (
+    IncrementalLoader, TIME_WINDOWS, SENSOR_FIELDS, CV_FIELDS, SENSOR_METRICS, CV_METRICS,
+    RECENT_CONFIDENCE_LIMIT, build_typed_frame, filter_records, latest_rows_for_display, species_overview
+)
+
+JENIS_TERNAK = ["ayam", "sapi", "kambing"]
+AKTIVITAS = ["makan", "minum", "berdiri", "berbaring", "berjalan"]
+TEMPLATE = "plotly_white"
+CHART_COLORS = {"success": "green", "error": "red"}
+
+# Tahap satu rerun dashboard yang tidak saling tumpang tindih; json_load, filter_records,
+# dan parse_timestamps adalah rincian loader_cold, loader_warm adalah rerun berikutnya
+TOTAL_STAGES = ("loader_cold", "window_filter", "overview_loader_cold", "species_overview",
+                "latest_rows", "sensor_figures", "cv_loader_cold", "cv_figures", "figure_serialize")
+
+
+def write_synthetic_data(data_dir, rows, interval_seconds=5, seed=0):
+    """Tulis sensor_data.json dan cv_activity.json berisi `rows` record yang berakhir sekarang"""
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(seconds=interval_seconds * rows)
+    sensor, cv = [], []
+    for i in range(rows):
+        timestamp = start + timedelta(seconds=interval_seconds * i)
+        # Campuran format seperti data asli (dengan/tanpa mikrodetik)
+        text = timestamp.isoformat() if i % 3 else timestamp.strftime("%Y-%m-%dT%H:%M:%S")
+        ternak = JENIS_TERNAK[i % len(JENIS_TERNAK)]
+        sensor.append({
+            "ternak": ternak, "timestamp": text,
+            "suhu": round(rng.uniform(25, 38), 2),
+            "kelembapan": round(rng.uniform(40, 90), 2),
+            "kualitas_udara": round(rng.uniform(10, 250), 2),
+            "jarak_pakan": round(rng.uniform(1, 30), 2),
+        })
+        cv.append({
+            "ternak": ternak, "timestamp": text,
+            "aktivitas": AKTIVITAS[i % len(AKTIVITAS)],
+            "confidence": round(rng.uniform(0.4, 1.0), 3),
+            "jumlah": rng.randint(1, 20),
+        })
+    paths = {}
+    for name, records in (("sensor_data.json", sensor), ("cv_activity.json", cv)):
+        paths[name] = os.path.join(data_dir, name)
+        with open(paths[name], "w") as f:
+            json.dump(records, f, indent=2)
+    return paths["sensor_data.json"], paths["cv_activity.json"]
+
+
+def run_pipeline(sensor_file, cv_file, ternak, window_label, max_rows):
+    """Satu rerun dashboard, dikembalikan sebagai {tahap: detik}"""
+    timings = {}
+
+    def stage(name, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings[name] = time.perf_counter() - start
+        return result
+
+    def read_json(path):
+        with open(path) as f:
+            return json.load(f)
+
+    # Tahap-tahap yang dikerjakan IncrementalLoader._fetch_json, diukur terpisah
+    data = stage("json_load", read_json, sensor_file)
+    filtered = stage("filter_records", filter_records, data, ternak, SENSOR_FIELDS, max_rows)
+    stage("parse_timestamps", build_typed_frame, filtered, SENSOR_METRICS)
+
+    # Loader seperti yang dipakai main.py: muat awal lalu rerun tanpa data baru
+    loader = IncrementalLoader(json_path=sensor_file, ternak=ternak, fields=SENSOR_FIELDS,
+                               metrics=SENSOR_METRICS, max_rows=max_rows)
+    frame = stage("loader_cold", loader.load)
+    stage("loader_warm", loader.load)
+
+    window = TIME_WINDOWS[window_label]
+    if window is not None:
+        frame = stage("window_filter", lambda: frame[frame.index >= datetime.now() - window])
+
+    # Mode ringkasan: satu loader tanpa filter ternak + satu groupby
+    overview_loader = IncrementalLoader(json_path=sensor_file, ternak=None, fields=SENSOR_FIELDS,
+                                        metrics=SENSOR_METRICS, max_rows=max_rows)
+    all_frame = stage("overview_loader_cold", overview_loader.load)
+    stage("species_overview", species_overview, all_frame)
+    stage("latest_rows", latest_rows_for_display, frame, 5)
+
+    def build_sensor_figures():
+        figures = [sensor_chart_figure(frame, chart, ternak, TEMPLATE, CHART_COLORS) for chart in SENSOR_CHARTS]
+        figures.append(all_parameters_figure(frame, title=f"Semua Parameter untuk {ternak.capitalize()}",
+                                             template=TEMPLATE))
+        return figures
+
+    figures = stage("sensor_figures", build_sensor_figures)
+
+    cv_loader = IncrementalLoader(json_path=cv_file, ternak=ternak, fields=CV_FIELDS,
+                                  metrics=CV_METRICS, max_rows=max_rows)
+    cv_frame = stage("cv_loader_cold", cv_loader.load)
+
+    def build_cv_figures():
+        recent = cv_frame.tail(RECENT_CONFIDENCE_LIMIT)
+        return [
+            confidence_figure(recent.index, recent["confidence"], template=TEMPLATE, color="blue",
+                              y_label="Confidence (%)", marker_size=10),
+            hourly_activity_figure(cv_loader.hourly_counts(), title="Aktivitas per Jam",
+                                   template=TEMPLATE, color="orange"),
+        ]
+
+    figures += stage("cv_figures", build_cv_figures)
+    # st.plotly_chart mengirim figure sebagai JSON ke browser
+    stage("figure_serialize", lambda: [figure.to_json() for figure in figures])
+    timings["total"] = sum(timings.get(name, 0.0) for name in TOTAL_STAGES)
+    return timings
+
+
+def profile_pipeline(profiler, output_prefix, pipeline_args, top=30):
+    """Jalankan satu pipeline di bawah profiler dan simpan laporannya"""
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument tidak terpasang (pip install pyinstrument), memakai cProfile")
+        else:
+            profile = Profiler()
+            profile.start()
+            run_pipeline(*pipeline_args)
+            profile.stop()
+            path = f"{output_prefix}.html"
+            with open(path, "w") as f:
+                f.write(profile.output_html())
+            return [path]
+
+    profile = cProfile.Profile()
+    profile.enable()
+    run_pipeline(*pipeline_args)
+    profile.disable()
+    profile.dump_stats(f"{output_prefix}.prof")
+    text = io.StringIO()
+    pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(top)
+    with open(f"{output_prefix}.txt", "w") as f:
+        f.write(text.getvalue())
+    return [f"{output_prefix}.prof", f"{output_prefix}.txt"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tahap data dan grafik dashboard Streamlit")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="Jumlah record sintetis per file")
+    parser.add_argument("--ternak", default="sapi", choices=JENIS_TERNAK)
+    parser.add_argument("--window", default="Semua", choices=list(TIME_WINDOWS))
+    parser.add_argument("--max-rows", type=int, default=None,
+                        help="Batas baris loader (dashboard memakai MAX_CACHED_ROWS; default tanpa batas)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profile-dir", help="Simpan laporan profiler per ukuran data ke folder ini")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile")
+    parser.add_argument("--output", default="dashboard_benchmark.json")
+    args = parser.parse_args()
+
+    report = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "ternak": args.ternak,
+              "window": args.window, "results": {}}
+    if args.profile_dir:
+        os.makedirs(args.profile_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="facts-dashboard-") as data_dir:
+        for rows in args.rows:
+            print(f"\n📦 {rows} record: membuat data sintetis...")
+            sensor_file, cv_file = write_synthetic_data(data_dir, rows)
+            pipeline_args = (sensor_file, cv_file, args.ternak, args.window, args.max_rows or rows)
+
+            runs = [run_pipeline(*pipeline_args) for _ in range(args.repeat)]
+            stages = {}
+            for name in runs[0]:
+                values = np.array([run[name] for run in runs]) * 1000
+                stages[name] = {"median_ms": float(np.median(values)), "min_ms": float(values.min())}
+                print(f"  {name:>18}: {stages[name]['median_ms']:9.1f} ms (min {stages[name]['min_ms']:.1f})")
+            result = {"file_bytes": os.path.getsize(sensor_file), "stages": stages}
+
+            if args.profile_dir:
+                prefix = os.path.join(args.profile_dir, f"dashboard_{rows}")
+                result["profiles"] = profile_pipeline(args.profiler, prefix, pipeline_args)
+                print(f"  🔍 Profil: {', '.join(result['profiles'])}")
+            report["results"][str(rows)] = result
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil benchmark disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# benchmark_ingestion.py
+# Benchmark jalur ingest server.py: save_to_json, /sensor-data, dan /cv-activity
+# terhadap ukuran riwayat (1k, 100k, 1M record) dan penyimpanan JSON / MongoDB
+#
+# Jalankan:  python benchmark_ingestion.py --sizes 1000 100000 1000000 --requests 50
+# MongoDB:   mongod --dbpath /tmp/facts-mongo --port 27018 &
+#            python benchmark_ingestion.py --stores json mongo --mongo-uri mongodb://127.0.0.1:27018/
+#            (--mongo-uri mongomock:// memakai mongomock in-process jika terpasang)
+#
+# Mode:
+#   direct  -> memanggil server.save_to_json langsung (tanpa HTTP)
+#   client  -> Flask test client (routing + handler, tanpa socket)
+#   wsgi    -> server WSGI werkzeug sungguhan di thread terpisah, diakses via HTTP
+# Klien dan server berjalan di proses yang sama, jadi CPU dan byte I/O mode wsgi ikut
+# menghitung sisi klien (termasuk byte socket loopback di rchar/wchar).
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+JENIS_TERNAK = ["sapi", "ayam", "kambing"]
+AKTIVITAS = ["makan", "minum", "berdiri", "berbaring", "berjalan"]
+ENDPOINTS = {"sensor": "/sensor-data", "cv": "/cv-activity"}
+MODES = ["direct", "client", "wsgi"]
+MONGO_BENCH_DB = "facts_benchmark"
+FILL_CHUNK = 10000
+
+
+def make_record(kind, i, timestamp=None):
+    """Record sintetis dengan bentuk yang sama seperti kiriman simulator/kamera"""
+    rng = random.Random(i)
+    record = {"ternak": JENIS_TERNAK[i % len(JENIS_TERNAK)]}
+    if kind == "sensor":
+        record.update({
+            "suhu": round(rng.uniform(25, 35), 2),
+            "kelembapan": round(rng.uniform(50, 90), 2),
+            "kualitas_udara": round(rng.uniform(10, 200), 2),
+            "jarak_pakan": round(rng.uniform(5, 50), 2),
+        })
+    else:
+        record.update({
+            "aktivitas": AKTIVITAS[i % len(AKTIVITAS)],
+            "confidence": round(rng.uniform(0.5, 1.0), 3),
+            "jumlah": rng.randint(1, 20),
+        })
+    if timestamp is not None:
+        record["timestamp"] = timestamp
+    return record
+
+
+def history(kind, count):
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        yield make_record(kind, i, (start + timedelta(seconds=5 * i)).isoformat())
+
+
+def proc_io():
+    """Byte I/O proses dari /proc/self/io (Linux): rchar/wchar = byte yang dibaca/ditulis lewat syscall"""
+    try:
+        with open("/proc/self/io") as f:
+            values = dict(line.split(": ") for line in f.read().splitlines())
+        return int(values["rchar"]), int(values["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def connect_mongo(uri):
+    if uri.startswith("mongomock://"):
+        import mongomock
+        return mongomock.MongoClient()
+    from pymongo import MongoClient
+    client = MongoClient(uri, serverSelectionTimeoutMS=3000)
+    client.admin.command('ping')
+    return client
+
+
+def prepare_store(server, store, size, mongo_db):
+    """Isi riwayat sebanyak `size` record di penyimpanan yang diuji.
+
+    Store json: seluruh riwayat ada di file JSON (max_entries dinaikkan agar tidak dipotong).
+    Store mongo: riwayat di koleksi MongoDB, file JSON tetap buffer 100 record seperti produksi.
+    """
+    files = {"sensor": server.SENSOR_FILE, "cv": server.CV_FILE}
+    json_size = size if store == "json" else 0
+    server.config["DATA"] = {"max_entries": str(max(json_size * 2, 100))}
+    for kind, path in files.items():
+        with open(path, "w") as f:
+            json.dump(list(history(kind, json_size)), f, indent=2)
+
+    server.MONGO_ENABLED = store == "mongo"
+    server.mongo_sensor_collection = server.mongo_cv_collection = None
+    if store == "mongo":
+        collections = {"sensor": mongo_db["sensor_data"], "cv": mongo_db["cv_activity"]}
+        for kind, collection in collections.items():
+            collection.drop()
+            collection.create_index([("ternak", 1), ("_id", -1)])
+            chunk = []
+            for record in history(kind, size):
+                record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+                chunk.append(record)
+                if len(chunk) == FILL_CHUNK:
+                    collection.insert_many(chunk)
+                    chunk = []
+            if chunk:
+                collection.insert_many(chunk)
+        server.mongo_sensor_collection = collections["sensor"]
+        server.mongo_cv_collection = collections["cv"]
+    return {kind: os.path.getsize(path) for kind, path in files.items()}
+
+
+def measure(send, requests, batch, max_seconds):
+    """Jalankan `send()` berulang, ukur latency, throughput, CPU, dan byte I/O"""
+    latencies = []
+    io_start = proc_io()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for _ in range(requests):
+        request_start = time.perf_counter()
+        send()
+        latencies.append((time.perf_counter() - request_start) * 1000)
+        # Riwayat besar di store JSON bisa butuh detik per request; batasi durasi skenario
+        if time.perf_counter() - start > max_seconds and len(latencies) >= 3:
+            break
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    io_end = proc_io()
+
+    latencies = np.array(latencies)
+    readings = len(latencies) * batch
+    result = {
+        "requests": len(latencies),
+        "readings": readings,
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+        "latency_ms_p99": float(np.percentile(latencies, 99)),
+        "requests_per_s": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "readings_per_s": readings / elapsed if elapsed > 0 else 0.0,
+        "cpu_ms_per_reading": cpu * 1000 / readings,
+    }
+    if io_start and io_end:
+        result["read_bytes_per_request"] = (io_end[0] - io_start[0]) / len(latencies)
+        result["write_bytes_per_request"] = (io_end[1] - io_start[1]) / len(latencies)
+    return result
+
+
+class WsgiServer:
+    """Server werkzeug sungguhan di thread daemon pada port acak"""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def make_sender(server, mode, kind, batch, client=None, session=None, base_url=None):
+    counter = iter(range(10 ** 9))
+
+    def payload():
+        records = [make_record(kind, next(counter)) for _ in range(batch)]
+        return records if batch > 1 else records[0]
+
+    if mode == "direct":
+        path = server.SENSOR_FILE if kind == "sensor" else server.CV_FILE
+
+        def send():
+            records = [make_record(kind, next(counter), datetime.now().isoformat()) for _ in range(batch)]
+            if not server.save_to_json(records, path):
+                raise RuntimeError(f"save_to_json gagal untuk {path}")
+        return send
+
+    def check(status):
+        if status != 200:
+            raise RuntimeError(f"{ENDPOINTS[kind]} membalas HTTP {status}")
+
+    if mode == "client":
+        return lambda: check(client.post(ENDPOINTS[kind], json=payload()).status_code)
+    return lambda: check(session.post(base_url + ENDPOINTS[kind], json=payload(), timeout=120).status_code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jalur ingest data sensor dan CV di server.py")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000],
+                        help="Jumlah record riwayat yang sudah tersimpan")
+    parser.add_argument("--stores", nargs="+", choices=["json", "mongo"], default=["json"])
+    parser.add_argument("--mongo-uri", default="mongodb://127.0.0.1:27017/",
+                        help="mongod lokal untuk store mongo, atau mongomock://")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--kinds", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=50, help="Request per skenario")
+    parser.add_argument("--batch", type=int, default=1, help="Jumlah reading per request")
+    parser.add_argument("--max-seconds", type=float, default=60,
+                        help="Batas durasi per skenario (minimal 3 request tetap dijalankan)")
+    parser.add_argument("--data-dir", help="Folder data sementara (default: temp dir baru)")
+    parser.add_argument("--output", default="ingestion_benchmark.json")
+    args = parser.parse_args()
+
+    # server.py membaca FACTS_DATA_DIR saat di-import; jangan sentuh folder data asli
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="facts-ingest-")
+    os.environ["FACTS_DATA_DIR"] = data_dir
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import server
+    # Log INFO per request akan mendominasi waktu dan output benchmark
+    for name in (None, server.logger.name, "werkzeug"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    mongo_db = None
+    if "mongo" in args.stores:
+        try:
+            mongo_db = connect_mongo(args.mongo_uri)[MONGO_BENCH_DB]
+        except Exception as e:
+            print(f"❌ MongoDB tidak tersedia di {args.mongo_uri}: {e}")
+            args.stores = [store for store in args.stores if store != "mongo"]
+
+    session = None
+    if "wsgi" in args.modes:
+        import requests
+        session = requests.Session()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "data_dir": data_dir,
+        "batch": args.batch,
+        "results": [],
+    }
+    client = server.app.test_client()
+    with WsgiServer(server.app) as wsgi:
+        for store in args.stores:
+            for size in args.sizes:
+                print(f"\n📦 Store {store}, riwayat {size} record: menyiapkan data...")
+                fill_start = time.perf_counter()
+                file_sizes = prepare_store(server, store, size, mongo_db)
+                print(f"   selesai dalam {time.perf_counter() - fill_start:.1f} s "
+                      f"(file sensor {file_sizes['sensor'] / 1e6:.1f} MB)")
+
+                for mode in args.modes:
+                    if mode == "direct" and store == "mongo":
+                        continue  # save_to_json tidak menyentuh MongoDB
+                    for kind in args.kinds:
+                        send = make_sender(server, mode, kind, args.batch, client=client,
+                                           session=session, base_url=wsgi.url)
+                        try:
+                            result = measure(send, args.requests, args.batch, args.max_seconds)
+                        except Exception as e:
+                            print(f"   ❌ {mode}/{kind}: {e}")
+                            report["results"].append({"store": store, "size": size, "mode": mode,
+                                                      "kind": kind, "error": str(e)})
+                            continue
+                        result.update({"store": store, "size": size, "mode": mode, "kind": kind,
+                                       "file_bytes": file_sizes[kind]})
+                        report["results"].append(result)
+                        print(f"   {mode:>6}/{kind:<6}: p50 {result['latency_ms_p50']:.2f} ms | "
+                              f"p95 {result['latency_ms_p95']:.2f} ms | "
+                              f"{result['readings_per_s']:.1f} reading/s | "
+                              f"CPU {result['cpu_ms_per_reading']:.2f} ms/reading | "
+                              f"tulis {result.get('write_bytes_per_request', 0) / 1e3:.1f} KB/request")
+
+    if mongo_db is not None:
+        mongo_db.client.drop_database(MONGO_BENCH_DB)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil benchmark disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# benchmark_models.py
+# Benchmark offline model deteksi: waktu load, latency, throughput, dan memori puncak
+#
+# Jalankan:  python benchmark_models.py --models sapi ayam kambing --resolutions 640x480 1920x1080 \
+#                --batch-sizes 1 4 --threads 1 4 --baseline models_baseline.json
+# Tanpa jaringan: butuh models/yolov5 (clone repo YOLOv5) atau cache hub di models/hub,
+# lihat yolo_hub.py. Frame sintetis dibuat per resolusi; --images menambah frame lokal.
+# "Backend" yang diuji adalah device PyTorch (cpu, cuda) karena hanya runtime ini yang dipakai.
+# Setiap model/device dijalankan di proses baru agar memori puncak tidak terbawa dari model sebelumnya.
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from yolo_hub import hub_load, hub_source, model_path
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# Kenaikan latency p95 / penurunan throughput (%) yang dianggap regresi
+REGRESSION_THRESHOLD = 10.0
+
+
+def peak_rss_mb():
+    """Memori puncak proses ini (MB), None jika tidak bisa diukur di platform ini.
+
+    ru_maxrss tidak pernah turun, jadi nilainya hanya bermakna per proses benchmark_model.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def synthetic_frames(width, height, count, seed=0):
+    """Frame RGB acak dengan beberapa kotak terang agar model punya kandidat deteksi"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(0, 80, (height, width, 3), dtype=np.uint8)
+        for _ in range(5):
+            w, h = rng.integers(width // 10, width // 4), rng.integers(height // 10, height // 4)
+            x, y = rng.integers(0, width - w), rng.integers(0, height - h)
+            frame[y:y + h, x:x + w] = rng.integers(120, 255, 3, dtype=np.uint8)
+        frames.append(frame)
+    return frames
+
+
+def local_frames(image_dir, count):
+    frames = []
+    for path in sorted(glob.glob(os.path.join(image_dir, "**", "*"), recursive=True)):
+        if not path.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        image = cv2.imread(path)
+        if image is not None:
+            frames.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        if len(frames) >= count:
+            break
+    return frames
+
+
+def run_config(model, frames, batch_size, iterations, warmup):
+    """Ukur latency per batch (ms) untuk satu kombinasi model/resolusi/batch/thread"""
+    batches = [frames[i:i + batch_size] for i in range(0, len(frames), batch_size)]
+    batches = [batch for batch in batches if len(batch) == batch_size] or [frames[:batch_size]]
+    for i in range(warmup):
+        model(batches[i % len(batches)])
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        batch_start = time.perf_counter()
+        model(batches[i % len(batches)])
+        latencies.append((time.perf_counter() - batch_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    return {
+        "iterations": iterations,
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+        "latency_ms_p99": float(np.percentile(latencies, 99)),
+        "latency_ms_mean": float(latencies.mean()),
+        "throughput_fps": iterations * len(batches[0]) / elapsed if elapsed > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def build_frame_sets(args):
+    """Frame sintetis per resolusi (+ frame lokal jika --images diisi)"""
+    frame_sets = {resolution: synthetic_frames(*parse_resolution(resolution), args.frames)
+                  for resolution in args.resolutions}
+    if args.images:
+        frames = local_frames(args.images, args.frames)
+        if frames:
+            frame_sets["local"] = frames
+        else:
+            print(f"⚠️ Tidak ada gambar di {args.images}")
+    return frame_sets
+
+
+def benchmark_model(name, device, args):
+    """Load satu model dan ukur semua konfigurasinya; dijalankan di proses tersendiri.
+
+    Mengembalikan (hasil load, {kunci konfigurasi: hasil}).
+    """
+    model_key = f"{name}/{device}"
+    weights = model_path(name)
+    if not os.path.exists(weights):
+        print(f"❌ Bobot {name} tidak ditemukan di {weights}")
+        return {"error": "weights not found"}, {}
+
+    frame_sets = build_frame_sets(args)
+    # Waktu load pertama (cold): baca bobot, bangun model, fuse layer
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        model = hub_load(weights, device=device)
+    except Exception as e:
+        print(f"❌ Gagal load {model_key}: {e}")
+        return {"error": str(e)}, {}
+    load_s = time.perf_counter() - start
+    load = {"cold_load_s": load_s, "peak_rss_mb": peak_rss_mb(), "peak_rss_mb_before": rss_before}
+    print(f"\n📦 {model_key}: load {load_s:.2f} s")
+
+    results = {}
+    for threads in args.threads:
+        torch.set_num_threads(threads)
+        for resolution, frames in frame_sets.items():
+            for batch_size in args.batch_sizes:
+                key = f"{model_key}/{resolution}/b{batch_size}/t{threads}"
+                try:
+                    result = run_config(model, frames, batch_size, args.iterations, args.warmup)
+                except Exception as e:
+                    results[key] = {"error": str(e)}
+                    print(f"  ❌ {key}: {e}")
+                    continue
+                results[key] = result
+                print(f"  {key:>40}: p50 {result['latency_ms_p50']:.1f} ms | "
+                      f"p95 {result['latency_ms_p95']:.1f} ms | {result['throughput_fps']:.1f} fps | "
+                      f"RSS {result['peak_rss_mb'] or 0:.0f} MB")
+    return load, results
+
+
+def compare_results(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Bandingkan hasil dengan baseline per kunci konfigurasi, kembalikan (baris, ada regresi)"""
+    lines = []
+    regressed = False
+    previous_results = baseline.get("results", {})
+    for key, current in results.items():
+        previous = previous_results.get(key)
+        if previous is None or "error" in current or "error" in previous:
+            continue
+        for metric, direction in (("latency_ms_p95", 1), ("throughput_fps", -1)):
+            old, new = previous[metric], current[metric]
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            worse = change * direction > threshold
+            regressed = regressed or worse
+            if worse:
+                lines.append(f"  ⚠️ {key} {metric}: {old:.2f} -> {new:.2f} ({change:+.1f}%)")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline model deteksi YOLO")
+    parser.add_argument("--models", nargs="+", default=["sapi", "ayam", "kambing"],
+                        help="Nama model (jenis ternak, 'yolov5s') atau path .pt")
+    parser.add_argument("--devices", nargs="+", default=None,
+                        help="Device PyTorch yang diuji (default: cpu, dan cuda jika tersedia)")
+    parser.add_argument("--resolutions", nargs="+", default=["640x480", "1280x720", "1920x1080"])
+    parser.add_argument("--images", help="Folder frame lokal tambahan (resolusi asli)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, torch.get_num_threads()])
+    parser.add_argument("--frames", type=int, default=8, help="Jumlah frame per resolusi")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", default="models_benchmark.json")
+    parser.add_argument("--baseline", help="Hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    devices = args.devices or (["cpu", "cuda"] if torch.cuda.is_available() else ["cpu"])
+
+    repo, source = hub_source()
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "system": {
+            "platform": f"{platform.system()} {platform.release()}",
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "cpu_count": os.cpu_count(),
+            "hub_source": source,
+        },
+        "load": {},
+        "results": {},
+    }
+
+    # spawn: proses baru tanpa salinan memori (dan state CUDA) dari proses induk
+    context = multiprocessing.get_context("spawn")
+    for name in args.models:
+        for device in devices:
+            with context.Pool(processes=1) as pool:
+                load, results = pool.apply(benchmark_model, (name, device, args))
+            report["load"][f"{name}/{device}"] = load
+            report["results"].update(results)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil benchmark disimpan ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        lines, regressed = compare_results(report["results"], baseline)
+        print(f"\n🔍 Dibandingkan dengan {args.baseline}:")
+        print("\n".join(lines) if lines else "  Tidak ada regresi")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# benchmark_render.py
+# Bandingkan waktu inferensi vs waktu render anotasi (results.render + PIL vs renderer OpenCV)
+#
+# Jalankan:  python benchmark_render.py --images <folder gambar> --model yolov5s
+# Tanpa --images, gambar acak dengan ukuran --size dipakai.
+
+import argparse
+import glob
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from rendering import draw_detections
+from yolo_hub import hub_load, model_path
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_images(image_dir, size, count):
+    """Gambar RGB dari folder, atau gambar acak jika folder tidak diberikan"""
+    if not image_dir:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8) for _ in range(count)]
+    images = []
+    for path in sorted(glob.glob(os.path.join(image_dir, "**", "*"), recursive=True)):
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(path)
+            if image is not None:
+                images.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        if len(images) >= count:
+            break
+    return images
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summarize(values):
+    values = np.array(values)
+    return {"mean_ms": float(values.mean()), "p95_ms": float(np.percentile(values, 95))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark render anotasi vs inferensi")
+    parser.add_argument("--images", help="Folder gambar (default: gambar acak)")
+    parser.add_argument("--model", default="yolov5s", help="Path model .pt atau 'yolov5s'")
+    parser.add_argument("--size", type=int, nargs=2, default=[1280, 720], help="Ukuran gambar acak (w h)")
+    parser.add_argument("--count", type=int, default=50, help="Jumlah gambar yang diuji")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", default="render_benchmark.json")
+    args = parser.parse_args()
+
+    # Bobot lokal lewat yolo_hub agar tidak bergantung pada jaringan
+    model = hub_load(model_path(args.model))
+
+    images = load_images(args.images, args.size, args.count)
+    if not images:
+        print(f"❌ Tidak ada gambar di {args.images}")
+        return
+
+    for _ in range(args.warmup):
+        model(images[0])
+
+    stages = {"inference": [], "render_pil": [], "render_cv2": [], "json_only": []}
+    for image in images:
+        results, ms = timed(lambda: model(image))
+        stages["inference"].append(ms)
+        preds = results.xyxy[0].cpu().numpy()
+
+        # Cara lama: results.render() lalu konversi ke PIL
+        _, ms = timed(lambda: Image.fromarray(results.render()[0]))
+        stages["render_pil"].append(ms)
+
+        # Renderer OpenCV langsung pada array numpy
+        _, ms = timed(lambda: draw_detections(image, preds, results.names))
+        stages["render_cv2"].append(ms)
+
+        # Mode JSON: hanya konversi prediksi ke list dict
+        _, ms = timed(lambda: [{"class": results.names[int(p[5])], "confidence": float(p[4]),
+                                "bbox": [float(v) for v in p[:4]]} for p in preds])
+        stages["json_only"].append(ms)
+
+    report = {"model": args.model, "images": len(images),
+              "stages": {name: summarize(values) for name, values in stages.items()}}
+    inference_mean = report["stages"]["inference"]["mean_ms"]
+    print(f"\n🖼️ {len(images)} gambar, model {args.model}")
+    for name, result in report["stages"].items():
+        share = result["mean_ms"] / inference_mean * 100
+        print(f"  {name:>10}: mean {result['mean_ms']:.2f} ms | p95 {result['p95_ms']:.2f} ms"
+              f" | {share:.1f}% dari inferensi")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil benchmark disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# benchmark_tiling.py
+# Bandingkan recall dan latency deteksi normal vs tiled untuk tiap kamera
+#
+# Struktur folder yang diharapkan (label format YOLO: cls cx cy w h, ternormalisasi):
+#   <images>/<camera_id>/frame001.jpg
+#   <images>/<camera_id>/frame001.txt
+# Gambar yang langsung berada di <images>/ dikelompokkan sebagai kamera "default".
+
+import argparse
+import glob
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from tiling import run_tiled_inference, DEFAULT_TILE_OVERLAP
+from yolo_hub import hub_load, model_path
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_labels(label_path, width, height):
+    """Baca label YOLO dan ubah ke box xyxy dalam piksel"""
+    boxes = []
+    if not os.path.exists(label_path):
+        return np.zeros((0, 4))
+    with open(label_path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            cx, cy, w, h = (float(v) for v in parts[1:5])
+            boxes.append([(cx - w / 2) * width, (cy - h / 2) * height,
+                          (cx + w / 2) * width, (cy + h / 2) * height])
+    return np.array(boxes).reshape(-1, 4)
+
+
+def box_iou(a, b):
+    """IoU antar dua kumpulan box xyxy (NxM)"""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)))
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter)
+
+
+def count_matches(gt_boxes, pred_boxes, iou_threshold):
+    """Hitung ground truth yang cocok dengan prediksi (greedy, satu-satu)"""
+    iou = box_iou(gt_boxes, pred_boxes)
+    matched = 0
+    used = set()
+    for gi in range(len(gt_boxes)):
+        for pi in np.argsort(-iou[gi]):
+            if iou[gi, pi] < iou_threshold:
+                break
+            if pi not in used:
+                used.add(pi)
+                matched += 1
+                break
+    return matched
+
+
+def collect_images(image_dir):
+    """Kelompokkan gambar berdasarkan kamera (nama subfolder)"""
+    cameras = {}
+    for path in sorted(glob.glob(os.path.join(image_dir, "**", "*"), recursive=True)):
+        if not path.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        rel = os.path.relpath(os.path.dirname(path), image_dir)
+        camera_id = "default" if rel == "." else rel.split(os.sep)[0]
+        cameras.setdefault(camera_id, []).append(path)
+    return cameras
+
+
+def run_mode(model, image, tile_size, overlap):
+    """Jalankan satu mode dan kembalikan (box xyxy, latency detik)"""
+    start = time.perf_counter()
+    if tile_size:
+        preds, _ = run_tiled_inference(model, image, tile_size, overlap)
+    else:
+        preds = model(image).xyxy[0].cpu().numpy()
+    return preds[:, :4], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inferensi tiled vs normal")
+    parser.add_argument("--images", required=True, help="Folder gambar + label YOLO")
+    parser.add_argument("--model", default="yolov5s", help="Path model .pt atau 'yolov5s'")
+    parser.add_argument("--tile-sizes", type=int, nargs="+", default=[640, 960],
+                        help="Ukuran tile yang diuji")
+    parser.add_argument("--overlap", type=float, default=DEFAULT_TILE_OVERLAP)
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU minimum agar dihitung benar")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", default="tiling_benchmark.json")
+    args = parser.parse_args()
+
+    # Bobot lokal lewat yolo_hub agar tidak bergantung pada jaringan
+    model = hub_load(model_path(args.model))
+
+    cameras = collect_images(args.images)
+    if not cameras:
+        print(f"❌ Tidak ada gambar di {args.images}")
+        return
+
+    modes = [("normal", None)] + [(f"tiled_{size}", size) for size in args.tile_sizes]
+
+    # Warmup supaya latency tidak termasuk inisialisasi
+    first_image = cv2.imread(next(iter(cameras.values()))[0])
+    for _, tile_size in modes:
+        for _ in range(args.warmup):
+            run_mode(model, first_image, tile_size, args.overlap)
+
+    report = {"model": args.model, "overlap": args.overlap, "iou": args.iou, "cameras": {}}
+    for camera_id, paths in cameras.items():
+        stats = {name: {"matched": 0, "latencies": []} for name, _ in modes}
+        total_gt = 0
+        for path in paths:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            height, width = image.shape[:2]
+            gt = load_labels(os.path.splitext(path)[0] + ".txt", width, height)
+            total_gt += len(gt)
+            for name, tile_size in modes:
+                boxes, latency = run_mode(model, image, tile_size, args.overlap)
+                stats[name]["matched"] += count_matches(gt, boxes, args.iou)
+                stats[name]["latencies"].append(latency)
+
+        camera_report = {"images": len(paths), "ground_truth": total_gt, "modes": {}}
+        for name, values in stats.items():
+            latencies = np.array(values["latencies"]) * 1000
+            camera_report["modes"][name] = {
+                "recall": values["matched"] / total_gt if total_gt else None,
+                "latency_ms_mean": float(latencies.mean()) if len(latencies) else None,
+                "latency_ms_p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+            }
+        report["cameras"][camera_id] = camera_report
+
+        print(f"\n📷 Kamera: {camera_id} ({len(paths)} gambar, {total_gt} objek)")
+        base = camera_report["modes"]["normal"]
+        for name, result in camera_report["modes"].items():
+            recall = f"{result['recall']:.3f}" if result["recall"] is not None else "-"
+            gain = ""
+            if name != "normal" and result["recall"] is not None and base["recall"] is not None:
+                gain = (f" | recall +{result['recall'] - base['recall']:.3f}"
+                        f" | latency x{result['latency_ms_mean'] / base['latency_ms_mean']:.1f}")
+            print(f"  {name:>12}: recall {recall} | mean {result['latency_ms_mean']:.1f} ms"
+                  f" | p95 {result['latency_ms_p95']:.1f} ms{gain}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil benchmark disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Pembuatan grafik Plotly untuk dashboard Streamlit (main.py).
+
+Seri waktu sensor bisa berisi ratusan ribu titik, jauh lebih banyak dari
+jumlah piksel grafik. Sebelum diplot, setiap seri diperkecil dengan
+Largest-Triangle-Three-Buckets (LTTB) yang mempertahankan bentuk visual
+(puncak dan lembah), dan seri yang besar digambar dengan WebGL (Scattergl).
+"""
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Perkiraan lebar grafik dalam piksel (layout "wide", use_container_width)
+DEFAULT_CHART_WIDTH_PX = 1200
+
+# Seri dengan titik mentah lebih banyak dari ini digambar dengan Scattergl
+WEBGL_THRESHOLD = 10000
+
+# Marker hanya ditampilkan jika jumlah titik yang digambar sedikit
+MARKER_LIMIT = 200
+
+# Grafik sensor per tab: (kolom, label, satuan, garis batas (nilai, peran warna)).
+# Peran warna "success"/"error" dipetakan ke warna tema oleh pemanggil.
+SENSOR_CHARTS = [
+    ("suhu", "Suhu", "°C", [(30, "success"), (35, "error")]),
+    ("kelembapan", "Kelembapan", "%", [(50, "success"), (70, "error")]),
+    ("kualitas_udara", "Kualitas Udara", "ppm", [(200, "error")]),
+]
+
+
+def target_points(width_px=DEFAULT_CHART_WIDTH_PX, points_per_pixel=1.0):
+    """Jumlah titik yang cukup untuk grafik selebar width_px"""
+    return max(3, int(width_px * points_per_pixel))
+
+
+def lttb_indices(x, y, n_out):
+    """Indeks titik yang dipilih LTTB dari seri (x, y) yang sudah terurut.
+
+    Titik pertama dan terakhir selalu dipertahankan; di setiap bucket dipilih
+    titik yang membentuk segitiga terbesar dengan titik terpilih sebelumnya
+    dan rata-rata bucket berikutnya. Perhitungan luas dalam satu bucket
+    dilakukan secara vektor dengan numpy.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Batas bucket untuk titik di antara titik pertama dan terakhir
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Rata-rata tiap bucket dihitung sekaligus untuk dipakai sebagai titik C
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        bx, by = x[start:end], y[start:end]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(index, values, n_out):
+    """Perkecil seri waktu (DatetimeIndex/array x, nilai y) menjadi maksimal n_out titik"""
+    values = np.asarray(values)
+    if len(values) <= n_out:
+        return index, values
+
+    x = np.asarray(index)
+    x_numeric = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    # NaN tidak bisa dibandingkan luasnya, gunakan 0 hanya untuk pemilihan titik
+    picked = lttb_indices(x_numeric, np.nan_to_num(values.astype(np.float64)), n_out)
+    return x[picked], values[picked]
+
+
+def time_series_trace(index, values, name=None, n_out=None, **kwargs):
+    """Trace seri waktu yang sudah di-downsample, Scattergl untuk seri besar"""
+    n_out = n_out or target_points()
+    x, y = downsample(index, values, n_out)
+    trace_cls = go.Scattergl if len(values) > WEBGL_THRESHOLD else go.Scatter
+    mode = "lines+markers" if len(y) <= MARKER_LIMIT else "lines"
+    return trace_cls(x=x, y=y, name=name, mode=mode, **kwargs)
+
+
+def time_series_figure(frame, column, title, y_label, template, color=None,
+                       threshold_lines=(), n_out=None):
+    """Grafik garis satu parameter sensor dengan garis batas normal opsional.
+
+    threshold_lines berisi pasangan (nilai y, warna) untuk garis putus-putus.
+    """
+    trace = time_series_trace(frame.index, frame[column].to_numpy(), name=y_label,
+                              n_out=n_out, line=dict(color=color) if color else None)
+    fig = go.Figure(trace)
+    fig.update_layout(
+        title=title,
+        xaxis_title="Waktu",
+        yaxis_title=y_label,
+        hovermode="x unified",
+        template=template
+    )
+    for y_value, line_color in threshold_lines:
+        fig.add_shape(type="line", x0=frame.index[0], x1=frame.index[-1],
+                      y0=y_value, y1=y_value, line=dict(color=line_color, width=2, dash="dash"))
+    return fig
+
+
+def sensor_chart_figure(frame, chart, ternak, template, colors, n_out=None):
+    """Grafik satu entri SENSOR_CHARTS; colors memetakan peran warna ke warna tema"""
+    column, label, unit, thresholds = chart
+    return time_series_figure(
+        frame, column,
+        title=f"{label} untuk {ternak.capitalize()} ({unit})",
+        y_label=f"{label} ({unit})",
+        template=template,
+        threshold_lines=[(value, colors[role]) for value, role in thresholds],
+        n_out=n_out
+    )
+
+
+def all_parameters_figure(frame, title, template, n_out=None):
+    """Grafik gabungan suhu, kelembapan, dan kualitas udara (diskala /10) dalam satu sumbu"""
+    fig = go.Figure()
+    fig.add_trace(time_series_trace(frame.index, frame['suhu'].to_numpy(), name='Suhu (°C)', n_out=n_out))
+    fig.add_trace(time_series_trace(frame.index, frame['kelembapan'].to_numpy(),
+                                    name='Kelembapan (%)', n_out=n_out))
+    if 'kualitas_udara' in frame.columns:
+        # Skala untuk memudahkan visualisasi
+        fig.add_trace(time_series_trace(frame.index, frame['kualitas_udara'].to_numpy() / 10,
+                                        name='Kualitas Udara (ppm/10)', n_out=n_out))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Waktu",
+        yaxis_title="Nilai",
+        hovermode="x unified",
+        template=template,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def confidence_figure(x, y, template, color, title=None, y_label="Confidence", marker_size=None):
+    """Grafik garis confidence deteksi (skala 0-1) untuk beberapa deteksi terakhir"""
+    fig = px.line(
+        x=x,
+        y=y,
+        title=title,
+        labels={'y': y_label, 'x': 'Waktu'},
+        markers=True,
+        color_discrete_sequence=[color]
+    )
+    fig.update_layout(
+        xaxis_title="Waktu",
+        yaxis_title=y_label,
+        hovermode="x unified",
+        template=template,
+        yaxis=dict(range=[0, 1.1])  # skala 0-1 untuk confidence
+    )
+    if marker_size:
+        fig.update_traces(marker=dict(size=marker_size))
+    return fig
+
+
+def hourly_activity_figure(hourly, title, template, color):
+    """Histogram jumlah aktivitas per jam dari frame 24 baris (hour, count)"""
+    fig = px.bar(
+        hourly,
+        x='hour',
+        y='count',
+        title=title,
+        labels={'count': 'Jumlah Aktivitas', 'hour': 'Jam'},
+        color_discrete_sequence=[color]
+    )
+    fig.update_layout(
+        xaxis_title="Jam",
+        yaxis_title="Jumlah Aktivitas",
+        hovermode="x unified",
+        template=template,
+        xaxis=dict(tickmode='linear', tick0=0, dtick=1)  # tunjukkan semua jam
+    )
+    return fig
+
+
+def video_timeline_figure(timeline, template, color):
+    """Grafik batang jumlah objek per detik video"""
+    fig = go.Figure(go.Bar(x=np.arange(len(timeline)), y=timeline, marker_color=color))
+    fig.update_layout(
+        title="Jumlah Objek per Detik Video",
+        xaxis_title="Detik",
+        yaxis_title="Jumlah Objek",
+        template=template,
+        height=300
+    )
+    return fig
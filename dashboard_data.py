@@ -0,0 +1,443 @@
+"""
+Lapisan pemuatan data untuk dashboard Streamlit (main.py).
+
+Modul ini sengaja tidak bergantung pada Streamlit supaya bisa dipakai ulang
+dan diuji di luar dashboard. main.py membungkus loader di sini dengan
+st.cache_resource sehingga satu instance bertahan antar rerun.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+# Pilihan rentang waktu dashboard (None berarti semua data)
+TIME_WINDOWS = {
+    "1 Jam": timedelta(hours=1),
+    "6 Jam": timedelta(hours=6),
+    "24 Jam": timedelta(days=1),
+    "7 Hari": timedelta(days=7),
+    "30 Hari": timedelta(days=30),
+    "Semua": None,
+}
+
+# Batas jumlah baris yang disimpan di cache untuk tiap loader
+MAX_CACHED_ROWS = 50000
+
+# Field yang diambil dari penyimpanan (projection) untuk tiap jenis data
+SENSOR_FIELDS = ["timestamp", "ternak", "suhu", "kelembapan", "kualitas_udara", "jarak_pakan"]
+CV_FIELDS = ["timestamp", "ternak", "aktivitas", "confidence", "lokasi", "jumlah"]
+
+# Kolom numerik yang disimpan sebagai float32
+SENSOR_METRICS = ["suhu", "kelembapan", "kualitas_udara", "jarak_pakan"]
+CV_METRICS = ["confidence", "jumlah"]
+
+# Kategori tetap supaya hasil concat antar batch tetap bertipe category
+TERNAK_DTYPE = pd.CategoricalDtype(["ayam", "sapi", "kambing"])
+
+# Format waktu untuk tampilan, dipakai hanya saat render
+DISPLAY_TIME_FORMAT = "%d/%m/%Y %H:%M:%S"
+
+# Desimal untuk menampilkan metrik float32 (kartu, tabel, prompt analisis AI)
+METRIC_DECIMALS = 2
+
+# Jumlah deteksi terakhir pada grafik confidence
+RECENT_CONFIDENCE_LIMIT = 20
+
+# Rentang ideal (min, max) tiap parameter sensor per jenis ternak
+IDEAL_RANGES = {
+    "ayam": {"suhu": (32, 37), "kelembapan": (50, 70), "kualitas_udara": (0, 200), "jarak_pakan": (0, 10)},
+    "sapi": {"suhu": (25, 32), "kelembapan": (60, 80), "kualitas_udara": (0, 200), "jarak_pakan": (0, 10)},
+    "kambing": {"suhu": (27, 34), "kelembapan": (40, 65), "kualitas_udara": (0, 200), "jarak_pakan": (0, 10)},
+}
+
+
+def parse_timestamps(values):
+    """Parse kolom timestamp (string ISO campuran atau datetime) ke datetime64 naive"""
+    parsed = pd.to_datetime(values, format="ISO8601", errors="coerce", utc=True)
+    return parsed.dt.tz_localize(None)
+
+
+def build_typed_frame(data, metrics=()):
+    """Bangun frame ringkas dari list dokumen.
+
+    Timestamp di-parse sekali secara vektor menjadi DatetimeIndex, kolom
+    metrik menjadi float32, ternak menjadi category, dan _id dibuang. Baris
+    tanpa timestamp valid dibuang karena tidak bisa diurutkan maupun diplot.
+    """
+    frame = pd.DataFrame(data)
+    frame = frame.drop(columns=["_id"], errors="ignore")
+    if "timestamp" not in frame.columns:
+        frame["timestamp"] = pd.NaT
+    frame["timestamp"] = parse_timestamps(frame["timestamp"])
+    frame = frame[frame["timestamp"].notna()].set_index("timestamp")
+
+    for column in metrics:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float32")
+    if "ternak" in frame.columns:
+        frame["ternak"] = frame["ternak"].astype(TERNAK_DTYPE)
+    return frame
+
+
+def format_index_times(frame):
+    """Format DatetimeIndex frame untuk tampilan (vektor, hanya baris yang dirender)"""
+    return frame.index.strftime(DISPLAY_TIME_FORMAT)
+
+
+def metric_value(value, decimals=METRIC_DECIMALS):
+    """Nilai metrik (float32) sebagai float Python yang dibulatkan, tanpa artefak presisi float32"""
+    return round(float(value), decimals)
+
+
+def latest_rows_for_display(frame, n=5):
+    """Ambil n baris terbaru (terbaru dulu) dengan kolom timestamp terformat"""
+    latest = frame.iloc[:-(n + 1):-1]
+    table = latest.reset_index(drop=True)
+    # Tampilkan float32 sebagai angka METRIC_DECIMALS desimal, bukan artefak presisi float32
+    float_columns = table.select_dtypes("float32").columns
+    table[float_columns] = table[float_columns].astype("float64").round(METRIC_DECIMALS)
+    table.insert(0, "timestamp", format_index_times(latest))
+    return table
+
+
+def species_overview(frame, metrics=SENSOR_METRICS, ideal_ranges=IDEAL_RANGES):
+    """Ringkasan semua jenis ternak dari satu frame gabungan dalam satu groupby.
+
+    Per ternak dihitung jumlah baris, waktu terakhir, nilai terakhir tiap
+    parameter, status dalam rentang ideal (<metric>_ok) dan tren
+    (<metric>_trend, kemiringan regresi linier dalam satuan per jam). Tren
+    dihitung dari jumlah-jumlah (n, x, y, xy, x^2) sehingga cukup satu reduksi
+    sum per kelompok tanpa loop per ternak.
+    """
+    species = list(TERNAK_DTYPE.categories)
+    if frame.empty or "ternak" not in frame.columns:
+        return pd.DataFrame(index=pd.Index(species, name="ternak"))
+
+    metrics = [m for m in metrics if m in frame.columns]
+    hours = ((frame.index - frame.index.min()) / pd.Timedelta(hours=1)).to_numpy(dtype=np.float64)
+
+    work = {"ternak": frame["ternak"].array, "rows": np.ones(len(frame)), "last_timestamp": frame.index}
+    for m in metrics:
+        y = frame[m].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(y)
+        x = np.where(valid, hours, np.nan)
+        work[m] = y
+        work[f"{m}__n"] = valid.astype(np.float64)
+        work[f"{m}__y"] = y
+        work[f"{m}__x"] = x
+        work[f"{m}__xx"] = x * x
+        work[f"{m}__xy"] = x * y
+    work = pd.DataFrame(work)
+
+    sum_columns = ["rows"] + [c for c in work.columns if "__" in c]
+    aggregations = {c: "sum" for c in sum_columns}
+    aggregations.update({m: "last" for m in metrics})
+    aggregations["last_timestamp"] = "max"
+    grouped = work.groupby("ternak", observed=False, sort=False).agg(aggregations)
+
+    overview = pd.DataFrame(index=grouped.index)
+    overview["rows"] = grouped["rows"].astype(np.int64)
+    overview["last_timestamp"] = grouped["last_timestamp"]
+    for m in metrics:
+        n, sx, sy = grouped[f"{m}__n"], grouped[f"{m}__x"], grouped[f"{m}__y"]
+        sxx, sxy = grouped[f"{m}__xx"], grouped[f"{m}__xy"]
+        denominator = n * sxx - sx * sx
+        overview[m] = grouped[m]
+        overview[f"{m}_trend"] = ((n * sxy - sx * sy) / denominator.where(denominator > 0)).astype(np.float64)
+
+        ranges = [ideal_ranges.get(t, {}).get(m, (-np.inf, np.inf)) for t in overview.index]
+        low = np.array([r[0] for r in ranges], dtype=np.float64)
+        high = np.array([r[1] for r in ranges], dtype=np.float64)
+        overview[f"{m}_ok"] = (grouped[m] >= low) & (grouped[m] <= high)
+
+    overview = overview.reindex(species)
+    overview.index.name = "ternak"
+    return overview
+
+
+def hourly_frame(counts):
+    """Frame 24 baris (hour, count) dari array jumlah per jam"""
+    return pd.DataFrame({"hour": np.arange(24), "count": np.asarray(counts, dtype=np.int64)})
+
+
+def filter_records(data, ternak=None, fields=None, max_rows=MAX_CACHED_ROWS):
+    """Filter list dokumen JSON seperti query MongoDB: jenis ternak, projection field, max_rows terakhir"""
+    if ternak is not None:
+        data = [item for item in data if item.get("ternak") == ternak]
+    if fields:
+        data = [{key: item[key] for key in fields if key in item} for item in data]
+    return data[-max_rows:]
+
+
+def _since_id(window):
+    """Batas _id untuk rentang waktu (ObjectId memuat waktu insert)"""
+    from bson import ObjectId
+
+    return ObjectId.from_datetime(datetime.now(timezone.utc) - window)
+
+
+def activity_by_hour_pipeline(ternak, window=None):
+    """Pipeline agregasi jumlah aktivitas per jam (0-23) untuk satu jenis ternak.
+
+    Timestamp tersimpan campuran datetime dan string ISO; untuk string, jam
+    diambil langsung dari posisi "YYYY-MM-DDTHH" sehingga sama dengan jam
+    yang ditampilkan dashboard.
+    """
+    match = {"ternak": ternak}
+    if window is not None:
+        match["_id"] = {"$gte": _since_id(window)}
+    hour = {
+        "$cond": [
+            {"$eq": [{"$type": "$timestamp"}, "date"]},
+            {"$hour": "$timestamp"},
+            {"$convert": {"input": {"$substrBytes": ["$timestamp", 11, 2]},
+                          "to": "int", "onError": None, "onNull": None}},
+        ]
+    }
+    return [
+        {"$match": match},
+        {"$project": {"_id": 0, "hour": hour}},
+        {"$match": {"hour": {"$ne": None}}},
+        {"$group": {"_id": "$hour", "count": {"$sum": 1}}},
+        {"$sort": {"_id": 1}},
+    ]
+
+
+def recent_confidence_pipeline(ternak, limit=RECENT_CONFIDENCE_LIMIT, window=None):
+    """Pipeline n deteksi terbaru (timestamp, confidence) memakai index (ternak, _id)"""
+    match = {"ternak": ternak, "confidence": {"$ne": None}}
+    if window is not None:
+        match["_id"] = {"$gte": _since_id(window)}
+    return [
+        {"$match": match},
+        {"$sort": {"_id": -1}},
+        {"$limit": limit},
+        {"$project": {"_id": 0, "timestamp": 1, "confidence": 1}},
+    ]
+
+
+def activity_by_hour_mongo(collection, ternak, window=None):
+    """Jumlah aktivitas per jam dari MongoDB, hanya 24 baris yang dipindahkan"""
+    counts = np.zeros(24, dtype=np.int64)
+    for row in collection.aggregate(activity_by_hour_pipeline(ternak, window)):
+        if 0 <= row["_id"] < 24:
+            counts[row["_id"]] = row["count"]
+    return hourly_frame(counts)
+
+
+def recent_confidence_mongo(collection, ternak, limit=RECENT_CONFIDENCE_LIMIT, window=None):
+    """n deteksi terbaru dari MongoDB sebagai frame bertipe, urut lama -> baru"""
+    data = list(collection.aggregate(recent_confidence_pipeline(ternak, limit, window)))[::-1]
+    return build_typed_frame(data, ["confidence"])
+
+
+def _record_key(record):
+    """Kunci isi record JSON untuk mencari posisi record terakhir yang sudah dimuat"""
+    return json.dumps(record, sort_keys=True, default=str)
+
+
+class IncrementalLoader:
+    """Cache DataFrame yang hanya mengambil data baru sejak pemanggilan terakhir.
+
+    Untuk MongoDB, penanda terakhir yang dilihat adalah _id dokumen: ObjectId
+    memuat waktu insert dan selalu bertipe sama, sedangkan field timestamp
+    tersimpan campuran string/datetime sehingga tidak bisa dipakai untuk $gt.
+    Untuk file JSON, file hanya dibaca ulang jika mtime/ukurannya berubah dan
+    hanya record setelah record terakhir yang sudah digabung yang diambil
+    (dicari berdasarkan isi dari akhir file, karena server memotong file ke
+    max_entries terakhir dan timestamp agregat bisa sama persis).
+
+    Filter jenis ternak, rentang waktu, batas baris, dan projection field
+    dikerjakan di query (atau saat membaca JSON), sehingga hanya data ternak
+    yang dipilih yang dipindahkan ke dashboard. Frame yang dikembalikan
+    bertipe ringkas (lihat build_typed_frame) dan berurutan dari data terlama
+    ke terbaru. Jumlah baris per jam ikut diperbarui saat baris baru masuk
+    atau terbuang, sehingga histogram aktivitas tidak perlu groupby ulang.
+    """
+
+    def __init__(self, collection=None, json_path=None, window=None, ternak=None,
+                 fields=None, metrics=(), max_rows=MAX_CACHED_ROWS):
+        if collection is None and json_path is None:
+            raise ValueError("collection atau json_path harus diisi")
+        self.collection = collection
+        self.json_path = json_path
+        self.window = window
+        self.ternak = ternak
+        self.fields = fields
+        self.metrics = metrics
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self.invalidate()
+
+    def invalidate(self):
+        """Kosongkan cache sehingga load() berikutnya mengambil ulang semua data"""
+        self._frame = pd.DataFrame()
+        self._last_id = None
+        self._last_timestamp = None
+        self._file_signature = None
+        self._last_record_key = None
+        self._hour_counts = np.zeros(24, dtype=np.int64)
+
+    @property
+    def last_timestamp(self):
+        return self._last_timestamp
+
+    def hourly_counts(self):
+        """Jumlah baris cache per jam (frame 24 baris hour, count)"""
+        with self._lock:
+            return hourly_frame(self._hour_counts.copy())
+
+    def load(self):
+        """Ambil data baru, gabungkan ke cache, dan kembalikan salinan DataFrame"""
+        with self._lock:
+            new_rows = self._fetch_mongo() if self.collection is not None else self._fetch_json()
+            if new_rows is not None and not new_rows.empty:
+                if self._frame.empty:
+                    self._frame = new_rows
+                else:
+                    self._frame = pd.concat([self._frame, new_rows])
+                self._hour_counts += np.bincount(new_rows.index.hour, minlength=24)
+            # Dipangkas setiap load, juga tanpa data baru, supaya baris yang keluar
+            # dari rentang waktu (mis. "1 Jam") tidak terus ditampilkan
+            self._trim()
+            if not self._frame.empty:
+                self._last_timestamp = self._frame.index.max()
+            return self._frame.copy()
+
+    def _window_start(self):
+        if self.window is None:
+            return None
+        return datetime.now() - self.window
+
+    def _trim(self):
+        """Batasi cache sesuai rentang waktu dashboard dan jumlah baris maksimum"""
+        keep = np.ones(len(self._frame), dtype=bool)
+        start = self._window_start()
+        if start is not None:
+            keep &= self._frame.index >= start
+        if len(self._frame) > self.max_rows:
+            keep[:-self.max_rows] = False
+        if keep.all():
+            return
+        self._hour_counts -= np.bincount(self._frame.index[~keep].hour, minlength=24)
+        self._frame = self._frame[keep]
+
+    def _fetch_mongo(self):
+        from bson import ObjectId
+
+        query = {}
+        if self.ternak is not None:
+            query["ternak"] = self.ternak
+        if self._last_id is not None:
+            query["_id"] = {"$gt": self._last_id}
+        elif self.window is not None:
+            # Muat awal dibatasi rentang waktu lewat waktu insert di ObjectId
+            since = datetime.now(timezone.utc) - self.window
+            query["_id"] = {"$gte": ObjectId.from_datetime(since)}
+
+        projection = {field: 1 for field in self.fields} if self.fields else None
+
+        # Ambil max_rows dokumen terbaru lalu balik urutannya menjadi lama -> baru
+        cursor = self.collection.find(query, projection).sort("_id", -1).limit(self.max_rows)
+        data = list(cursor)[::-1]
+        if not data:
+            return None
+
+        self._last_id = data[-1]["_id"]
+        return build_typed_frame(data, self.metrics)
+
+    def _fetch_json(self):
+        if not os.path.exists(self.json_path):
+            return None
+
+        stat = os.stat(self.json_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._file_signature:
+            return None
+        self._file_signature = signature
+
+        with open(self.json_path, "r") as f:
+            data = json.load(f)
+
+        # Terapkan filter yang sama dengan query MongoDB sebelum membuat DataFrame
+        data = filter_records(data, self.ternak, self.fields, self.max_rows)
+        if not data:
+            return None
+
+        last_key = self._last_record_key
+        self._last_record_key = _record_key(data[-1])
+        if last_key is None:
+            return build_typed_frame(data, self.metrics)
+
+        # Record baru = semua record setelah kemunculan terakhir record yang
+        # terakhir digabung; record dengan timestamp sama tetap ikut masuk
+        for position in range(len(data) - 1, -1, -1):
+            if _record_key(data[position]) == last_key:
+                new_data = data[position + 1:]
+                return build_typed_frame(new_data, self.metrics) if new_data else None
+
+        # Record terakhir sudah terpotong dari file: pakai batas timestamp
+        frame = build_typed_frame(data, self.metrics)
+        if self._last_timestamp is not None:
+            frame = frame[frame.index > self._last_timestamp]
+        return frame
+
+
+class DetectionHistory:
+    """Riwayat deteksi berkapasitas tetap berbasis numpy (ring buffer).
+
+    Confidence disimpan sebagai float32 dan waktu sebagai int64 (nanodetik
+    epoch, waktu lokal naive). Setiap data ditulis dua kali, di posisi i dan
+    i + capacity, sehingga n data terakhir selalu berupa slice bersebelahan:
+    append O(1) dan latest() mengembalikan view tanpa salinan. Statistik
+    seluruh sesi (jumlah, rata-rata, min/max confidence) disimpan sebagai
+    penghitung agregat, tidak bergantung pada kapasitas buffer.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self._confidence = np.zeros(2 * capacity, dtype=np.float32)
+        self._times = np.zeros(2 * capacity, dtype=np.int64)
+        self._head = 0
+        self._size = 0
+
+        self.total = 0
+        self.objects_total = 0
+        self.confidence_sum = 0.0
+        self.confidence_min = None
+        self.confidence_max = None
+
+    def __len__(self):
+        return self._size
+
+    def append(self, detected_at, confidence, count=1):
+        """Tambah satu deteksi (datetime, confidence, jumlah objek)"""
+        i = self._head
+        timestamp = np.datetime64(detected_at, "ns").astype(np.int64)
+        self._times[i] = self._times[i + self.capacity] = timestamp
+        self._confidence[i] = self._confidence[i + self.capacity] = confidence
+        self._head = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+        self.total += 1
+        self.objects_total += count
+        self.confidence_sum += confidence
+        self.confidence_min = confidence if self.confidence_min is None else min(self.confidence_min, confidence)
+        self.confidence_max = confidence if self.confidence_max is None else max(self.confidence_max, confidence)
+
+    @property
+    def mean_confidence(self):
+        return self.confidence_sum / self.total if self.total else None
+
+    def latest(self, n=None):
+        """View (waktu datetime64[ns], confidence float32) n deteksi terakhir, urut lama -> baru"""
+        n = self._size if n is None else min(n, self._size)
+        end = self._head + self.capacity
+        times = self._times[end - n:end].view("datetime64[ns]")
+        return times, self._confidence[end - n:end]
+
+    def clear(self):
+        self.__init__(self.capacity)
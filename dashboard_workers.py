@@ -0,0 +1,460 @@
+"""
+Worker latar belakang untuk mode deteksi di dashboard Streamlit (main.py).
+
+Streamlit menjalankan ulang script dari atas pada setiap interaksi, sehingga
+pekerjaan yang berjalan terus (capture kamera atau file video + inferensi YOLO,
+pengiriman data ke server) dipindahkan ke thread di sini. main.py menyimpan worker dengan st.cache_resource dan UI hanya
+membaca frame terbaru secara berkala.
+"""
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import cv2
+import numpy as np
+import requests
+
+from spool import DiskSpool
+
+# Deteksi yang ditahan per sesi sampai dibaca UI (sesi yang tidak aktif tidak menumpuk tanpa batas)
+DETECTION_QUEUE_SIZE = 1000
+
+
+class DetectionWorker:
+    """Thread capture kamera + inferensi YOLO dengan model yang tetap dimuat.
+
+    Frame diambil terus-menerus (cap.grab) agar buffer kamera tidak basi,
+    tetapi inferensi hanya dijalankan sesuai target_fps. Hanya frame hasil
+    anotasi terakhir yang disimpan di ring buffer kecil.
+
+    Satu worker (satu kamera) dipakai bersama semua sesi browser. Setiap sesi
+    mendaftar lewat acquire(session_id) dan mendapat antrian deteksi sendiri,
+    sehingga drain_detections() satu sesi tidak mengambil deteksi sesi lain.
+    release(session_id) hanya menghentikan kamera jika tidak ada sesi lain
+    yang masih memakainya.
+    """
+
+    def __init__(self, model_path, source=0, target_fps=5.0, buffer_size=3, on_detection=None):
+        self.model_path = model_path
+        self.source = source
+        self.target_fps = target_fps
+        self.on_detection = on_detection
+
+        self.status = "idle"
+        self.error = None
+        self.fps = 0.0
+
+        self._model = None
+        self._capture = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._frames = deque(maxlen=buffer_size)
+        self._subscribers = {}
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def camera_open(self):
+        return self._capture is not None and self._capture.isOpened()
+
+    def start(self):
+        """Mulai thread capture (tidak melakukan apa pun jika sudah berjalan)"""
+        if self.running:
+            return
+        self.error = None
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="detection-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Hentikan thread dan lepaskan kamera; model tetap dimuat untuk start berikutnya"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self._release_capture()
+        self.status = "idle"
+
+    def acquire(self, session_id):
+        """Daftarkan sesi sebagai pemakai worker dan mulai thread jika belum berjalan"""
+        with self._lock:
+            self._subscribers.setdefault(session_id, deque(maxlen=DETECTION_QUEUE_SIZE))
+        self.start()
+
+    def release(self, session_id):
+        """Lepaskan sesi; kamera dihentikan jika sesi ini pemakai terakhir"""
+        with self._lock:
+            self._subscribers.pop(session_id, None)
+            last_user = not self._subscribers
+        if last_user:
+            self.stop()
+        return last_user
+
+    @property
+    def sessions(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def restart_capture(self):
+        """Buka ulang kamera, misalnya setelah kamera dicabut"""
+        if self.running:
+            self.stop()
+            self.start()
+            return True
+        self._open_capture()
+        ok = self.camera_open()
+        self._release_capture()
+        return ok
+
+    def latest_frame(self):
+        """Kembalikan (waktu, frame BGR teranotasi) terakhir atau None"""
+        with self._lock:
+            return self._frames[-1] if self._frames else None
+
+    def drain_detections(self, session_id):
+        """Ambil dan kosongkan deteksi baru milik sesi: list (waktu, confidence, jumlah objek)"""
+        with self._lock:
+            detections = self._subscribers.get(session_id)
+            if not detections:
+                return []
+            items = list(detections)
+            detections.clear()
+        return items
+
+    def _load_model(self):
+        if self._model is None:
+            from ultralytics import YOLO
+
+            self.status = "loading"
+            self._model = YOLO(self.model_path)
+        return self._model
+
+    def _open_capture(self):
+        self._release_capture()
+        self._capture = cv2.VideoCapture(self.source)
+
+    def _release_capture(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+    def _run(self):
+        try:
+            model = self._load_model()
+            self._open_capture()
+            if not self.camera_open():
+                raise RuntimeError("Tidak dapat mengakses kamera. Pastikan kamera terhubung dan tidak digunakan aplikasi lain.")
+
+            self.status = "running"
+            interval = 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+            next_inference = 0.0
+            processed, window_start = 0, time.monotonic()
+
+            while not self._stop_event.is_set():
+                # grab() terus berjalan sesuai fps kamera sehingga frame selalu terbaru
+                if not self._capture.grab():
+                    raise RuntimeError("Tidak dapat membaca frame dari kamera")
+                now = time.monotonic()
+                if now < next_inference:
+                    continue
+                next_inference = now + interval
+
+                ok, frame = self._capture.retrieve()
+                if not ok:
+                    continue
+                self._process_frame(model, frame)
+
+                processed += 1
+                if now - window_start >= 1.0:
+                    self.fps = processed / (now - window_start)
+                    processed, window_start = 0, now
+        except Exception as e:
+            self.error = str(e)
+            self.status = "error"
+        finally:
+            self._release_capture()
+            if self.status != "error":
+                self.status = "idle"
+
+    def _process_frame(self, model, frame):
+        results = model(frame, verbose=False)
+        annotated = results[0].plot()
+
+        current_time = datetime.now()
+        cv2.putText(annotated, current_time.strftime("%Y-%m-%d %H:%M:%S"), (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+
+        boxes = results[0].boxes
+        detection = None
+        if len(boxes) > 0:
+            detection = (current_time, float(boxes[0].conf[0]), len(boxes))
+
+        with self._lock:
+            self._frames.append((current_time, annotated))
+            if detection is not None:
+                for detections in self._subscribers.values():
+                    detections.append(detection)
+
+        if detection is not None and self.on_detection is not None:
+            try:
+                self.on_detection(*detection)
+            except Exception as e:
+                self.error = f"Gagal mengirim data ke server: {e}"
+
+
+class VideoDetectionWorker:
+    """Thread deteksi untuk file video yang diunggah.
+
+    Frame yang dilewati (di luar frame_stride) hanya di-grab tanpa decode ke
+    gambar, sedangkan frame yang diproses dikumpulkan dan diinferensi per
+    batch. Hasil sementara (progres, jumlah objek per detik video, contoh frame
+    teranotasi) bisa dibaca UI kapan saja lewat snapshot(). Deteksi dikumpulkan
+    dan dikirim sekaligus oleh pemanggil setelah selesai.
+    """
+
+    def __init__(self, model_path, video_path, name=None, frame_stride=5, batch_size=8,
+                 sample_interval=2.0, max_samples=12, delete_when_done=True):
+        self.model_path = model_path
+        self.video_path = video_path
+        self.name = name or os.path.basename(video_path)
+        self.frame_stride = max(1, int(frame_stride))
+        self.batch_size = max(1, int(batch_size))
+        self.sample_interval = sample_interval
+        self.delete_when_done = delete_when_done
+
+        self.status = "idle"
+        self.error = None
+        self.started_at = None
+        self.fps = 0.0
+        self.frames_total = 0
+        self.frames_read = 0
+        self.frames_processed = 0
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._timeline = np.zeros(0, dtype=np.int32)
+        self._samples = deque(maxlen=max_samples)
+        self._last_sample_time = -math.inf
+        self._detections = []
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def progress(self):
+        if not self.frames_total:
+            return 0.0
+        return min(1.0, self.frames_read / self.frames_total)
+
+    def start(self):
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="video-detection-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self):
+        """Salinan (jumlah objek maks per detik video, list (detik, frame BGR) contoh)"""
+        with self._lock:
+            return self._timeline.copy(), list(self._samples)
+
+    def detections(self):
+        """Semua deteksi: list (waktu, detik video, confidence maks, jumlah objek)"""
+        with self._lock:
+            return list(self._detections)
+
+    def _run(self):
+        capture = None
+        try:
+            from ultralytics import YOLO
+
+            self.status = "loading"
+            model = YOLO(self.model_path)
+
+            capture = cv2.VideoCapture(self.video_path)
+            if not capture.isOpened():
+                raise RuntimeError("File video tidak dapat dibuka")
+            self.fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+            self.frames_total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            with self._lock:
+                self._timeline = np.zeros(max(1, math.ceil(self.frames_total / self.fps)), dtype=np.int32)
+
+            self.status = "running"
+            self.started_at = datetime.now()
+            batch = []
+            index = 0
+            while not self._stop_event.is_set():
+                if index % self.frame_stride == 0:
+                    ok, frame = capture.read()
+                    if ok:
+                        batch.append((index, frame))
+                else:
+                    # Lewati frame tanpa decode ke gambar
+                    ok = capture.grab()
+                if not ok:
+                    break
+                index += 1
+                self.frames_read = index
+
+                if len(batch) >= self.batch_size:
+                    self._infer(model, batch)
+                    batch = []
+            if batch and not self._stop_event.is_set():
+                self._infer(model, batch)
+
+            self.status = "stopped" if self._stop_event.is_set() else "done"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "error"
+        finally:
+            if capture is not None:
+                capture.release()
+            if self.delete_when_done and os.path.exists(self.video_path):
+                os.remove(self.video_path)
+
+    def _infer(self, model, batch):
+        results = model([frame for _, frame in batch], verbose=False)
+        for (index, _), result in zip(batch, results):
+            second = index / self.fps
+            count = len(result.boxes)
+            detection = None
+            if count > 0:
+                detection = (self.started_at + timedelta(seconds=second), second,
+                             float(result.boxes.conf.max()), count)
+            sample = None
+            if second - self._last_sample_time >= self.sample_interval:
+                self._last_sample_time = second
+                sample = (second, result.plot())
+
+            with self._lock:
+                slot = int(second)
+                if slot >= len(self._timeline):
+                    self._timeline = np.pad(self._timeline, (0, slot + 1 - len(self._timeline)))
+                self._timeline[slot] = max(self._timeline[slot], count)
+                if detection is not None:
+                    self._detections.append(detection)
+                if sample is not None:
+                    self._samples.append(sample)
+        self.frames_processed += len(batch)
+
+
+class ActivityUploader:
+    """Pengirim data aktivitas ke server di thread latar belakang.
+
+    submit() tidak pernah memblokir: record masuk ke antrian terbatas (atau
+    langsung ke spool disk jika antrian penuh). Thread pengirim menggabungkan
+    record menjadi batch dan mengirimnya sebagai satu POST berisi list lewat
+    requests.Session (koneksi keep-alive). Batch yang gagal ditulis ke spool
+    dan dikirim ulang dengan backoff eksponensial saat server kembali.
+    """
+
+    def __init__(self, url, spool_path, batch_size=50, flush_interval=1.0, max_queue=1000,
+                 timeout=5, max_backoff=60.0):
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+
+        self.sent = 0
+        self.failures = 0
+        self.last_error = None
+
+        self.spool = DiskSpool(spool_path)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._session = requests.Session()
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def pending(self):
+        """Jumlah record yang belum terkirim (antrian + spool)"""
+        return self._queue.qsize() + len(self.spool)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-uploader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Hentikan thread; record yang belum terkirim disimpan ke spool"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.spool.extend(self._drain_queue(self._queue.qsize()))
+
+    def submit(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.spool.extend([record])
+
+    def _drain_queue(self, limit):
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _next_batch(self):
+        """Tunggu record pertama (maks flush_interval), lalu ambil sisanya tanpa menunggu"""
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        return [first] + self._drain_queue(self.batch_size - 1)
+
+    def _post(self, records):
+        try:
+            response = self._session.post(self.url, json=records, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            self.failures += 1
+            self.last_error = str(e)
+            self._backoff = min(self.max_backoff, self._backoff * 2 if self._backoff else 1.0)
+            self._retry_at = time.monotonic() + self._backoff
+            return False
+        self.sent += len(records)
+        self.last_error = None
+        self._backoff = 0.0
+        return True
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            batch = self._next_batch()
+            if time.monotonic() < self._retry_at:
+                # Server sedang bermasalah: simpan dulu, coba lagi setelah backoff
+                self.spool.extend(batch)
+                continue
+
+            # Kirim data lama di spool lebih dulu supaya urutan tetap terjaga
+            if len(self.spool):
+                spooled = self.spool.peek(self.batch_size)
+                if self._post(spooled):
+                    self.spool.discard(len(spooled))
+                else:
+                    self.spool.extend(batch)
+                    continue
+
+            if batch and not self._post(batch):
+                self.spool.extend(batch)
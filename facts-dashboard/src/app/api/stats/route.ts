@@ -0,0 +1,22 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+// Flask server that keeps the running counters (see /stats in server.py)
+const FLASK_API_URL = process.env.FLASK_API_URL || 'http://localhost:5000';
+
+// GET handler for data counts - proxies the Flask in-memory summary so the
+// dashboard never has to download the full data files just to count them
+export async function GET(request: NextRequest) {
+  const ternak = request.nextUrl.searchParams.get('ternak');
+  const url = `${FLASK_API_URL}/stats${ternak ? `?ternak=${encodeURIComponent(ternak)}` : ''}`;
+
+  try {
+    const response = await fetch(url, { cache: 'no-store', signal: AbortSignal.timeout(3000) });
+    if (!response.ok) {
+      return NextResponse.json({ error: `Stats server responded with ${response.status}` }, { status: 502 });
+    }
+    return NextResponse.json(await response.json());
+  } catch (error) {
+    console.error('Error fetching stats from Flask server:', error);
+    return NextResponse.json({ error: 'Stats server unavailable' }, { status: 502 });
+  }
+}
@@ -5,7 +5,7 @@
 
 import { useState, useEffect, useCallback, useTransition } from 'react';
 import dynamic from 'next/dynamic';
-import { fetchSensorData, fetchCVActivity, sendTestSensorData, generateBatchSensorData } from '@/services/api';
+import { fetchSensorData, fetchCVActivity, fetchStats, sendTestSensorData, generateBatchSensorData } from '@/services/api';
 import Sidebar from '@/components/dashboard/Sidebar';
 import { FiWifi, FiWifiOff } from 'react-icons/fi';
 import LabAITab from '@/components/dashboard/LabAITab';
@@ -92,6 +92,17 @@ export default function Dashboard() {
     if (!isOnline) return;
     
     try {
+      // Prefer the server-side counters; only download the full data as a fallback
+      const stats = await fetchStats(selectedAnimal);
+      if (stats) {
+        startTransition(() => {
+          setSensorCount(stats.sensor.total);
+          setCvCount(stats.cv.total);
+          setLastUpdated(new Date());
+        });
+        return;
+      }
+
       const sensorData = await fetchSensorData();
       const cvData = await fetchCVActivity(selectedAnimal);
       
@@ -11,6 +11,21 @@ const GRADIO_API_URL = process.env.NEXT_PUBLIC_GRADIO_API_URL || 'https://arunik
 const AVAILABLE_MODELS = (process.env.NEXT_PUBLIC_YOLO_MODELS || 'sapi,ayam,kambing,yolov5s').split(',');
 const DEFAULT_MODEL = process.env.NEXT_PUBLIC_DEFAULT_MODEL || 'sapi';
 
+// fn_index event Gradio di app.py (sesuai urutan pendaftaran event di sana)
+const GRADIO_FN_INDEX = {
+  detect: 0, // process_image_batch (api_name "detect")
+  status: 1, // get_system_status (api_name "status")
+};
+
+// Nilai default input tambahan event detect di app.py (mode tiled dan render gambar).
+// Gradio menolak request yang jumlah nilai inputnya kurang dari jumlah komponen.
+const DETECT_DEFAULTS = {
+  tiled: false,
+  tileSize: 640, // tiling.DEFAULT_TILE_SIZE
+  tileOverlap: 0.2, // tiling.DEFAULT_TILE_OVERLAP
+  render: true,
+};
+
 // Mode simulasi - jika true, gunakan data simulasi tanpa mencoba koneksi ke backend
 const SIMULATION_MODE = process.env.NEXT_PUBLIC_SIMULATION_MODE === 'true';
 
@@ -132,7 +147,7 @@ export const wakeUpBackend = async () => {
         'Pragma': 'no-cache'
       },
       body: JSON.stringify({
-        fn_index: 1, // get_system_status memiliki overhead rendah
+        fn_index: GRADIO_FN_INDEX.status, // get_system_status memiliki overhead rendah
         data: [],
       }),
     });
@@ -201,8 +216,16 @@ export const detectAnimal = async (imageFile, model = DEFAULT_MODEL) => {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
-          fn_index: 0, // Indeks fungsi process_image di Gradio
-          data: [base64Image, model],
+          fn_index: GRADIO_FN_INDEX.detect,
+          // Urutan sama dengan inputs detect_button.click: gambar, model, tiled, ukuran tile, overlap, render
+          data: [
+            base64Image,
+            model,
+            DETECT_DEFAULTS.tiled,
+            DETECT_DEFAULTS.tileSize,
+            DETECT_DEFAULTS.tileOverlap,
+            DETECT_DEFAULTS.render,
+          ],
         }),
       });
       
@@ -245,7 +268,7 @@ export const getSystemStatus = async () => {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({
-        fn_index: 1, // Indeks fungsi get_system_status di Gradio
+        fn_index: GRADIO_FN_INDEX.status,
         data: [],
       }),
     });
@@ -3,6 +3,7 @@ import axios from 'axios';
 // API URLs - Using local Next.js API routes
 const API_URL_SENSOR = '/api/sensor-data';
 const API_URL_CV = '/api/cv-activity';
+const API_URL_STATS = '/api/stats';
 
 // Types for sensor data
 export interface SensorData {
@@ -62,6 +63,34 @@ export const fetchCVActivity = async (animalType?: string): Promise<CVActivity[]
   }
 };
 
+// Per-species summary served by /stats
+export interface SpeciesStats {
+  total: number;
+  last_timestamp: string | null;
+  last_values: { [key: string]: any };
+}
+
+export interface DataStats {
+  sensor: SpeciesStats;
+  cv: SpeciesStats;
+  storage: string;
+  timestamp: string;
+}
+
+/**
+ * Fetch data counts for one animal type from the server-side summary.
+ * Returns null when the stats endpoint is unavailable.
+ */
+export const fetchStats = async (animalType: string): Promise<DataStats | null> => {
+  try {
+    const response = await axios.get(API_URL_STATS, { params: { ternak: animalType.toLowerCase() } });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching stats:', error);
+    return null;
+  }
+};
+
 /**
  * Send a test sensor data to the API
  */
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# fake_model_server.py
+# Server model bahasa palsu untuk menguji analisis AI dashboard tanpa kuota Gemini
+#
+# Jalankan:  python fake_model_server.py --port 8765 --delay 1.0
+# Dashboard: FACTS_AI_BACKEND=http FACTS_AI_URL=http://localhost:8765/generate streamlit run main.py
+
+import argparse
+import threading
+import time
+
+from flask import Flask, request, jsonify
+
+app = Flask(__name__)
+
+# Jumlah panggilan generate, untuk memastikan cache/single-flight bekerja
+call_count = 0
+call_lock = threading.Lock()
+response_delay = 0.0
+
+FAKE_ANALYSIS = """## Status Kesehatan
+*sehat* - Analisis palsu dari fake_model_server untuk pengujian.
+
+## Indikator Utama
+- Semua parameter dibaca dari prompt tanpa dianalisis
+
+## Rekomendasi Tindakan
+1. Tindakan pertama
+2. Tindakan kedua
+3. Tindakan ketiga
+
+## Antisipasi
+- Tidak ada
+"""
+
+
+@app.route('/generate', methods=['POST'])
+def generate():
+    global call_count
+    data = request.get_json(silent=True) or {}
+    if not data.get("prompt"):
+        return jsonify({"error": "prompt wajib diisi"}), 400
+
+    with call_lock:
+        call_count += 1
+    # Simulasi latency model supaya permintaan bersamaan bisa diuji
+    if response_delay > 0:
+        time.sleep(response_delay)
+    return jsonify({"model": data.get("model"), "text": FAKE_ANALYSIS})
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify({"calls": call_count})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server model bahasa palsu untuk pengujian")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Jeda respons (detik)")
+    args = parser.parse_args()
+
+    response_delay = args.delay
+    app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# loadtest_gradio.py
+# Uji beban endpoint deteksi Gradio (app.py): throughput dan latency vs jumlah pengguna bersamaan
+#
+# Jalankan app.py terlebih dahulu, lalu:
+#   python loadtest_gradio.py --url http://127.0.0.1:7860 --image contoh.jpg --users 1 2 4 8 16
+# --json-only memakai endpoint /detect_json (tanpa render gambar hasil).
+# Tanpa --image, gambar acak 640x480 dibuat otomatis.
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+from gradio_client import Client
+
+
+def make_test_image(width=640, height=480):
+    """Buat gambar acak sementara untuk dikirim ke endpoint"""
+    pixels = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    path = os.path.join(tempfile.gettempdir(), "facts_loadtest.jpg")
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+def send_request(client, image_path, args):
+    """Kirim satu request deteksi ke endpoint yang dipilih"""
+    if args.json_only:
+        return client.predict(image_path, args.model, args.tiled, args.tile_size, args.tile_overlap,
+                              api_name="/detect_json")
+    return client.predict(image_path, args.model, args.tiled, args.tile_size, args.tile_overlap,
+                          not args.no_render, api_name="/detect")
+
+
+def user_loop(url, image_path, args, latencies, errors, lock):
+    """Satu pengguna: kirim request berurutan sebanyak args.requests"""
+    client = Client(url, verbose=False)
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        try:
+            send_request(client, image_path, args)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            continue
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+
+def run_level(url, image_path, users, args):
+    """Jalankan satu tingkat beban dan kembalikan ringkasannya"""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    threads = [threading.Thread(target=user_loop, args=(url, image_path, args, latencies, errors, lock))
+               for _ in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "users": users,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "duration_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "latency_ms_p50": float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+        "latency_ms_p95": float(np.percentile(latencies_ms, 95)) if len(latencies_ms) else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban endpoint deteksi Gradio")
+    parser.add_argument("--url", default="http://127.0.0.1:7860")
+    parser.add_argument("--image", help="Gambar uji (default: gambar acak)")
+    parser.add_argument("--model", default="yolov5s")
+    parser.add_argument("--tiled", action="store_true")
+    parser.add_argument("--tile-size", type=int, default=640)
+    parser.add_argument("--tile-overlap", type=float, default=0.2)
+    parser.add_argument("--no-render", action="store_true", help="Matikan render gambar hasil")
+    parser.add_argument("--json-only", action="store_true", help="Pakai endpoint /detect_json")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Jumlah pengguna bersamaan yang diuji")
+    parser.add_argument("--requests", type=int, default=10, help="Request per pengguna")
+    parser.add_argument("--output", default="gradio_loadtest.json")
+    args = parser.parse_args()
+
+    image_path = args.image or make_test_image()
+
+    # Warmup supaya model sudah ter-load sebelum pengukuran
+    send_request(Client(args.url, verbose=False), image_path, args)
+
+    endpoint = "/detect_json" if args.json_only else "/detect"
+    report = {"url": args.url, "endpoint": endpoint, "model": args.model, "tiled": args.tiled,
+              "render": not (args.json_only or args.no_render), "levels": []}
+    print(f"{'users':>6} | {'req/s':>7} | {'p50 ms':>8} | {'p95 ms':>8} | errors")
+    for users in args.users:
+        result = run_level(args.url, image_path, users, args)
+        report["levels"].append(result)
+        p50 = f"{result['latency_ms_p50']:.0f}" if result["latency_ms_p50"] is not None else "-"
+        p95 = f"{result['latency_ms_p95']:.0f}" if result["latency_ms_p95"] is not None else "-"
+        print(f"{users:>6} | {result['throughput_rps']:>7.2f} | {p50:>8} | {p95:>8} | {result['errors']}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil uji beban disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
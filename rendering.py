@@ -0,0 +1,37 @@
+"""
+Renderer anotasi ringan untuk hasil deteksi YOLO.
+
+Bounding box dan label digambar langsung pada array numpy dengan OpenCV,
+tanpa results.render() dan konversi bolak-balik ke PIL. Dipakai app.py untuk
+mode normal maupun tiled; endpoint JSON tidak memanggilnya sama sekali.
+"""
+import cv2
+import numpy as np
+
+# Warna per kelas (urutan RGB, sama dengan gambar dari Gradio/PIL)
+PALETTE = (
+    (0, 200, 0), (255, 56, 56), (255, 157, 151), (255, 112, 31), (255, 178, 29),
+    (207, 210, 49), (72, 249, 10), (146, 204, 23), (61, 219, 134), (26, 147, 52),
+    (0, 212, 187), (44, 153, 168), (0, 194, 255), (52, 69, 147), (100, 115, 255),
+)
+
+
+def class_color(cls_id):
+    return PALETTE[int(cls_id) % len(PALETTE)]
+
+
+def draw_detections(image_np, preds, names, copy=True, line_width=2):
+    """Gambar bounding box dan label prediksi Nx6 (xyxy, conf, cls) pada gambar.
+
+    Dengan copy=False gambar diubah langsung (in-place), cocok jika array
+    tidak dipakai lagi oleh pemanggil.
+    """
+    canvas = np.ascontiguousarray(image_np).copy() if copy else np.ascontiguousarray(image_np)
+    for x1, y1, x2, y2, conf, cls_id in preds:
+        color = class_color(cls_id)
+        p1, p2 = (int(x1), int(y1)), (int(x2), int(y2))
+        cv2.rectangle(canvas, p1, p2, color, line_width)
+        label = f"{names[int(cls_id)]} {conf:.2f}"
+        cv2.putText(canvas, label, (p1[0], max(p1[1] - 5, 10)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+    return canvas
@@ -2,7 +2,6 @@
 # send-sensor.py
 # Script untuk mengirim data sensor random ke Flask dan Ubidots <Test Case Only>
 
-import requests
 import time
 import random
 import argparse
@@ -12,6 +11,7 @@ import configparser
 from datetime import datetime
 from pymongo import MongoClient
 import platform
+from sensor_sinks import HttpSink, MongoSink, SinkForwarder
 
 # Coba membaca konfigurasi dari file config.ini jika ada
 config = configparser.ConfigParser()
@@ -44,6 +44,13 @@ parser.add_argument('--ubidots-token', type=str, default='BBUS-Qh32JMs8f0hb5a6Wh
                     help='Token autentikasi Ubidots')
 parser.add_argument('--ubidots-device', type=str, default='ARUNIKA',
                     help='Nama device di Ubidots')
+parser.add_argument('--ubidots-url', type=str, default=None,
+                    help='URL endpoint Ubidots (default: API Ubidots untuk --ubidots-device; '
+                         'isi URL server stub lokal untuk pengujian)')
+parser.add_argument('--no-ubidots', action='store_true',
+                    help='Jangan kirim data ke Ubidots')
+parser.add_argument('--spool-dir', type=str, default='data',
+                    help='Folder spool data yang gagal dikirim per sink')
 parser.add_argument('--interval', type=int, default=10,
                     help='Interval pengiriman data dalam detik')
 
@@ -63,13 +70,40 @@ parser.add_argument('--mongodb-db', type=str, default=default_mongodb_db,
                     help='Nama database MongoDB')
 parser.add_argument('--mongodb-collection', type=str, default=default_mongodb_collection,
                     help='Nama collection MongoDB')
+
+# Mode uji beban: banyak perangkat virtual sekaligus (lihat sensor_loadtest.py)
+load_test_group = parser.add_argument_group('uji beban')
+load_test_group.add_argument('--load-test', action='store_true',
+                             help='Jalankan uji beban dengan perangkat virtual alih-alih simulator tunggal')
+load_test_group.add_argument('--devices', type=int, default=100,
+                             help='Jumlah perangkat virtual (dibagi rata ke semua jenis ternak)')
+load_test_group.add_argument('--duration', type=float, default=60.0,
+                             help='Durasi uji beban dalam detik')
+load_test_group.add_argument('--rate', type=float, default=50.0,
+                             help='Rata-rata request /sensor-data per detik (semua perangkat)')
+load_test_group.add_argument('--arrival', type=str, default='poisson', choices=['constant', 'poisson', 'bursty'],
+                             help='Pola kedatangan request')
+load_test_group.add_argument('--burst-size', type=int, default=10,
+                             help='Jumlah request per burst untuk pola bursty')
+load_test_group.add_argument('--detect-image', type=str, default=None,
+                             help='Gambar untuk beban /detect (opsional)')
+load_test_group.add_argument('--detect-rate', type=float, default=0.0,
+                             help='Rata-rata request /detect per detik')
+load_test_group.add_argument('--max-connections', type=int, default=100,
+                             help='Ukuran connection pool HTTP')
+load_test_group.add_argument('--seed', type=int, default=None,
+                             help='Seed acak agar jadwal kedatangan bisa diulang')
+load_test_group.add_argument('--report', type=str, default='sensor_loadtest.json',
+                             help='File laporan JSON')
+load_test_group.add_argument('--baseline', type=str, default=None,
+                             help='Laporan sebelumnya untuk dibandingkan')
 args = parser.parse_args()
 
 # Konfigurasi endpoint
 FLASK_URL = args.flask_url
 UBIDOTS_TOKEN = args.ubidots_token
 UBIDOTS_DEVICE = args.ubidots_device
-UBIDOTS_URL = f"https://industrial.api.ubidots.com/api/v1.6/devices/{UBIDOTS_DEVICE}/"
+UBIDOTS_URL = args.ubidots_url or f"https://industrial.api.ubidots.com/api/v1.6/devices/{UBIDOTS_DEVICE}/"
 JENIS_TERNAK = args.ternak
 INTERVAL = args.interval
 
@@ -123,87 +157,55 @@ def generate_dummy_data(jenis_ternak):
         "timestamp": timestamp
     }
 
-def send_to_flask(data):
-    try:
-        # Kirim data ke server Flask
-        response = requests.post(FLASK_URL, json=data)
-        
-        # Cek respons
-        if response.status_code == 200:
-            print("✅ Data berhasil dikirim ke server Flask")
-        else:
-            print(f"❌ Gagal mengirim data ke server Flask, status code: {response.status_code}")
-        
-        # Tutup koneksi
-        response.close()
-        return True
-    except Exception as e:
-        print("❌ Error mengirim data ke server Flask:", e)
-        return False
+def ubidots_payload(data):
+    # Format data sesuai format Ubidots
+    return {
+        "temperature": data["suhu"],
+        "humidity": data["kelembapan"],
+        "air_quality": data["kualitas_udara"],
+        "feed_distance": data["jarak_pakan"],
+        "livestock_type": data.get("ternak", JENIS_TERNAK)
+    }
 
-def send_to_ubidots(data):
-    try:
-        # Format data sesuai format Ubidots
-        ubidots_payload = {
-            "temperature": data["suhu"],
-            "humidity": data["kelembapan"],
-            "air_quality": data["kualitas_udara"],
-            "feed_distance": data["jarak_pakan"],
-            "livestock_type": JENIS_TERNAK
-        }
-        
-        # Set header dengan token autentikasi
-        headers = {
-            "X-Auth-Token": UBIDOTS_TOKEN,
-            "Content-Type": "application/json"
-        }
-        
-        # Kirim data ke Ubidots
-        response = requests.post(
-            UBIDOTS_URL,
-            json=ubidots_payload,
-            headers=headers
-        )
-        
-        # Cek respons
-        if response.status_code == 200 or response.status_code == 201:
-            print("✅ Data berhasil dikirim ke Ubidots")
-            response.close()
-            return True
-        else:
-            print(f"❌ Gagal mengirim data ke Ubidots: {response.status_code}")
-            response.close()
-            return False
-    except Exception as e:
-        print("❌ Error mengirim data ke Ubidots:", e)
-        return False
-    
-def save_to_mongodb(data):
-    if not MONGODB_ENABLED or mongo_collection is None:
-        return False
+def create_forwarder():
+    """Buat pengirim paralel ke semua sink yang aktif (Flask, Ubidots, MongoDB)"""
+    sinks = {"flask": HttpSink(FLASK_URL)}
+    if not args.no_ubidots:
+        # Header autentikasi Ubidots dipasang sekali di session
+        sinks["ubidots"] = HttpSink(UBIDOTS_URL, headers={"X-Auth-Token": UBIDOTS_TOKEN},
+                                    transform=ubidots_payload)
+    if MONGODB_ENABLED and mongo_collection is not None:
+        sinks["mongodb"] = MongoSink(mongo_collection)
+    return SinkForwarder(sinks, args.spool_dir)
+
+def print_sink_status(forwarder):
+    for name, status in forwarder.status().items():
+        icon = "✅" if status["last_error"] is None else "❌"
+        line = f"{icon} {name}: {status['sent']} terkirim, {status['pending']} tertunda"
+        if status["last_error"]:
+            line += f" (error: {status['last_error']})"
+        print(line)
+
+def run_load_test():
+    import sensor_loadtest
     
-    try:
-        # Konversi timestamp string ke objek datetime untuk MongoDB
-        if "timestamp" in data and isinstance(data["timestamp"], str):
-            try:
-                data["timestamp"] = datetime.fromisoformat(data["timestamp"])
-            except ValueError:
-                # Jika format tidak valid, biarkan sebagai string
-                pass
-        
-        # Simpan ke MongoDB
-        result = mongo_collection.insert_one(data)
-        print(f"✅ Data berhasil disimpan ke MongoDB (ID: {result.inserted_id})")
-        return True
-    except Exception as e:
-        print(f"❌ Error menyimpan data ke MongoDB: {e}")
-        return False
+    # URL dasar server diambil dari URL endpoint /sensor-data
+    base_url = FLASK_URL.rstrip('/')
+    if base_url.endswith('/sensor-data'):
+        base_url = base_url[:-len('/sensor-data')]
+    print("\n=== FACTS IoT Load Test ===")
+    print(f"📡 Server: {base_url}")
+    print(f"🐄 {args.devices} perangkat virtual, {args.rate} req/s ({args.arrival}), {args.duration} detik")
+    if args.detect_image and args.detect_rate > 0:
+        print(f"📷 /detect: {args.detect_rate} req/s dengan {args.detect_image}")
+    print("================================\n")
+    return sensor_loadtest.main(args, generate_dummy_data, base_url)
 
 def main():
     print("\n=== FACTS IoT Sensor Simulator ===")
     print(f"🐄 Jenis Ternak: {JENIS_TERNAK.upper()}")
     print(f"📡 Flask URL: {FLASK_URL}")
-    print(f"📡 Ubidots Device: {UBIDOTS_DEVICE}")
+    print(f"📡 Ubidots: {'nonaktif' if args.no_ubidots else UBIDOTS_URL}")
     print(f"⏱️ Interval: {INTERVAL} detik")
     if MONGODB_ENABLED:
         print(f"🗄️ MongoDB: {MONGODB_URI}")
@@ -211,6 +213,10 @@ def main():
         print(f"🗄️ Collection: {MONGODB_COLLECTION}")
     print("================================\n")
     
+    # Setiap sink dikirim di thread sendiri; data gagal disimpan di spool dan dikirim ulang
+    forwarder = create_forwarder()
+    forwarder.start()
+    
     # Loop utama
     while True:
         try:
@@ -226,24 +232,27 @@ def main():
             print(f"📏 Jarak Pakan: {sensor_data['jarak_pakan']} cm")
             print("=====================================")
             
-            # Kirim ke server Flask
-            send_to_flask(sensor_data)
-            
-            # Kirim ke Ubidots
-            send_to_ubidots(sensor_data)
+            # Kirim ke semua sink secara paralel, tanpa menunggu
+            forwarder.publish(sensor_data)
             
-            # Simpan ke MongoDB jika diaktifkan
-            if MONGODB_ENABLED:
-                save_to_mongodb(sensor_data)
+            # Status pengiriman sampai iterasi sebelumnya
+            print_sink_status(forwarder)
             
             # Tunggu sebelum mengirim lagi
             print(f"⏳ Menunggu {INTERVAL} detik sebelum pengiriman berikutnya...")
             time.sleep(INTERVAL)
             
+        except KeyboardInterrupt:
+            # Data yang belum terkirim disimpan ke spool untuk dijalankan berikutnya
+            print("\n🛑 Menghentikan simulator...")
+            forwarder.stop()
+            break
         except Exception as e:
             print("❗ Error dalam loop utama:", e)
             time.sleep(5)  # Tunggu sebelum mencoba lagi
 
 # Jalankan program
 if __name__ == "__main__":
+    if args.load_test:
+        raise SystemExit(run_load_test())
     main() 
\ No newline at end of file
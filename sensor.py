@@ -1,4 +1,5 @@
 import time
+import os
 import machine
 import dht
 import network
@@ -24,7 +25,24 @@ echo = Pin(ECHO_PIN, Pin.IN)
 # Konfigurasi WiFi
 WIFI_SSID = "YourWiFiSSID"
 WIFI_PASSWORD = "YourWiFiPassword"
-API_URL = "http://your-server-ip:5000/sensors"  # Ganti dengan URL server Anda
+API_URL = "http://your-server-ip:5000/sensor-data"  # Ganti dengan URL server Anda
+TERNAK = "ayam"  # Jenis ternak di kandang ini (ayam, sapi, kambing)
+
+# Agregasi di perangkat: sampel dibaca tiap SAMPLE_INTERVAL detik, lalu dikirim
+# sebagai ringkasan min/rata-rata/maks per WINDOW_SECONDS detik
+SAMPLE_INTERVAL = 5
+WINDOW_SECONDS = 60
+METRICS = ("suhu", "kelembapan", "kualitas_udara", "jarak_pakan")
+
+# Store-and-forward: ringkasan disimpan dulu di ring buffer flash, lalu dikirim
+# per batch. Kapasitas 360 jendela x 60 detik = 6 jam tanpa koneksi (~135 KB flash).
+BACKLOG_FILE = "backlog.dat"
+BACKLOG_CAPACITY = 360
+SLOT_SIZE = 384
+SEND_BATCH_SIZE = 10
+
+# MicroPython di ESP32 memakai epoch 2000-01-01, server memakai epoch Unix
+EPOCH_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
 
 def connect_wifi():
     wlan = network.WLAN(network.STA_IF)
@@ -45,6 +63,7 @@ def connect_wifi():
     if wlan.isconnected():
         print('Terhubung ke WiFi')
         print(f'IP: {wlan.ifconfig()[0]}')
+        sync_time()
         return True
     else:
         print('Koneksi WiFi gagal!')
@@ -108,61 +127,237 @@ def read_distance():
         print("Error membaca sensor ultrasonic:", e)
         return None
 
-def send_data(temperature, humidity, gas_ppm, distance):
-    if not all([temperature, humidity, gas_ppm, distance]):
-        print("Ada data sensor yang tidak valid, tidak mengirim")
-        return False
+def sync_time():
+    # Sinkronkan jam dengan NTP agar timestamp jendela benar setelah reboot
+    try:
+        import ntptime
+        ntptime.settime()
+    except Exception as e:
+        print("Gagal sinkron waktu NTP:", e)
+
+def unix_time():
+    return time.time() + EPOCH_OFFSET
+
+def wifi_connected():
+    return network.WLAN(network.STA_IF).isconnected()
+
+class WindowAggregator:
+    """Ringkasan min/rata-rata/maks tiap metrik untuk satu jendela waktu"""
     
-    data = {
-        "temperature": temperature,
-        "humidity": humidity,
-        "gas": gas_ppm,
-        "distance": distance,
-        "timestamp": time.time()
-    }
+    def __init__(self, window_seconds=WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self.reset()
+    
+    def reset(self):
+        self.start = None
+        self.samples = 0
+        self.stats = {}
+    
+    def add(self, now, readings):
+        """Tambahkan satu sampel; nilai None (sensor gagal dibaca) dilewati"""
+        if self.start is None:
+            self.start = now
+        self.samples += 1
+        for name, value in readings.items():
+            if value is None:
+                continue
+            stat = self.stats.get(name)
+            if stat is None:
+                self.stats[name] = [value, value, value, 1]  # min, max, jumlah, banyak
+            else:
+                stat[0] = min(stat[0], value)
+                stat[1] = max(stat[1], value)
+                stat[2] += value
+                stat[3] += 1
+    
+    def ready(self, now):
+        return self.start is not None and now - self.start >= self.window_seconds
+    
+    def flush(self, now, ternak=TERNAK):
+        """Kembalikan record agregat lalu mulai jendela baru (None jika tidak ada data valid)"""
+        if not self.stats:
+            self.reset()
+            return None
+        record = {
+            "type": "aggregate",
+            "ternak": ternak,
+            "window_start": self.start,
+            "window_end": now,
+            "samples": self.samples,
+            "metrics": {
+                name: [round(low, 2), round(total / count, 2), round(high, 2)]
+                for name, (low, high, total, count) in self.stats.items()
+            }
+        }
+        self.reset()
+        return record
+
+class FlashRing:
+    """Ring buffer record JSON di flash dengan slot berukuran tetap.
+    
+    File data dialokasikan sekali (capacity x slot_size byte); menambah record
+    hanya menulis satu slot, dan posisi head/count disimpan di file .meta kecil.
+    Jika penuh, record terlama ditimpa.
+    """
+    
+    def __init__(self, path=BACKLOG_FILE, capacity=BACKLOG_CAPACITY, slot_size=SLOT_SIZE):
+        self.path = path
+        self.meta_path = path + ".meta"
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+        self.peeked = 0  # jumlah slot yang dibaca peek terakhir, termasuk slot rusak
+        self._prepare()
+    
+    def __len__(self):
+        return self.count
+    
+    def _prepare(self):
+        try:
+            size = os.stat(self.path)[6]
+        except OSError:
+            size = -1
+        if size != self.capacity * self.slot_size:
+            # Alokasikan file baru dengan slot kosong
+            blank = b" " * self.slot_size
+            with open(self.path, "wb") as f:
+                for _ in range(self.capacity):
+                    f.write(blank)
+            self._save_meta()
+            return
+        try:
+            with open(self.meta_path, "r") as f:
+                meta = json.loads(f.read())
+            self.head = meta["head"] % self.capacity
+            self.count = min(meta["count"], self.capacity)
+        except (OSError, ValueError, KeyError):
+            self.head, self.count = 0, 0
+    
+    def _save_meta(self):
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"head": self.head, "count": self.count}))
+        try:
+            os.remove(self.meta_path)
+        except OSError:
+            pass
+        os.rename(tmp_path, self.meta_path)
+    
+    def append(self, record):
+        data = json.dumps(record).encode()
+        if len(data) > self.slot_size:
+            raise ValueError("record lebih besar dari slot")
+        index = (self.head + self.count) % self.capacity
+        with open(self.path, "r+b") as f:
+            f.seek(index * self.slot_size)
+            f.write(data + b" " * (self.slot_size - len(data)))
+        if self.count == self.capacity:
+            self.head = (self.head + 1) % self.capacity
+            self.dropped += 1
+        else:
+            self.count += 1
+        self._save_meta()
+    
+    def peek(self, n):
+        """Ambil record dari maksimal n slot terlama tanpa menghapusnya.
+        
+        Slot yang rusak (penulisan terpotong saat listrik mati) dilewati; jumlah
+        slot yang dibaca disimpan di self.peeked untuk dipakai discard.
+        """
+        records = []
+        self.peeked = min(n, self.count)
+        with open(self.path, "rb") as f:
+            for i in range(self.peeked):
+                f.seek(((self.head + i) % self.capacity) * self.slot_size)
+                try:
+                    records.append(json.loads(f.read(self.slot_size).strip()))
+                except ValueError:
+                    print(f"Slot backlog rusak dilewati: {(self.head + i) % self.capacity}")
+        return records
     
+    def discard(self, n):
+        """Hapus n record terlama (setelah berhasil dikirim)"""
+        n = min(n, self.count)
+        self.head = (self.head + n) % self.capacity
+        self.count -= n
+        self._save_meta()
+
+def send_batch(records):
     try:
         response = urequests.post(
             API_URL,
             headers={'Content-Type': 'application/json'},
-            data=json.dumps(data)
+            data=json.dumps(records)
         )
-        
-        if response.status_code == 200:
-            print("Data berhasil dikirim!")
-            response.close()
-            return True
-        else:
+        ok = response.status_code == 200
+        if not ok:
             print(f"Gagal mengirim data: {response.status_code}")
-            response.close()
-            return False
+        response.close()
+        return ok
     except Exception as e:
         print(f"Error saat mengirim data: {e}")
         return False
 
-def main():
-    # Hubungkan ke WiFi
-    if not connect_wifi():
+def forward_backlog(backlog, batch_size=SEND_BATCH_SIZE):
+    """Kirim isi backlog per batch, berhenti di kegagalan pertama (data tetap di flash)"""
+    while len(backlog):
+        batch = backlog.peek(batch_size)
+        if batch and not send_batch(batch):
+            return False
+        # Buang semua slot yang dibaca, termasuk slot rusak yang tidak ikut terkirim
+        backlog.discard(backlog.peeked)
+        print(f"{len(batch)} ringkasan terkirim, sisa backlog: {len(backlog)}")
+    return True
+
+def read_all():
+    temperature, humidity = read_dht()
+    gas_ppm, is_gas_detected = read_mq()
+    distance = read_distance()
+    
+    # Tampilkan data
+    print("-" * 40)
+    print(f"Suhu: {temperature} °C")
+    print(f"Kelembaban: {humidity} %")
+    print(f"Gas: {gas_ppm} ppm {'(TERDETEKSI)' if is_gas_detected else ''}")
+    print(f"Jarak: {distance} cm")
+    
+    return {
+        "suhu": temperature,
+        "kelembapan": humidity,
+        "kualitas_udara": gas_ppm,
+        "jarak_pakan": distance
+    }
+
+def step(aggregator, backlog, now=None):
+    """Satu siklus: baca sensor, tutup jendela jika sudah waktunya, kirim backlog"""
+    now = unix_time() if now is None else now
+    aggregator.add(now, read_all())
+    if not aggregator.ready(now):
         return
     
+    record = aggregator.flush(now)
+    if record is not None:
+        backlog.append(record)
+    
+    # Pengiriman dicoba sekali per jendela; koneksi ulang hanya jika WiFi terputus
+    if len(backlog) and (wifi_connected() or connect_wifi()):
+        forward_backlog(backlog)
+
+def main():
+    # Hubungkan ke WiFi; jika gagal data tetap dikumpulkan dan disimpan di flash
+    connect_wifi()
+    
+    aggregator = WindowAggregator(WINDOW_SECONDS)
+    backlog = FlashRing(BACKLOG_FILE, BACKLOG_CAPACITY, SLOT_SIZE)
+    print(f"Backlog tersimpan: {len(backlog)} ringkasan")
+    
     while True:
-        # Baca sensor
-        temperature, humidity = read_dht()
-        gas_ppm, is_gas_detected = read_mq()
-        distance = read_distance()
-        
-        # Tampilkan data
-        print("-" * 40)
-        print(f"Suhu: {temperature} °C")
-        print(f"Kelembaban: {humidity} %")
-        print(f"Gas: {gas_ppm} ppm {'(TERDETEKSI)' if is_gas_detected else ''}")
-        print(f"Jarak: {distance} cm")
-        
-        # Kirim data ke server
-        send_data(temperature, humidity, gas_ppm, distance)
+        step(aggregator, backlog)
         
-        # Tunggu 5 detik sebelum pembacaan berikutnya
-        time.sleep(5)
+        # Tunggu sebelum pembacaan berikutnya
+        time.sleep(SAMPLE_INTERVAL)
 
 if __name__ == "__main__":
     try:
@@ -171,4 +366,4 @@ if __name__ == "__main__":
         print("Program dihentikan")
     except Exception as e:
         print(f"Error tidak terduga: {e}")
-        machine.reset()  # Reset jika terjadi error fatal 
\ No newline at end of file
+        machine.reset()  # Reset jika terjadi error fatal
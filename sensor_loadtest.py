@@ -0,0 +1,247 @@
+"""
+Uji beban server.py dengan banyak perangkat sensor virtual (asyncio + aiohttp).
+
+Dipanggil dari send-sensor.py dengan opsi --load-test. N perangkat virtual untuk
+semua jenis ternak mengirim data ke /sensor-data melalui connection pool HTTP.
+Kedatangan request bersifat open-loop: jadwal kirim dibuat dari pola kedatangan
+(constant, poisson, atau bursty) dan latency dihitung dari waktu terjadwal,
+sehingga antrian di server ikut terukur. Beban /detect opsional berjalan
+paralel dengan gambar yang sama. Laporan JSON per endpoint (throughput,
+p50/p95/p99) bisa dibandingkan dengan laporan sebelumnya lewat --baseline.
+
+Membutuhkan aiohttp (opsional, tidak termasuk requirements.txt): pip install aiohttp
+"""
+import asyncio
+import base64
+import json
+import random
+import time
+from datetime import datetime
+
+JENIS_TERNAK = ("ayam", "sapi", "kambing")
+ARRIVAL_MODES = ("constant", "poisson", "bursty")
+
+# Persentil yang dilaporkan dan dibandingkan dengan baseline
+PERCENTILES = (50, 95, 99)
+
+# Kenaikan latency/penurunan throughput (%) yang dianggap regresi saat dibandingkan
+REGRESSION_THRESHOLD = 10.0
+
+
+def arrival_times(mode, rate, duration, burst_size=10, rng=None):
+    """Waktu kirim (detik sejak mulai) untuk rate request/detik selama duration detik.
+
+    constant: jarak tetap 1/rate. poisson: jarak eksponensial dengan rata-rata
+    1/rate. bursty: burst_size request sekaligus, burst datang secara Poisson
+    dengan rate rata-rata yang sama.
+    """
+    if mode not in ARRIVAL_MODES:
+        raise ValueError(f"Pola kedatangan tidak dikenal: {mode}")
+    if rate <= 0:
+        return []
+    rng = rng or random.Random()
+    times = []
+    t = 0.0
+    while True:
+        if mode == "constant":
+            t += 1.0 / rate
+        elif mode == "poisson":
+            t += rng.expovariate(rate)
+        else:
+            t += rng.expovariate(rate / burst_size)
+        if t >= duration:
+            return times
+        times.extend([t] * (burst_size if mode == "bursty" else 1))
+
+
+def percentile(sorted_values, q):
+    """Persentil q (0-100) dengan interpolasi linear dari list yang sudah terurut"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class EndpointStats:
+    """Latency dan status respons untuk satu endpoint"""
+
+    def __init__(self):
+        self.latencies = []
+        self.status_codes = {}
+        self.errors = 0
+
+    def record(self, latency, status):
+        self.latencies.append(latency)
+        self.status_codes[str(status)] = self.status_codes.get(str(status), 0) + 1
+        if not 200 <= status < 300:
+            self.errors += 1
+
+    def record_error(self, latency):
+        self.latencies.append(latency)
+        self.errors += 1
+        self.status_codes["error"] = self.status_codes.get("error", 0) + 1
+
+    def summary(self, elapsed):
+        latencies_ms = sorted(latency * 1000 for latency in self.latencies)
+        ok = len(latencies_ms) - self.errors
+        result = {
+            "requests": len(latencies_ms),
+            "errors": self.errors,
+            "status_codes": self.status_codes,
+            "throughput_rps": ok / elapsed if elapsed > 0 else 0.0,
+            "latency_ms_mean": sum(latencies_ms) / len(latencies_ms) if latencies_ms else None,
+        }
+        for q in PERCENTILES:
+            result[f"latency_ms_p{q}"] = percentile(latencies_ms, q)
+        return result
+
+
+async def _timed_post(session, url, build_payload, scheduled_at, stats):
+    """Kirim satu request pada waktu terjadwal dan catat latency-nya.
+
+    Payload dibuat saat waktu kirim tiba agar timestamp data sensor sesuai.
+    """
+    delay = scheduled_at - time.perf_counter()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    try:
+        async with session.post(url, json=build_payload()) as response:
+            await response.read()
+            stats.record(time.perf_counter() - scheduled_at, response.status)
+    except Exception:
+        stats.record_error(time.perf_counter() - scheduled_at)
+
+
+def _device_payload(make_payload, device_ternak, device):
+    payload = make_payload(device_ternak[device])
+    payload["device_id"] = f"virtual-{device:04d}"
+    return payload
+
+
+async def run_load_test(base_url, make_payload, devices=100, duration=60.0, rate=50.0,
+                        arrival="poisson", burst_size=10, detect_image=None, detect_rate=0.0,
+                        max_connections=100, timeout=30.0, seed=None):
+    """Jalankan uji beban dan kembalikan laporan (dict).
+
+    make_payload(jenis_ternak) membuat satu data sensor; perangkat virtual ke-i
+    memakai jenis ternak JENIS_TERNAK[i % 3] dan mengirim bergiliran.
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        raise RuntimeError("Mode uji beban membutuhkan aiohttp: pip install aiohttp")
+
+    rng = random.Random(seed)
+    base_url = base_url.rstrip("/")
+    device_ternak = [JENIS_TERNAK[i % len(JENIS_TERNAK)] for i in range(devices)]
+    stats = {"/sensor-data": EndpointStats()}
+
+    detect_payloads = []
+    if detect_image and detect_rate > 0:
+        with open(detect_image, "rb") as f:
+            image_base64 = base64.b64encode(f.read()).decode()
+        detect_payloads = [{"image": image_base64, "model": ternak} for ternak in JENIS_TERNAK]
+        stats["/detect"] = EndpointStats()
+
+    connector = aiohttp.TCPConnector(limit=max_connections)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        start = time.perf_counter()
+        tasks = []
+        for i, t in enumerate(arrival_times(arrival, rate, duration, burst_size, rng)):
+            device = i % devices
+            tasks.append(_timed_post(session, f"{base_url}/sensor-data",
+                                     lambda device=device: _device_payload(make_payload, device_ternak, device),
+                                     start + t, stats["/sensor-data"]))
+        if detect_payloads:
+            for i, t in enumerate(arrival_times(arrival, detect_rate, duration, burst_size, rng)):
+                payload = detect_payloads[i % len(detect_payloads)]
+                tasks.append(_timed_post(session, f"{base_url}/detect", lambda payload=payload: payload,
+                                         start + t, stats["/detect"]))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "config": {
+            "base_url": base_url,
+            "devices": devices,
+            "duration_s": duration,
+            "rate_rps": rate,
+            "arrival": arrival,
+            "burst_size": burst_size if arrival == "bursty" else None,
+            "detect_rate_rps": detect_rate if detect_payloads else 0.0,
+            "max_connections": max_connections,
+        },
+        "elapsed_s": elapsed,
+        "endpoints": {name: endpoint.summary(elapsed) for name, endpoint in stats.items()},
+    }
+
+
+def compare_reports(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """Bandingkan laporan dengan baseline, kembalikan list baris perbandingan dan status regresi"""
+    lines = []
+    regressed = False
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            lines.append(f"  {name}: tidak ada di baseline")
+            continue
+        metrics = [("throughput_rps", -1)] + [(f"latency_ms_p{q}", 1) for q in PERCENTILES]
+        for metric, direction in metrics:
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = change * direction > threshold
+            regressed = regressed or worse
+            lines.append(f"  {name} {metric}: {old:.2f} -> {new:.2f} ({change:+.1f}%)"
+                         f"{' ⚠️ regresi' if worse else ''}")
+    return lines, regressed
+
+
+def print_report(report):
+    print(f"\n📈 Hasil uji beban ({report['config']['devices']} perangkat, "
+          f"{report['config']['arrival']}, {report['config']['rate_rps']} req/s)")
+    for name, result in report["endpoints"].items():
+        p = {q: result[f"latency_ms_p{q}"] for q in PERCENTILES}
+        if result["requests"] == 0:
+            print(f"  {name}: tidak ada request")
+            continue
+        print(f"  {name}: {result['requests']} request, {result['errors']} error | "
+              f"{result['throughput_rps']:.1f} req/s | p50 {p[50]:.1f} ms | "
+              f"p95 {p[95]:.1f} ms | p99 {p[99]:.1f} ms")
+
+
+def main(args, make_payload, base_url):
+    """Jalankan uji beban dari argumen send-sensor.py, simpan laporan JSON"""
+    report = asyncio.run(run_load_test(
+        base_url, make_payload,
+        devices=args.devices,
+        duration=args.duration,
+        rate=args.rate,
+        arrival=args.arrival,
+        burst_size=args.burst_size,
+        detect_image=args.detect_image,
+        detect_rate=args.detect_rate,
+        max_connections=args.max_connections,
+        seed=args.seed,
+    ))
+    print_report(report)
+
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Laporan disimpan ke {args.report}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        lines, regressed = compare_reports(report, baseline)
+        print(f"\n🔍 Dibandingkan dengan {args.baseline}:")
+        print("\n".join(lines))
+        if regressed:
+            print(f"❌ Ada regresi lebih dari {REGRESSION_THRESHOLD:.0f}%")
+            return 1
+    return 0
@@ -0,0 +1,222 @@
+"""
+Pengiriman data sensor ke beberapa tujuan (sink) secara bersamaan untuk send-sensor.py.
+
+Setiap sink (server Flask, Ubidots, MongoDB) punya thread pengirim, antrian
+terbatas, dan spool disk sendiri, sehingga sink yang lambat atau mati tidak
+menahan sink lain. Koneksi HTTP memakai requests.Session (keep-alive). Data
+yang gagal dikirim masuk spool dan dikirim ulang (urut dari yang terlama)
+dengan backoff eksponensial setelah sink kembali normal.
+"""
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from spool import DiskSpool
+
+# Status 4xx yang tetap dicoba ulang (timeout dan rate limit)
+RETRYABLE_CLIENT_STATUS = (408, 429)
+
+
+class RejectedRecord(Exception):
+    """Record ditolak permanen oleh sink (mis. 400); tidak dicoba ulang"""
+
+
+class HttpSink:
+    """Sink HTTP POST JSON dengan session persisten; transform mengubah format data"""
+
+    def __init__(self, url, headers=None, transform=None, timeout=5):
+        self.url = url
+        self.transform = transform
+        self.timeout = timeout
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+    def send(self, record):
+        payload = self.transform(record) if self.transform else record
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        if 400 <= response.status_code < 500 and response.status_code not in RETRYABLE_CLIENT_STATUS:
+            raise RejectedRecord(f"{response.status_code} {response.text[:200]}")
+        response.raise_for_status()
+
+
+class MongoSink:
+    """Sink MongoDB; timestamp string diubah menjadi datetime sebelum disimpan"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def send(self, record):
+        document = dict(record)
+        if isinstance(document.get("timestamp"), str):
+            try:
+                document["timestamp"] = datetime.fromisoformat(document["timestamp"])
+            except ValueError:
+                # Jika format tidak valid, biarkan sebagai string
+                pass
+        self.collection.insert_one(document)
+
+
+class SinkWorker:
+    """Thread pengirim untuk satu sink dengan antrian terbatas dan spool disk"""
+
+    def __init__(self, name, sink, spool_path, max_queue=1000, max_spool=10000,
+                 max_backoff=60.0, replay_batch=50):
+        self.name = name
+        self.sink = sink
+        self.max_backoff = max_backoff
+        self.replay_batch = replay_batch
+
+        self.sent = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error = None
+
+        self.spool = DiskSpool(spool_path, max_records=max_spool)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def pending(self):
+        """Jumlah record yang belum terkirim (antrian + spool)"""
+        return self._queue.qsize() + len(self.spool)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"sink-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Hentikan thread; record yang belum terkirim disimpan ke spool"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self.spool.extend(items)
+
+    def submit(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.spool.extend([record])
+
+    def _send(self, record):
+        try:
+            self.sink.send(record)
+        except RejectedRecord as e:
+            # Mengirim ulang record yang sama akan ditolak lagi, jadi dibuang
+            self.rejected += 1
+            self.last_error = f"ditolak: {e}"
+            return True
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            self._backoff = min(self.max_backoff, self._backoff * 2 if self._backoff else 1.0)
+            self._retry_at = time.monotonic() + self._backoff
+            return False
+        self.sent += 1
+        self.last_error = None
+        self._backoff = 0.0
+        return True
+
+    def _replay_spool(self):
+        """Kirim ulang isi spool; False jika sink masih gagal"""
+        while len(self.spool) and not self._stop_event.is_set():
+            records = self.spool.peek(self.replay_batch)
+            sent = 0
+            for record in records:
+                if not self._send(record):
+                    break
+                sent += 1
+            self.spool.discard(sent)
+            if sent < len(records):
+                return False
+        return True
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                record = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                record = None
+            try:
+                self._process(record)
+            except Exception as e:
+                # Error tak terduga (mis. spool tidak bisa dibaca) tidak boleh
+                # menghentikan thread: record disimpan dan dicoba lagi setelah backoff
+                self.failures += 1
+                self.last_error = f"worker error: {e}"
+                self._backoff = min(self.max_backoff, self._backoff * 2 if self._backoff else 1.0)
+                self._retry_at = time.monotonic() + self._backoff
+                if record is not None:
+                    self.spool.extend([record])
+
+    def _process(self, record):
+        """Kirim satu record (atau None jika antrian kosong) setelah isi spool"""
+        if time.monotonic() < self._retry_at:
+            # Sink sedang bermasalah: simpan dulu, coba lagi setelah backoff
+            if record is not None:
+                self.spool.extend([record])
+            return
+
+        # Data lama di spool dikirim lebih dulu supaya urutan tetap terjaga
+        if not self._replay_spool():
+            if record is not None:
+                self.spool.extend([record])
+            return
+
+        if record is not None and not self._send(record):
+            self.spool.extend([record])
+
+
+class SinkForwarder:
+    """Kirim setiap record ke semua sink secara paralel (satu SinkWorker per sink)"""
+
+    def __init__(self, sinks, spool_dir, **worker_options):
+        self.workers = {
+            name: SinkWorker(name, sink, os.path.join(spool_dir, f"sensor_{name}_spool.jsonl"),
+                             **worker_options)
+            for name, sink in sinks.items()
+        }
+
+    def start(self):
+        for worker in self.workers.values():
+            worker.start()
+
+    def stop(self, timeout=5.0):
+        for worker in self.workers.values():
+            worker.stop(timeout)
+
+    def publish(self, record):
+        """Masukkan record ke antrian setiap sink tanpa menunggu pengiriman"""
+        for worker in self.workers.values():
+            worker.submit(dict(record))
+
+    def status(self):
+        return {
+            name: {
+                "sent": worker.sent,
+                "failures": worker.failures,
+                "rejected": worker.rejected,
+                "pending": worker.pending,
+                "spooled": len(worker.spool),
+                "dropped": worker.spool.dropped,
+                "last_error": worker.last_error,
+            }
+            for name, worker in self.workers.items()
+        }
@@ -5,17 +5,14 @@ import os
 import logging
 import traceback
 import configparser
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
 import platform
-# Tambahan untuk YOLO
-import torch
 import base64
-import cv2
-import numpy as np
 from pathlib import Path
 import time
+import threading
 from flask_cors import CORS
+# Modul berat (torch, cv2, numpy, tiling, pymongo) di-import saat dibutuhkan saja,
+# supaya cold start fungsi serverless yang hanya menerima data sensor tetap cepat
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})  # Enable CORS for all routes with any origin
@@ -39,9 +36,10 @@ except Exception as e:
 
 # Path penyimpanan data (absolute path)
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-DATA_DIR = os.path.join(BASE_DIR, "data")
+DATA_DIR = os.environ.get("FACTS_DATA_DIR", os.path.join(BASE_DIR, "data"))
 SENSOR_FILE = os.path.join(DATA_DIR, "sensor_data.json")
 CV_FILE = os.path.join(DATA_DIR, "cv_activity.json")
+CAMERA_FILE = os.path.join(DATA_DIR, "cameras.json")
 
 # Konfigurasi untuk YOLO
 MODEL_DIR = os.path.join(BASE_DIR, "models")
@@ -65,6 +63,18 @@ for path in [SENSOR_FILE, CV_FILE]:
             json.dump([], f)
         logger.info(f"Created new file: {path}")
 
+# Konfigurasi per kamera (ROI polygon dan opsi tiled), disimpan di cameras.json
+# Format: {"<camera_id>": {"roi": [[x, y], ...], "tiled": false, ...}} dengan
+# koordinat ROI ternormalisasi 0-1 terhadap lebar/tinggi frame
+camera_configs = {}
+if os.path.exists(CAMERA_FILE):
+    try:
+        with open(CAMERA_FILE, "r") as f:
+            camera_configs = json.load(f)
+        logger.info(f"Loaded {len(camera_configs)} camera configs from {CAMERA_FILE}")
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Invalid camera config in {CAMERA_FILE}, ignoring: {str(e)}")
+
 # Konfigurasi MongoDB
 # Gunakan nama database dari config.ini (DATABASE section) dengan fallback ke nilai default
 MONGO_ENABLED = config.getboolean('MONGO', 'enabled', fallback=False) if 'MONGO' in config else \
@@ -92,13 +102,21 @@ mongo_cv_collection = None
 
 if MONGO_ENABLED:
     try:
+        from pymongo import MongoClient
+        from pymongo.errors import ConnectionFailure
         mongo_client = MongoClient(MONGO_URI)
         # Cek koneksi
         mongo_client.admin.command('ping')
         mongo_db = mongo_client[MONGO_DB]
         mongo_sensor_collection = mongo_db[MONGO_SENSOR_COLLECTION]
         mongo_cv_collection = mongo_db[MONGO_CV_COLLECTION]
+        # Index untuk query dashboard (filter ternak, urut terbaru)
+        for collection in (mongo_sensor_collection, mongo_cv_collection):
+            collection.create_index([("ternak", 1), ("_id", -1)])
         logger.info(f"Berhasil terhubung ke MongoDB: {MONGO_URI}")
+    except ImportError as e:
+        logger.error(f"pymongo tidak terpasang, MongoDB dinonaktifkan: {str(e)}")
+        MONGO_ENABLED = False
     except ConnectionFailure as e:
         logger.error(f"Gagal terhubung ke MongoDB: {str(e)}")
         MONGO_ENABLED = False
@@ -106,9 +124,72 @@ if MONGO_ENABLED:
         logger.error(f"Error MongoDB: {str(e)}")
         MONGO_ENABLED = False
 
+# Ringkasan data (jumlah, timestamp dan nilai terakhir per ternak) yang dijaga
+# di memori untuk endpoint /stats, sehingga klien tidak perlu membaca seluruh
+# file JSON atau menghitung ulang koleksi MongoDB setiap kali polling
+STATS_FIELDS = {
+    "sensor": ["suhu", "kelembapan", "kualitas_udara", "jarak_pakan"],
+    "cv": ["aktivitas", "confidence", "jumlah"],
+}
+stats_lock = threading.Lock()
+data_stats = {kind: {"total": 0, "ternak": {}} for kind in STATS_FIELDS}
+
+def _stats_timestamp(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _add_to_stats(stats, kind, data):
+    ternak = data.get("ternak") or "unknown"
+    last_values = {field: data[field] for field in STATS_FIELDS[kind] if field in data}
+    stats["total"] += 1
+    summary = stats["ternak"].setdefault(ternak, {"total": 0, "last_timestamp": None, "last_values": {}})
+    summary["total"] += 1
+    summary["last_timestamp"] = _stats_timestamp(data.get("timestamp"))
+    summary["last_values"] = last_values
+
+def record_stats(kind, data):
+    """Perbarui ringkasan di memori setelah data baru disimpan ke MongoDB"""
+    with stats_lock:
+        _add_to_stats(data_stats[kind], kind, data)
+
+def replace_stats(kind, records):
+    """Hitung ulang ringkasan dari isi file JSON (total = jumlah data yang tersimpan)"""
+    stats = {"total": 0, "ternak": {}}
+    for record in records:
+        _add_to_stats(stats, kind, record)
+    with stats_lock:
+        data_stats[kind] = stats
+
+def seed_stats():
+    """Isi ringkasan awal dari MongoDB (jumlah via index) atau dari file JSON"""
+    sources = {"sensor": (mongo_sensor_collection, SENSOR_FILE), "cv": (mongo_cv_collection, CV_FILE)}
+    for kind, (collection, file_path) in sources.items():
+        try:
+            if MONGO_ENABLED and collection is not None:
+                total = collection.estimated_document_count()
+                summaries = {}
+                for ternak in collection.distinct("ternak"):
+                    last = collection.find_one({"ternak": ternak}, sort=[("_id", -1)])
+                    summaries[ternak or "unknown"] = {
+                        "total": collection.count_documents({"ternak": ternak}),
+                        "last_timestamp": _stats_timestamp(last.get("timestamp")) if last else None,
+                        "last_values": {f: last[f] for f in STATS_FIELDS[kind] if last and f in last},
+                    }
+                with stats_lock:
+                    data_stats[kind] = {"total": total, "ternak": summaries}
+            else:
+                with open(file_path, "r") as f:
+                    replace_stats(kind, json.load(f))
+            logger.info(f"Statistik {kind} dimuat: {data_stats[kind]['total']} data")
+        except Exception as e:
+            logger.warning(f"Gagal memuat statistik awal {kind}: {str(e)}")
+
+seed_stats()
+
 # Fungsi-fungsi YOLO
 def load_model(animal_type):
     """Load YOLO model for the specified animal type"""
+    import torch
+    
     if animal_type not in yolo_models:
         model_path = AVAILABLE_MODELS.get(animal_type)
         if not os.path.exists(model_path):
@@ -125,6 +206,9 @@ def load_model(animal_type):
 
 def base64_to_image(base64_string):
     """Convert base64 string to OpenCV image"""
+    import cv2
+    import numpy as np
+    
     try:
         # Decode base64 string
         img_data = base64.b64decode(base64_string)
@@ -140,9 +224,112 @@ def base64_to_image(base64_string):
         logger.error(f"Error in base64_to_image: {str(e)}")
         return None
 
+def validate_roi(roi):
+    """Validasi polygon ROI ternormalisasi, kembalikan list titik atau raise ValueError"""
+    if not isinstance(roi, list) or len(roi) < 3:
+        raise ValueError("roi must be a list of at least 3 [x, y] points")
+    points = []
+    for point in roi:
+        if not isinstance(point, (list, tuple)) or len(point) != 2:
+            raise ValueError("each roi point must be [x, y]")
+        x, y = float(point[0]), float(point[1])
+        if not (0 <= x <= 1 and 0 <= y <= 1):
+            raise ValueError("roi coordinates must be normalized between 0 and 1")
+        points.append([x, y])
+    return points
+
+TRUE_VALUES = ("true", "1", "yes", "on")
+FALSE_VALUES = ("false", "0", "no", "off", "")
+
+def parse_bool(value, name):
+    """Ubah nilai boolean dari JSON/form ("false", 0, ...) ke bool, atau raise ValueError"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+    raise ValueError(f"{name} must be a boolean")
+
+def roi_to_pixels(roi, img_width, img_height):
+    """Ubah polygon ROI ternormalisasi ke koordinat piksel"""
+    import numpy as np
+    
+    polygon = np.array(roi, dtype=np.float32)
+    polygon[:, 0] *= img_width
+    polygon[:, 1] *= img_height
+    return polygon
+
+def filter_detections_in_roi(preds, polygon):
+    """Buang deteksi yang titik tengahnya berada di luar polygon ROI"""
+    import cv2
+    import numpy as np
+    
+    contour = polygon.reshape(-1, 1, 2)
+    keep = [
+        cv2.pointPolygonTest(contour, (float((p[0] + p[2]) / 2), float((p[1] + p[3]) / 2)), False) >= 0
+        for p in preds
+    ]
+    return preds[np.array(keep, dtype=bool)] if len(preds) else preds
+
+@app.route('/cameras', methods=['GET'])
+def list_cameras():
+    """Daftar konfigurasi kamera (ROI dan opsi tiled)"""
+    return jsonify(camera_configs)
+
+@app.route('/cameras/<camera_id>', methods=['GET', 'PUT', 'DELETE'])
+def camera_config(camera_id):
+    """Baca, simpan, atau hapus konfigurasi ROI untuk satu kamera"""
+    try:
+        if request.method == 'GET':
+            if camera_id not in camera_configs:
+                return jsonify({'error': f'Camera {camera_id} not found'}), 404
+            return jsonify(camera_configs[camera_id])
+        
+        if request.method == 'DELETE':
+            if camera_configs.pop(camera_id, None) is None:
+                return jsonify({'error': f'Camera {camera_id} not found'}), 404
+        else:
+            data = request.json
+            if not data or not isinstance(data, dict) or 'roi' not in data:
+                return jsonify({'error': 'Missing roi polygon'}), 400
+            try:
+                entry = {'roi': validate_roi(data['roi'])}
+                if 'tiled' in data:
+                    entry['tiled'] = parse_bool(data['tiled'], 'tiled')
+                if 'tile_size' in data:
+                    entry['tile_size'] = int(data['tile_size'])
+                if 'tile_overlap' in data:
+                    entry['tile_overlap'] = float(data['tile_overlap'])
+            except (TypeError, ValueError) as e:
+                return jsonify({'error': str(e)}), 400
+            camera_configs[camera_id] = entry
+        
+        with open(CAMERA_FILE, "w") as f:
+            json.dump(camera_configs, f, indent=2)
+        logger.info(f"Camera config for {camera_id} updated ({request.method})")
+        return jsonify({'status': 'camera config saved', 'camera_id': camera_id}), 200
+    except Exception as e:
+        logger.error(f"Unexpected error in camera_config endpoint: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({"error": "Server error"}), 500
+
 @app.route('/detect', methods=['POST'])
 def detect():
     """Endpoint for object detection using YOLO"""
+    try:
+        # Modul vision baru di-import saat /detect pertama kali dipanggil
+        import cv2
+        import numpy as np
+        from tiling import run_tiled_inference, DEFAULT_TILE_SIZE, DEFAULT_TILE_OVERLAP
+    except ImportError as e:
+        logger.error(f"Vision dependencies not installed: {str(e)}")
+        return jsonify({'error': 'Detection is not available on this deployment'}), 503
+    
     try:
         data = request.json
         
@@ -153,6 +340,32 @@ def detect():
         image_base64 = data['image']
         model_type = data['model']
         
+        # Konfigurasi kamera (ROI dan default tiled) jika camera_id dikirim
+        camera_id = data.get('camera_id')
+        camera = {}
+        if camera_id is not None:
+            camera = camera_configs.get(str(camera_id))
+            if camera is None:
+                logger.error(f"Unknown camera_id: {camera_id}")
+                return jsonify({'error': f'Camera {camera_id} not found'}), 404
+        
+        # Opsi mode tiled untuk kamera resolusi tinggi
+        try:
+            tiled = parse_bool(data.get('tiled', camera.get('tiled', False)), 'tiled')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        tile_size, tile_overlap = DEFAULT_TILE_SIZE, DEFAULT_TILE_OVERLAP
+        # Opsi tile hanya divalidasi jika mode tiled benar-benar dipakai
+        if tiled:
+            try:
+                tile_size = int(data.get('tile_size', camera.get('tile_size', DEFAULT_TILE_SIZE)))
+                tile_overlap = float(data.get('tile_overlap', camera.get('tile_overlap', DEFAULT_TILE_OVERLAP)))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Invalid tile_size or tile_overlap'}), 400
+            if tile_size < 64 or not 0 <= tile_overlap < 0.9:
+                logger.error(f"Invalid tiling options: tile_size={tile_size}, tile_overlap={tile_overlap}")
+                return jsonify({'error': 'tile_size must be >= 64 and tile_overlap between 0 and 0.9'}), 400
+        
         # Log request info
         logger.info(f"Received detection request for model: {model_type}, image size: {len(image_base64)} chars")
         
@@ -179,23 +392,46 @@ def detect():
             # Get YOLO model
             model = load_model(model_type)
             
+            # Crop ke bounding box ROI sebelum inferensi agar input lebih kecil
+            img_height, img_width = image.shape[:2]
+            offset_x, offset_y = 0, 0
+            polygon = None
+            inference_image = image
+            if 'roi' in camera:
+                polygon = roi_to_pixels(camera['roi'], img_width, img_height)
+                offset_x, offset_y = np.floor(polygon.min(axis=0)).astype(int)
+                max_x, max_y = np.ceil(polygon.max(axis=0)).astype(int)
+                inference_image = np.ascontiguousarray(image[offset_y:max_y, offset_x:max_x])
+                if inference_image.size == 0:
+                    return jsonify({'error': f'ROI for camera {camera_id} is empty for this frame'}), 400
+            
             # Run inference
-            results = model(image)
+            if tiled:
+                preds, names = run_tiled_inference(model, inference_image, tile_size, tile_overlap)
+            else:
+                results = model(inference_image)
+                preds, names = results.xyxy[0].cpu().numpy(), results.names
+            
+            # Kembalikan koordinat ke frame penuh lalu buang deteksi di luar polygon
+            if polygon is not None:
+                preds = preds.copy()
+                preds[:, [0, 2]] += offset_x
+                preds[:, [1, 3]] += offset_y
+                preds = filter_detections_in_roi(preds, polygon)
             
             # Extract detection results
             detections = []
-            for pred in results.xyxy[0].cpu().numpy():
+            for pred in preds:
                 x1, y1, x2, y2, conf, cls_id = pred
                 
                 # Get normalized bounding box coordinates
-                img_height, img_width = image.shape[:2]
                 x = x1 / img_width
                 y = y1 / img_height
                 w = (x2 - x1) / img_width
                 h = (y2 - y1) / img_height
                 
                 # Get class name
-                class_name = results.names[int(cls_id)]
+                class_name = names[int(cls_id)]
                 
                 detections.append({
                     'bbox': [float(x), float(y), float(w), float(h)],
@@ -203,10 +439,12 @@ def detect():
                     'class': class_name
                 })
             
-            logger.info(f"Detected {len(detections)} objects with model {model_type}")
+            logger.info(f"Detected {len(detections)} objects with model {model_type} (tiled: {tiled})")
             return jsonify({
                 'success': True,
                 'timestamp': time.time(),
+                'tiled': tiled,
+                'camera_id': camera_id,
                 'detections': detections
             })
         
@@ -219,42 +457,97 @@ def detect():
         logger.error(traceback.format_exc())
         return jsonify({"error": "Server error"}), 500
 
+def expand_sensor_record(record):
+    """Ubah record agregat dari firmware menjadi record sensor biasa.
+    
+    Firmware sensor.py mengirim ringkasan per jendela waktu:
+    {"type": "aggregate", "ternak", "window_start", "window_end" (epoch detik),
+     "samples", "metrics": {"suhu": [min, mean, max], ...}}. Nilai rata-rata
+    disimpan di field biasa (suhu, kelembapan, ...) agar dashboard tetap bekerja,
+    minimum/maksimum di <field>_min/<field>_max.
+    """
+    if record.get("type") != "aggregate":
+        return record
+    
+    expanded = {
+        "ternak": record.get("ternak"),
+        "samples": record.get("samples"),
+        "source": "aggregate",
+    }
+    if record.get("device_id"):
+        expanded["device_id"] = record["device_id"]
+    window_start, window_end = record.get("window_start"), record.get("window_end")
+    if isinstance(window_end, (int, float)):
+        expanded["timestamp"] = datetime.fromtimestamp(window_end).isoformat()
+        if isinstance(window_start, (int, float)):
+            expanded["window_seconds"] = window_end - window_start
+    for field, values in (record.get("metrics") or {}).items():
+        if not isinstance(values, (list, tuple)) or len(values) != 3:
+            raise ValueError(f"metric {field} must be [min, mean, max]")
+        expanded[f"{field}_min"], expanded[field], expanded[f"{field}_max"] = values
+    return expanded
+
 @app.route("/sensor-data", methods=["POST"])
 def sensor_data():
+    """Simpan satu data sensor (object) atau satu batch (list), termasuk record agregat firmware"""
     try:
         data = request.json
-        if not data or not isinstance(data, dict):
+        records = data if isinstance(data, list) else [data]
+        if not data or not all(isinstance(record, dict) for record in records):
             logger.error("Invalid sensor data received")
             return jsonify({"error": "Invalid data format"}), 400
         
-        logger.info(f"Data received: {data}")
+        logger.info(f"Data received: {len(records)} record(s)")
+        try:
+            records = [expand_sensor_record(record) for record in records]
+        except ValueError as e:
+            logger.error(f"Invalid aggregate sensor record: {str(e)}")
+            return jsonify({"error": str(e)}), 400
+        
         # Tambahkan timestamp jika belum ada
-        if "timestamp" not in data:
-            data["timestamp"] = datetime.now().isoformat()
+        for record in records:
+            if "timestamp" not in record:
+                record["timestamp"] = datetime.now().isoformat()
         
-        # Simpan ke file JSON
-        json_saved = save_to_json(data, SENSOR_FILE)
+        # Simpan ke file JSON (satu kali tulis untuk seluruh batch)
+        json_saved = save_to_json(records, SENSOR_FILE, stats_kind="sensor")
         
         # Simpan ke MongoDB jika diaktifkan
         mongo_saved = False
         if MONGO_ENABLED and mongo_sensor_collection is not None:
             try:
                 # Pastikan timestamp dalam format yang benar untuk MongoDB
-                if isinstance(data["timestamp"], str):
-                    try:
-                        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
-                    except ValueError:
-                        # Jika format datetime tidak valid, biarkan sebagai string
-                        pass
+                for record in records:
+                    if isinstance(record["timestamp"], str):
+                        try:
+                            record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+                        except ValueError:
+                            # Jika format datetime tidak valid, biarkan sebagai string
+                            pass
                 
-                result = mongo_sensor_collection.insert_one(data)
-                logger.info(f"Data sensor berhasil disimpan ke MongoDB dengan ID: {result.inserted_id}")
+                result = mongo_sensor_collection.insert_many(records)
+                logger.info(f"{len(result.inserted_ids)} data sensor berhasil disimpan ke MongoDB")
                 mongo_saved = True
             except Exception as e:
                 logger.error(f"Gagal menyimpan data sensor ke MongoDB: {str(e)}")
         
+        # Tidak ada penyimpanan yang berhasil: kembalikan 5xx supaya pengirim mencoba lagi
+        if not json_saved and not mongo_saved:
+            logger.error("Gagal menyimpan data sensor ke semua penyimpanan")
+            return jsonify({
+                "error": "Storage unavailable",
+                "json_saved": False,
+                "mongo_saved": False
+            }), 503
+        
+        # Tanpa MongoDB ringkasan sudah dihitung ulang dari file oleh save_to_json
+        if mongo_saved:
+            for record in records:
+                record_stats("sensor", record)
+        
         return jsonify({
             "status": "sensor data saved", 
+            "count": len(records),
             "json_saved": json_saved,
             "mongo_saved": mongo_saved
         }), 200
@@ -266,39 +559,58 @@ def sensor_data():
 
 @app.route("/cv-activity", methods=["POST"])
 def cv_activity():
+    """Simpan satu data aktivitas (object) atau satu batch (list of object)"""
     try:
         data = request.json
-        if not data or not isinstance(data, dict):
+        records = data if isinstance(data, list) else [data]
+        if not data or not all(isinstance(record, dict) for record in records):
             logger.error("Invalid CV activity data received")
             return jsonify({"error": "Invalid data format"}), 400
             
         # Tambahkan timestamp jika belum ada
-        if "timestamp" not in data:
-            data["timestamp"] = datetime.now().isoformat()
+        for record in records:
+            if "timestamp" not in record:
+                record["timestamp"] = datetime.now().isoformat()
         
-        # Simpan ke file JSON
-        json_saved = save_to_json(data, CV_FILE)
+        # Simpan ke file JSON (satu kali tulis untuk seluruh batch)
+        json_saved = save_to_json(records, CV_FILE, stats_kind="cv")
         
         # Simpan ke MongoDB jika diaktifkan
         mongo_saved = False
         if MONGO_ENABLED and mongo_cv_collection is not None:
             try:
                 # Pastikan timestamp dalam format yang benar untuk MongoDB
-                if isinstance(data["timestamp"], str):
-                    try:
-                        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
-                    except ValueError:
-                        # Jika format datetime tidak valid, biarkan sebagai string
-                        pass
+                for record in records:
+                    if isinstance(record["timestamp"], str):
+                        try:
+                            record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+                        except ValueError:
+                            # Jika format datetime tidak valid, biarkan sebagai string
+                            pass
                 
-                result = mongo_cv_collection.insert_one(data)
-                logger.info(f"Data aktivitas berhasil disimpan ke MongoDB dengan ID: {result.inserted_id}")
+                result = mongo_cv_collection.insert_many(records)
+                logger.info(f"{len(result.inserted_ids)} data aktivitas berhasil disimpan ke MongoDB")
                 mongo_saved = True
             except Exception as e:
                 logger.error(f"Gagal menyimpan data aktivitas ke MongoDB: {str(e)}")
         
+        # Tidak ada penyimpanan yang berhasil: kembalikan 5xx supaya pengirim mencoba lagi
+        if not json_saved and not mongo_saved:
+            logger.error("Gagal menyimpan data aktivitas ke semua penyimpanan")
+            return jsonify({
+                "error": "Storage unavailable",
+                "json_saved": False,
+                "mongo_saved": False
+            }), 503
+        
+        # Tanpa MongoDB ringkasan sudah dihitung ulang dari file oleh save_to_json
+        if mongo_saved:
+            for record in records:
+                record_stats("cv", record)
+        
         return jsonify({
             "status": "cv activity saved", 
+            "count": len(records),
             "json_saved": json_saved,
             "mongo_saved": mongo_saved
         }), 200
@@ -308,8 +620,12 @@ def cv_activity():
         logger.error(traceback.format_exc())
         return jsonify({"error": "Server error"}), 500
 
-def save_to_json(data, file_path):
-    """Helper function untuk menyimpan data ke file JSON"""
+def save_to_json(data, file_path, stats_kind=None):
+    """Helper function untuk menyimpan data (satu object atau list) ke file JSON.
+    
+    File hanya menyimpan max_entries data terakhir. Jika MongoDB tidak aktif dan
+    stats_kind diisi, ringkasan /stats dihitung ulang dari data yang tersimpan.
+    """
     try:
         with open(file_path, "r") as f:
             try:
@@ -319,7 +635,10 @@ def save_to_json(data, file_path):
                 all_data = []
         
         # Tambahkan data baru
-        all_data.append(data)
+        if isinstance(data, list):
+            all_data.extend(data)
+        else:
+            all_data.append(data)
         
         # Ambil max_entries dari konfigurasi
         max_entries = 100
@@ -330,8 +649,11 @@ def save_to_json(data, file_path):
                 logger.warning(f"Invalid max_entries in config, using default: 100")
         
         # Tulis kembali file
+        stored = all_data[-max_entries:]  # simpan [max_entries] data terakhir
         with open(file_path, "w") as f:
-            json.dump(all_data[-max_entries:], f, indent=2)  # simpan [max_entries] data terakhir
+            json.dump(stored, f, indent=2)
+        if stats_kind and not MONGO_ENABLED:
+            replace_stats(stats_kind, stored)
         
         logger.info(f"Data saved successfully to {file_path}")
         return True
@@ -382,10 +704,35 @@ def status():
         "yolo_models": yolo_status
     })
 
+@app.route("/stats")
+def stats():
+    """Jumlah data yang tersimpan dan ringkasan terakhir per ternak (dari memori, O(1)).
+    
+    total sama dengan jumlah data di penyimpanan aktif: seluruh koleksi MongoDB,
+    atau isi file JSON (maksimal max_entries data terakhir) jika MongoDB tidak aktif.
+    """
+    ternak = request.args.get("ternak")
+    with stats_lock:
+        result = {}
+        for kind, stats in data_stats.items():
+            if ternak:
+                summary = stats["ternak"].get(ternak, {"total": 0, "last_timestamp": None, "last_values": {}})
+                result[kind] = dict(summary, last_values=dict(summary["last_values"]))
+            else:
+                result[kind] = {
+                    "total": stats["total"],
+                    "ternak": {name: dict(s, last_values=dict(s["last_values"])) for name, s in stats["ternak"].items()}
+                }
+    result["storage"] = "mongodb" if MONGO_ENABLED else "json"
+    result["timestamp"] = datetime.now().isoformat()
+    return jsonify(result)
+
 @app.route("/download-yolo", methods=["GET"])
 def download_yolo():
     """Endpoint untuk mengunduh dan menguji model YOLOv5 dasar"""
     try:
+        import torch
+        
         logger.info("Mengunduh YOLOv5 dari PyTorch Hub...")
         model = torch.hub.load('ultralytics/yolov5', 'yolov5s', pretrained=True)
         logger.info("YOLOv5 berhasil diunduh!")
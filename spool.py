@@ -0,0 +1,104 @@
+"""
+Antrian data di disk (format JSON Lines) untuk data yang belum terkirim.
+
+Dipakai pengirim data latar belakang saat server tidak dapat dihubungi: batch
+yang gagal ditulis ke file dan dikirim ulang (urut dari yang terlama) begitu
+server kembali. Data tetap ada walaupun proses dihentikan.
+"""
+import json
+import os
+import threading
+
+
+class DiskSpool:
+    """Spool FIFO berbasis file JSON Lines dengan batas jumlah record.
+
+    Jika melebihi max_records, record terlama dibuang agar file tidak tumbuh
+    tanpa batas saat server mati dalam waktu lama.
+    """
+
+    def __init__(self, path, max_records=10000):
+        self.path = path
+        self.max_records = max_records
+        self.dropped = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        records, corrupt = self._read_all(with_corrupt=True)
+        if corrupt:
+            # Tulis ulang tanpa baris rusak agar record berikutnya tidak tersambung
+            # ke baris terpotong yang tidak diakhiri newline
+            self._write_all(records)
+        self._count = len(records)
+
+    def __len__(self):
+        return self._count
+
+    def extend(self, records):
+        """Tambahkan record ke akhir spool"""
+        if not records:
+            return
+        with self._lock:
+            with open(self.path, "a") as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + "\n")
+            self._count += len(records)
+            if self._count > self.max_records:
+                records = self._read_all()
+                overflow = len(records) - self.max_records
+                self.dropped += overflow
+                self._write_all(records[overflow:])
+
+    def peek(self, n):
+        """Ambil maksimal n record terlama tanpa menghapusnya"""
+        with self._lock:
+            if self._count == 0:
+                return []
+            records = []
+            with open(self.path, "r") as f:
+                for line in f:
+                    if len(records) >= n:
+                        break
+                    record = self._parse_line(line)
+                    if record is not None:
+                        records.append(record)
+            return records
+
+    def discard(self, n):
+        """Hapus n record terlama (setelah berhasil dikirim)"""
+        with self._lock:
+            self._write_all(self._read_all()[n:])
+
+    @staticmethod
+    def _parse_line(line):
+        """Record dari satu baris, None untuk baris kosong atau terpotong"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            # Baris terpotong (mis. proses mati saat menulis) dilewati, sama
+            # seperti di _read_all, supaya peek() dan discard() selalu sepakat
+            return None
+
+    def _read_all(self, with_corrupt=False):
+        records, corrupt = [], 0
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for line in f:
+                    record = self._parse_line(line)
+                    if record is not None:
+                        records.append(record)
+                    elif line.strip():
+                        corrupt += 1
+        return (records, corrupt) if with_corrupt else records
+
+    def _write_all(self, records):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+        os.replace(tmp_path, self.path)
+        self._count = len(records)
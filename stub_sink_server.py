@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# stub_sink_server.py
+# Server HTTP stub untuk menguji pengiriman send-sensor.py tanpa Ubidots/server asli
+#
+# Jalankan:  python stub_sink_server.py --port 9001 --delay 0.5
+# Simulator: python send-sensor.py --flask-url http://127.0.0.1:9001/sensor-data \
+#                --ubidots-url http://127.0.0.1:9001/ubidots --interval 1
+# Simulasi gangguan: curl -X POST http://127.0.0.1:9001/_control -H "Content-Type: application/json" -d '{"fail": true}'
+# Per path:           -d '{"path": "/ubidots", "delay": 2}' atau -d '{"path": "/sensor-data", "status": 400}'
+
+import argparse
+import threading
+import time
+
+from flask import Flask, request, jsonify
+
+app = Flask(__name__)
+
+# Jumlah dan isi data yang diterima per path, serta gangguan yang sedang disimulasikan
+# (global, atau per path lewat path_settings yang menimpa nilai global)
+CONTROL_KEYS = ("fail", "delay", "status")
+MAX_PAYLOADS = 1000
+received = {}
+payloads = {}
+received_lock = threading.Lock()
+settings = {"fail": False, "delay": 0.0, "status": None}
+path_settings = {}
+
+
+def effective_settings(path):
+    return dict(settings, **path_settings.get(path, {}))
+
+
+@app.route('/_control', methods=['POST'])
+def control():
+    data = request.get_json(silent=True) or {}
+    target = settings if not data.get("path") else path_settings.setdefault(data["path"], {})
+    for key in CONTROL_KEYS:
+        if key in data:
+            target[key] = data[key]
+    return jsonify({"settings": settings, "paths": path_settings})
+
+
+@app.route('/_reset', methods=['POST'])
+def reset():
+    with received_lock:
+        received.clear()
+        payloads.clear()
+    settings.update(fail=False, delay=0.0, status=None)
+    path_settings.clear()
+    return jsonify({"status": "reset"})
+
+
+@app.route('/_stats', methods=['GET'])
+def stats():
+    with received_lock:
+        return jsonify({"received": dict(received), "payloads": {k: list(v) for k, v in payloads.items()},
+                        "settings": settings, "paths": path_settings})
+
+
+@app.route('/', defaults={'path': ''}, methods=['POST'])
+@app.route('/<path:path>', methods=['POST'])
+def sink(path):
+    path = "/" + path
+    current = effective_settings(path)
+    if current["delay"]:
+        time.sleep(float(current["delay"]))
+    if current["fail"]:
+        return jsonify({"error": "simulated outage"}), 503
+    if current["status"]:
+        return jsonify({"error": "simulated status"}), int(current["status"])
+
+    data = request.get_json(silent=True)
+    records = data if isinstance(data, list) else [data]
+    with received_lock:
+        received[path] = received.get(path, 0) + len(records)
+        stored = payloads.setdefault(path, [])
+        stored.extend(records)
+        del stored[:-MAX_PAYLOADS]
+    return jsonify({"status": "ok"}), 200
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server stub untuk sink data sensor")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--delay", type=float, default=0.0, help="Jeda respons (detik)")
+    parser.add_argument("--fail", action="store_true", help="Mulai dalam kondisi gagal (503)")
+    args = parser.parse_args()
+
+    settings["delay"] = args.delay
+    settings["fail"] = args.fail
+    app.run(host=args.host, port=args.port, threaded=True)
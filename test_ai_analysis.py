@@ -0,0 +1,88 @@
+"""
+Test AnalysisCache dan HttpBackend (ai_analysis.py) terhadap fake_model_server.py.
+
+Jalankan: python -m pytest -q test_ai_analysis.py
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("requests")
+
+from werkzeug.serving import make_server
+
+import fake_model_server
+from ai_analysis import AnalysisCache, HttpBackend
+
+READINGS = {"suhu": 30.1, "kelembapan": 61.0, "kualitas_udara": 120.0, "jarak_pakan": 4.0}
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = make_server("127.0.0.1", 0, fake_model_server.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def backend(server_url, monkeypatch):
+    monkeypatch.setattr(fake_model_server, "call_count", 0)
+    monkeypatch.setattr(fake_model_server, "response_delay", 0.0)
+    return HttpBackend(f"{server_url}/generate", timeout=10)
+
+
+def test_http_backend_returns_model_text(backend):
+    text = backend.generate("Analisis ternak sapi")
+    assert text.startswith("## Status Kesehatan")
+    assert fake_model_server.call_count == 1
+
+
+def test_concurrent_identical_snapshots_call_the_model_once(backend, monkeypatch):
+    monkeypatch.setattr(fake_model_server, "response_delay", 0.3)
+    cache = AnalysisCache(backend)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def analyze():
+        barrier.wait()
+        results.append(cache.analyze("sapi", READINGS, "Makan"))
+
+    threads = [threading.Thread(target=analyze) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake_model_server.call_count == 1
+    assert len({text for text, _ in results}) == 1
+    assert [cached for _, cached in results].count(False) == 1
+    assert (cache.misses, cache.hits) == (1, 7)
+
+
+def test_quantized_snapshot_hits_cache_and_expired_entry_refreshes(backend):
+    cache = AnalysisCache(backend, ttl=0.2)
+    assert cache.analyze("sapi", READINGS, "Makan")[1] is False
+    # Perubahan di bawah resolusi kuantisasi dianggap snapshot yang sama
+    assert cache.analyze("sapi", dict(READINGS, suhu=30.2), "makan ")[1] is True
+    assert fake_model_server.call_count == 1
+
+    time.sleep(0.3)
+    assert cache.analyze("sapi", READINGS, "Makan")[1] is False
+    assert fake_model_server.call_count == 2
+
+
+def test_least_recently_used_entry_is_evicted(backend):
+    cache = AnalysisCache(backend, max_entries=2)
+    cache.analyze("sapi", READINGS, "Makan")
+    cache.analyze("ayam", READINGS, "Makan")
+    # sapi baru saja dipakai, jadi ayam yang dibuang saat kambing masuk
+    assert cache.analyze("sapi", READINGS, "Makan")[1] is True
+    cache.analyze("kambing", READINGS, "Makan")
+    assert cache.analyze("sapi", READINGS, "Makan")[1] is True
+    assert cache.analyze("ayam", READINGS, "Makan")[1] is False
+    assert fake_model_server.call_count == 4
@@ -0,0 +1,61 @@
+"""
+Batas waktu import server.py untuk cold start fungsi serverless (Netlify).
+
+Import diukur dengan `python -X importtime` di proses baru. Test gagal jika
+modul vision (torch, cv2, numpy) ikut ter-import, atau jika total waktu import
+melebihi anggaran. Atur anggaran dengan FACTS_IMPORT_BUDGET_MS.
+
+Jalankan: python -m pytest -q test_cold_start.py
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_BUDGET_MS = float(os.environ.get("FACTS_IMPORT_BUDGET_MS", "1500"))
+HEAVY_MODULES = ("torch", "cv2", "numpy", "tiling", "gradio")
+
+
+def import_times(module, tmp_path, extra_paths=()):
+    """Jalankan import di proses baru, kembalikan {modul: waktu kumulatif (us)}"""
+    env = dict(os.environ, FACTS_DATA_DIR=str(tmp_path),
+               PYTHONPATH=os.pathsep.join([*extra_paths, ROOT_DIR]))
+    # cwd di folder kosong supaya config.ini lokal tidak ikut terbaca (MongoDB nonaktif)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_server_import_skips_vision_modules(tmp_path):
+    times = import_times("server", tmp_path)
+    loaded = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+    assert not loaded, f"modul berat ter-import saat cold start: {sorted(loaded)[:10]}"
+
+
+def test_server_import_within_budget(tmp_path):
+    times = import_times("server", tmp_path)
+    total_ms = times["server"] / 1000
+    assert total_ms <= IMPORT_BUDGET_MS, (
+        f"import server {total_ms:.0f} ms melebihi anggaran {IMPORT_BUDGET_MS:.0f} ms"
+    )
+
+
+def test_netlify_handler_import_within_budget(tmp_path):
+    times = import_times("api", tmp_path, [os.path.join(ROOT_DIR, "netlify", "functions")])
+    loaded = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+    assert not loaded, f"modul berat ter-import saat cold start: {sorted(loaded)[:10]}"
+    assert times["api"] / 1000 <= IMPORT_BUDGET_MS
@@ -0,0 +1,60 @@
+"""
+Test downsampling LTTB dan grafik sensor (dashboard_charts.py).
+
+Jalankan: python -m pytest -q test_dashboard_charts.py
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("plotly")
+
+from dashboard_charts import SENSOR_CHARTS, downsample, lttb_indices, sensor_chart_figure
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 3), (11, 10), (1000, 100), (10007, 1200), (5000, 4999)])
+def test_lttb_keeps_endpoints_and_returns_n_out_monotonic_indices(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=np.float64)
+    y = rng.normal(size=n).cumsum()
+    picked = lttb_indices(x, y, n_out)
+
+    assert len(picked) == n_out
+    assert picked[0] == 0 and picked[-1] == n - 1
+    assert (np.diff(picked) > 0).all()
+
+
+@pytest.mark.parametrize("n, n_out", [(5, 5), (5, 10), (0, 10), (100, 2)])
+def test_lttb_passes_short_series_through(n, n_out):
+    assert list(lttb_indices(np.arange(n), np.zeros(n), n_out)) == list(range(n))
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(10000)
+    y[1234], y[8765] = 50.0, -50.0
+    picked = lttb_indices(np.arange(10000), y, 100)
+    assert 1234 in picked and 8765 in picked
+
+
+def test_downsample_handles_datetime_index_and_nan():
+    index = pd.date_range("2025-01-01", periods=5000, freq="5s")
+    values = np.sin(np.arange(5000) / 50.0)
+    values[10] = np.nan
+    x, y = downsample(index, values, 500)
+    assert len(x) == len(y) == 500
+    assert x[0] == index[0] and x[-1] == index[-1]
+
+    # Seri pendek dikembalikan apa adanya
+    x, y = downsample(index[:100], values[:100], 500)
+    assert len(x) == 100
+
+
+def test_sensor_chart_figure_uses_shared_config():
+    frame = pd.DataFrame({"suhu": np.linspace(28, 36, 3000)},
+                         index=pd.date_range("2025-01-01", periods=3000, freq="5s"))
+    chart = next(chart for chart in SENSOR_CHARTS if chart[0] == "suhu")
+    fig = sensor_chart_figure(frame, chart, "sapi", "plotly_white", {"success": "green", "error": "red"}, n_out=300)
+
+    assert fig.layout.title.text == "Suhu untuk Sapi (°C)"
+    assert len(fig.data[0].x) == 300
+    assert [(shape.y0, shape.line.color) for shape in fig.layout.shapes] == [(30, "green"), (35, "red")]
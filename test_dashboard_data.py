@@ -0,0 +1,89 @@
+"""
+Test IncrementalLoader (dashboard_data.py) dengan file JSON.
+
+Jalankan: python -m pytest -q test_dashboard_data.py
+"""
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from dashboard_data import SENSOR_FIELDS, SENSOR_METRICS, IncrementalLoader, metric_value
+
+
+def write_records(path, records):
+    with open(path, "w") as f:
+        json.dump(records, f)
+    # Pastikan tanda tangan file (mtime, ukuran) berubah walau ditulis cepat berturut-turut
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def reading(timestamp, suhu):
+    return {"ternak": "sapi", "timestamp": timestamp.isoformat(), "suhu": suhu,
+            "kelembapan": 60.0, "kualitas_udara": 50.0, "jarak_pakan": 5.0}
+
+
+def make_loader(path, window=None):
+    return IncrementalLoader(json_path=str(path), window=window, ternak="sapi",
+                             fields=SENSOR_FIELDS, metrics=SENSOR_METRICS)
+
+
+def test_rows_leaving_the_window_are_dropped_without_new_data(tmp_path, monkeypatch):
+    path = tmp_path / "sensor_data.json"
+    now = datetime.now().replace(microsecond=0)
+    write_records(path, [reading(now - timedelta(minutes=50), 30.0), reading(now - timedelta(minutes=5), 31.0)])
+    loader = make_loader(path, window=timedelta(hours=1))
+    assert len(loader.load()) == 2
+
+    # 20 menit kemudian, tanpa data baru: baris pertama sudah di luar jendela 1 jam
+    later = now + timedelta(minutes=20)
+    monkeypatch.setattr(IncrementalLoader, "_window_start", lambda self: later - self.window)
+    frame = loader.load()
+    assert list(frame["suhu"]) == [31.0]
+    assert loader.hourly_counts()["count"].sum() == 1
+
+
+def test_new_records_with_the_same_timestamp_are_loaded(tmp_path):
+    path = tmp_path / "sensor_data.json"
+    timestamp = datetime(2025, 1, 1, 12, 0, 0)
+    records = [reading(timestamp, 30.0)]
+    write_records(path, records)
+    loader = make_loader(path)
+    assert len(loader.load()) == 1
+
+    # Record agregat berikutnya punya timestamp (resolusi detik) yang sama
+    records.append(reading(timestamp, 32.0))
+    write_records(path, records)
+    assert list(loader.load()["suhu"]) == [30.0, 32.0]
+
+    # Tidak ada perubahan isi: tidak ada baris ganda
+    write_records(path, records)
+    assert len(loader.load()) == 2
+
+
+def test_rotated_file_only_appends_records_after_the_last_seen(tmp_path):
+    path = tmp_path / "sensor_data.json"
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    records = [reading(start + timedelta(seconds=i), float(i)) for i in range(5)]
+    write_records(path, records)
+    loader = make_loader(path)
+    loader.load()
+
+    # Server memotong file ke max_entries terakhir sambil menambah record baru
+    records = records[2:] + [reading(start + timedelta(seconds=i), float(i)) for i in range(5, 7)]
+    write_records(path, records)
+    assert list(loader.load()["suhu"]) == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+
+
+def test_metric_values_are_rounded_without_float32_artifacts(tmp_path):
+    path = tmp_path / "sensor_data.json"
+    write_records(path, [reading(datetime(2025, 1, 1, 12, 0, 0), 35.3)])
+    latest = make_loader(path).load().iloc[-1]
+
+    assert float(latest["suhu"]) != 35.3  # float32
+    assert metric_value(latest["suhu"]) == 35.3
+    assert f"{metric_value(latest['suhu'])} °C" == "35.3 °C"
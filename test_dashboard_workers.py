@@ -0,0 +1,77 @@
+"""
+Test DetectionWorker (dashboard_workers.py) yang dipakai bersama beberapa sesi.
+
+Model YOLO diganti model palsu dan thread kamera tidak dijalankan; yang diuji
+hanya pembagian deteksi per sesi dan penghentian kamera berbasis jumlah sesi.
+
+Jalankan: python -m pytest -q test_dashboard_workers.py
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("requests")
+
+from dashboard_workers import DetectionWorker
+
+
+class FakeBoxes:
+    def __init__(self, confidences):
+        self.conf = [np.array([c]) for c in confidences]
+
+    def __len__(self):
+        return len(self.conf)
+
+    def __getitem__(self, i):
+        return type("Box", (), {"conf": self.conf[i]})()
+
+
+class FakeResult:
+    def __init__(self, confidences):
+        self.boxes = FakeBoxes(confidences)
+
+    def plot(self):
+        return np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+def fake_model(confidences):
+    return lambda frame, verbose=False: [FakeResult(confidences)]
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    sent = []
+    worker = DetectionWorker("model.pt", on_detection=lambda *detection: sent.append(detection))
+    worker.calls = {"start": 0, "stop": 0}
+    monkeypatch.setattr(worker, "start", lambda: worker.calls.__setitem__("start", worker.calls["start"] + 1))
+    monkeypatch.setattr(worker, "stop", lambda: worker.calls.__setitem__("stop", worker.calls["stop"] + 1))
+    worker.sent = sent
+    return worker
+
+
+def test_detections_are_broadcast_to_every_session(worker):
+    worker.acquire("a")
+    worker.acquire("b")
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    worker._process_frame(fake_model([0.9, 0.8]), frame)
+    worker._process_frame(fake_model([]), frame)
+
+    first = worker.drain_detections("a")
+    assert [(confidence, count) for _, confidence, count in first] == [(pytest.approx(0.9), 2)]
+    assert worker.drain_detections("a") == []
+    # Sesi lain tetap menerima deteksi yang sama
+    assert worker.drain_detections("b") == first
+    # Data hanya dikirim ke server sekali, bukan sekali per sesi
+    assert len(worker.sent) == 1
+    assert worker.drain_detections("unknown") == []
+
+
+def test_camera_stops_only_when_the_last_session_releases(worker):
+    worker.acquire("a")
+    worker.acquire("b")
+    assert worker.sessions == 2
+
+    assert worker.release("a") is False
+    assert worker.calls["stop"] == 0
+    assert worker.release("b") is True
+    assert worker.calls["stop"] == 1 and worker.sessions == 0
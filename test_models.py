@@ -3,40 +3,51 @@ import os
 import glob
 import json
 import platform
+import numpy as np
 from pathlib import Path
 
+from yolo_hub import DEFAULT_WEIGHTS, MODEL_DIR, hub_load, hub_source
+
 # Path model
-MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
 print(f"Model directory: {MODEL_DIR}")
 
-# Check semua file .pt
-pt_files = glob.glob(os.path.join(MODEL_DIR, "*.pt"))
+# Check semua file .pt (bobot default yolov5s diuji terpisah)
+pt_files = [p for p in glob.glob(os.path.join(MODEL_DIR, "*.pt")) if p != DEFAULT_WEIGHTS]
 print(f"Found model files: {pt_files}")
 
 # Cek versi torch
 print(f"PyTorch version: {torch.__version__}")
 print(f"Python version: {platform.python_version()}")
 print(f"Platform: {platform.system()} {platform.release()}")
+repo, source = hub_source()
+print(f"YOLOv5 hub source: {source} ({repo})")
 
 # Simpan informasi ini ke file untuk dilihat nanti
 system_info = {
     "platform": f"{platform.system()} {platform.release()}",
     "python": platform.python_version(),
     "torch": torch.__version__,
+    "hub_source": source,
     "model_files": [os.path.basename(p) for p in pt_files],
 }
 
 with open("system_info.json", "w") as f:
     json.dump(system_info, f, indent=2)
 
+# Gambar uji offline: FACTS_TEST_IMAGE jika diisi, jika tidak frame sintetis 640x480
+test_image_path = os.environ.get("FACTS_TEST_IMAGE")
+if test_image_path and Path(test_image_path).exists():
+    sample_img = test_image_path
+else:
+    sample_img = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
 # Coba load YOLOv5 default
 try:
     print("Loading default YOLOv5s model...")
-    model = torch.hub.load('ultralytics/yolov5', 'yolov5s', pretrained=True)
+    model = hub_load(DEFAULT_WEIGHTS)
     print("Default model loaded successfully")
-    
+
     # Test dengan gambar sample
-    sample_img = "https://ultralytics.com/images/zidane.jpg"
     results = model(sample_img)
     print(f"Default model detections: {len(results.xyxy[0])}")
 except Exception as e:
@@ -47,12 +58,11 @@ for model_path in pt_files:
     model_name = os.path.basename(model_path)
     try:
         print(f"Loading custom model: {model_name}...")
-        model = torch.hub.load('ultralytics/yolov5', 'custom', path=model_path)
+        model = hub_load(model_path)
         print(f"Custom model {model_name} loaded successfully")
-        
+
         # Test dengan gambar sample
         try:
-            sample_img = "https://ultralytics.com/images/zidane.jpg"
             results = model(sample_img)
             print(f"Model {model_name} detections: {len(results.xyxy[0])}")
         except Exception as e:
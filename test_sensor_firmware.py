@@ -0,0 +1,200 @@
+"""
+Test logika firmware MicroPython (sensor.py) di CPython.
+
+Modul khusus MicroPython (machine, dht, network, urequests) diganti stub
+sebelum sensor.py di-import, sehingga agregasi jendela, ring buffer flash,
+dan store-and-forward bisa diuji tanpa perangkat.
+
+Jalankan: python -m pytest -q test_sensor_firmware.py
+"""
+import importlib
+import json
+import os
+import sys
+import types
+
+import pytest
+
+
+class FakePin:
+    IN, OUT = 0, 1
+
+    def __init__(self, pin, mode=None):
+        self.pin = pin
+
+    def value(self, value=None):
+        return 0
+
+
+class FakeADC:
+    ATTN_11DB = 3
+
+    def __init__(self, pin):
+        self.reading = 2048
+
+    def atten(self, value):
+        pass
+
+    def read(self):
+        return self.reading
+
+
+class FakeDHT22:
+    def __init__(self, pin):
+        self.values = (30.0, 60.0)
+
+    def measure(self):
+        pass
+
+    def temperature(self):
+        return self.values[0]
+
+    def humidity(self):
+        return self.values[1]
+
+
+class FakeWLAN:
+    connected = True
+
+    def __init__(self, mode):
+        pass
+
+    def active(self, value):
+        pass
+
+    def isconnected(self):
+        return FakeWLAN.connected
+
+    def connect(self, ssid, password):
+        pass
+
+    def ifconfig(self):
+        return ("192.168.1.10",)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+class FakeRequests:
+    """Stub urequests: mencatat body yang dikirim, bisa disetel gagal"""
+
+    def __init__(self):
+        self.posts = []
+        self.fail = False
+
+    def post(self, url, headers=None, data=None):
+        if self.fail:
+            raise OSError("network unreachable")
+        self.posts.append(json.loads(data))
+        return FakeResponse(200)
+
+
+@pytest.fixture
+def sensor(tmp_path, monkeypatch):
+    machine = types.ModuleType("machine")
+    machine.Pin, machine.ADC = FakePin, FakeADC
+    machine.reset = lambda: None
+    dht = types.ModuleType("dht")
+    dht.DHT22 = FakeDHT22
+    network = types.ModuleType("network")
+    network.WLAN, network.STA_IF = FakeWLAN, 0
+    urequests = FakeRequests()
+    for name, module in (("machine", machine), ("dht", dht), ("network", network), ("urequests", urequests)):
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.chdir(tmp_path)
+    FakeWLAN.connected = True
+
+    sys.modules.pop("sensor", None)
+    module = importlib.import_module("sensor")
+    yield module
+    sys.modules.pop("sensor", None)
+
+
+def test_window_aggregator_min_mean_max(sensor):
+    aggregator = sensor.WindowAggregator(window_seconds=60)
+    aggregator.add(1000, {"suhu": 30.0, "kelembapan": 60.0, "jarak_pakan": None})
+    aggregator.add(1030, {"suhu": 32.0, "kelembapan": 64.0, "jarak_pakan": 10.0})
+    assert not aggregator.ready(1059)
+    assert aggregator.ready(1060)
+
+    record = aggregator.flush(1060, "sapi")
+    assert record["type"] == "aggregate"
+    assert record["ternak"] == "sapi"
+    assert (record["window_start"], record["window_end"], record["samples"]) == (1000, 1060, 2)
+    assert record["metrics"]["suhu"] == [30.0, 31.0, 32.0]
+    assert record["metrics"]["kelembapan"] == [60.0, 62.0, 64.0]
+    # Sampel dengan nilai None tidak ikut dihitung
+    assert record["metrics"]["jarak_pakan"] == [10.0, 10.0, 10.0]
+    assert aggregator.start is None and aggregator.flush(1120) is None
+
+
+def test_flash_ring_persists_and_overwrites_oldest(sensor):
+    ring = sensor.FlashRing("ring.dat", capacity=3, slot_size=64)
+    for i in range(4):
+        ring.append({"i": i})
+    assert len(ring) == 3 and ring.dropped == 1
+    assert ring.peek(10) == [{"i": 1}, {"i": 2}, {"i": 3}]
+
+    ring.discard(1)
+    # Setelah reboot posisi head/count dibaca dari file .meta
+    reopened = sensor.FlashRing("ring.dat", capacity=3, slot_size=64)
+    assert reopened.peek(10) == [{"i": 2}, {"i": 3}]
+    assert os.path.getsize("ring.dat") == 3 * 64
+
+    with pytest.raises(ValueError):
+        reopened.append({"data": "x" * 100})
+
+
+def test_aggregate_record_fits_in_slot(sensor):
+    aggregator = sensor.WindowAggregator()
+    aggregator.add(1760000000, {name: 12345.678 for name in sensor.METRICS})
+    record = aggregator.flush(1760000060, "kambing")
+    assert len(json.dumps(record).encode()) <= sensor.SLOT_SIZE
+
+
+def test_backlog_is_kept_offline_and_sent_in_batches(sensor):
+    urequests = sys.modules["urequests"]
+    backlog = sensor.FlashRing("backlog.dat", capacity=50, slot_size=sensor.SLOT_SIZE)
+    aggregator = sensor.WindowAggregator(window_seconds=10)
+
+    # Koneksi putus: ringkasan tetap tersimpan di flash
+    urequests.fail = True
+    for now in range(0, 300, 5):
+        sensor.step(aggregator, backlog, now=now)
+    stored = len(backlog)
+    assert stored > sensor.SEND_BATCH_SIZE
+    assert urequests.posts == []
+
+    # Koneksi kembali: backlog dikirim per batch saat jendela berikutnya ditutup
+    urequests.fail = False
+    for now in range(300, 320, 5):
+        sensor.step(aggregator, backlog, now=now)
+    assert len(backlog) == 0
+    sent = [record for batch in urequests.posts for record in batch]
+    assert len(sent) == stored + 1
+    assert all(len(batch) <= sensor.SEND_BATCH_SIZE for batch in urequests.posts)
+    assert [record["window_end"] for record in sent] == sorted(record["window_end"] for record in sent)
+    assert sent[0]["metrics"]["suhu"] == [30.0, 30.0, 30.0]
+
+
+def test_torn_backlog_slot_is_skipped_and_discarded(sensor):
+    urequests = sys.modules["urequests"]
+    backlog = sensor.FlashRing("backlog.dat", capacity=5, slot_size=64)
+    for i in range(3):
+        backlog.append({"i": i})
+
+    # Listrik mati saat slot tengah ditulis: isi slot terpotong
+    with open("backlog.dat", "r+b") as f:
+        f.seek(64)
+        f.write(b'{"i": 1, "su' + b"\x00" * 52)
+
+    assert backlog.peek(10) == [{"i": 0}, {"i": 2}]
+    assert backlog.peeked == 3
+    assert sensor.forward_backlog(backlog, batch_size=2)
+    assert urequests.posts == [[{"i": 0}], [{"i": 2}]]
+    assert len(backlog) == 0
@@ -0,0 +1,86 @@
+"""
+Test bagian deterministik uji beban (sensor_loadtest.py): jadwal kedatangan,
+persentil, dan perbandingan dengan baseline. Tidak butuh aiohttp maupun server.
+
+Jalankan: python -m pytest -q test_sensor_loadtest.py
+"""
+import random
+
+import pytest
+
+from sensor_loadtest import (
+    REGRESSION_THRESHOLD, EndpointStats, arrival_times, compare_reports, percentile
+)
+
+
+def test_constant_arrivals_are_evenly_spaced():
+    times = arrival_times("constant", rate=4, duration=2)
+    assert times == pytest.approx([0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75])
+
+
+def test_poisson_arrivals_are_reproducible_with_a_seed():
+    first = arrival_times("poisson", rate=50, duration=20, rng=random.Random(42))
+    second = arrival_times("poisson", rate=50, duration=20, rng=random.Random(42))
+    assert first == second
+    assert first == sorted(first) and all(0 < t < 20 for t in first)
+    # Rata-rata sekitar rate * duration = 1000 request
+    assert 900 <= len(first) <= 1100
+
+
+def test_bursty_arrivals_come_in_bursts_with_the_same_average_rate():
+    times = arrival_times("bursty", rate=50, duration=20, burst_size=10, rng=random.Random(7))
+    assert len(times) % 10 == 0
+    assert all(len(set(times[i:i + 10])) == 1 for i in range(0, len(times), 10))
+    assert 800 <= len(times) <= 1200
+
+
+def test_arrival_times_edge_cases():
+    assert arrival_times("poisson", rate=0, duration=10) == []
+    with pytest.raises(ValueError):
+        arrival_times("gelombang", rate=1, duration=10)
+
+
+def test_percentile_interpolates_between_values():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile(values, 50) == pytest.approx(25.0)
+    assert percentile(values, 0) == 10.0 and percentile(values, 100) == 40.0
+    assert percentile([], 95) is None
+
+
+def summary(p95, throughput):
+    return {"throughput_rps": throughput, "latency_ms_p50": 10.0, "latency_ms_p95": p95, "latency_ms_p99": p95}
+
+
+def test_compare_reports_flags_changes_above_the_threshold():
+    assert REGRESSION_THRESHOLD == 10.0
+    baseline = {"endpoints": {"/sensor-data": summary(100.0, 200.0)}}
+
+    # Tepat di ambang (+10% latency, -10% throughput) belum dianggap regresi
+    lines, regressed = compare_reports({"endpoints": {"/sensor-data": summary(110.0, 180.0)}}, baseline)
+    assert not regressed and not any("regresi" in line for line in lines)
+
+    lines, regressed = compare_reports({"endpoints": {"/sensor-data": summary(111.0, 200.0)}}, baseline)
+    assert regressed and any("latency_ms_p95" in line and "regresi" in line for line in lines)
+
+    _, regressed = compare_reports({"endpoints": {"/sensor-data": summary(100.0, 179.0)}}, baseline)
+    assert regressed
+
+    # Lebih cepat bukan regresi
+    _, regressed = compare_reports({"endpoints": {"/sensor-data": summary(50.0, 400.0)}}, baseline)
+    assert not regressed
+
+
+def test_compare_reports_skips_endpoints_missing_from_the_baseline():
+    lines, regressed = compare_reports({"endpoints": {"/detect": summary(100.0, 5.0)}}, {"endpoints": {}})
+    assert lines == ["  /detect: tidak ada di baseline"] and not regressed
+
+
+def test_endpoint_stats_summary_counts_errors_separately():
+    stats = EndpointStats()
+    for latency in (0.01, 0.02, 0.03):
+        stats.record(latency, 200)
+    stats.record(0.5, 503)
+    stats.record_error(1.0)
+    result = stats.summary(elapsed=1.0)
+    assert (result["requests"], result["errors"], result["throughput_rps"]) == (5, 2, 3.0)
+    assert result["status_codes"] == {"200": 3, "503": 1, "error": 1}
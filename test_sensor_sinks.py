@@ -0,0 +1,131 @@
+"""
+Test pengiriman multi-sink (sensor_sinks.py) terhadap stub_sink_server.py.
+
+Server stub dijalankan di thread lokal; gangguan (503, 4xx, respons lambat)
+diatur per path lewat /_control.
+
+Jalankan: python -m pytest -q test_sensor_sinks.py
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+requests = pytest.importorskip("requests")
+
+from werkzeug.serving import make_server
+
+import stub_sink_server
+from sensor_sinks import HttpSink, SinkForwarder
+
+# Backoff pendek supaya pengiriman ulang terjadi dalam hitungan detik
+WORKER_OPTIONS = {"max_backoff": 0.2}
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = make_server("127.0.0.1", 0, stub_sink_server.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def stub(stub_url):
+    requests.post(f"{stub_url}/_reset")
+    return stub_url
+
+
+def control(url, **settings):
+    requests.post(f"{url}/_control", json=settings).raise_for_status()
+
+
+def received(url, path):
+    return requests.get(f"{url}/_stats").json()["payloads"].get(path, [])
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def forwarder_factory(tmp_path):
+    forwarders = []
+
+    def make(sinks):
+        forwarder = SinkForwarder(sinks, str(tmp_path), **WORKER_OPTIONS)
+        forwarder.start()
+        forwarders.append(forwarder)
+        return forwarder
+
+    yield make
+    for forwarder in forwarders:
+        forwarder.stop(timeout=2.0)
+
+
+def test_failed_sends_are_spooled_and_replayed_oldest_first(stub, forwarder_factory):
+    control(stub, path="/flask", fail=True)
+    forwarder = forwarder_factory({"flask": HttpSink(f"{stub}/flask")})
+    for i in range(5):
+        forwarder.publish({"i": i})
+
+    worker = forwarder.workers["flask"]
+    assert wait_for(lambda: len(worker.spool) == 5)
+    assert worker.failures >= 1 and received(stub, "/flask") == []
+
+    control(stub, path="/flask", fail=False)
+    assert wait_for(lambda: worker.sent == 5)
+    assert [record["i"] for record in received(stub, "/flask")] == [0, 1, 2, 3, 4]
+    assert len(worker.spool) == 0
+
+
+def test_client_errors_are_dropped_not_retried(stub, forwarder_factory):
+    control(stub, path="/flask", status=400)
+    forwarder = forwarder_factory({"flask": HttpSink(f"{stub}/flask")})
+    forwarder.publish({"i": 0})
+    forwarder.publish({"i": 1})
+
+    worker = forwarder.workers["flask"]
+    assert wait_for(lambda: worker.rejected == 2)
+    assert len(worker.spool) == 0 and worker.failures == 0
+
+    # Worker tetap berjalan untuk record berikutnya
+    control(stub, path="/flask", status=None)
+    forwarder.publish({"i": 2})
+    assert wait_for(lambda: worker.sent == 1)
+    assert received(stub, "/flask") == [{"i": 2}]
+
+
+def test_slow_sink_does_not_block_other_sinks(stub, forwarder_factory):
+    control(stub, path="/slow", delay=1.0)
+    forwarder = forwarder_factory({
+        "slow": HttpSink(f"{stub}/slow"),
+        "fast": HttpSink(f"{stub}/fast"),
+    })
+    start = time.monotonic()
+    for i in range(5):
+        forwarder.publish({"i": i})
+
+    assert wait_for(lambda: forwarder.workers["fast"].sent == 5, timeout=2.0)
+    assert time.monotonic() - start < 2.0
+    assert forwarder.workers["slow"].sent <= 2
+
+
+def test_truncated_spool_line_does_not_stop_the_worker(stub, forwarder_factory, tmp_path):
+    # Spool dari run sebelumnya yang terpotong saat proses mati
+    spool_path = tmp_path / "sensor_flask_spool.jsonl"
+    spool_path.write_text('{"i": 0}\n{"i": 1}\n{"i": 2, "su')
+
+    forwarder = forwarder_factory({"flask": HttpSink(f"{stub}/flask")})
+    forwarder.publish({"i": 3})
+    worker = forwarder.workers["flask"]
+    assert wait_for(lambda: worker.sent == 3)
+    assert [record["i"] for record in received(stub, "/flask")] == [0, 1, 3]
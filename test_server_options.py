@@ -0,0 +1,65 @@
+"""
+Test parsing opsi request di server.py (/detect dan /cameras/<id>).
+
+Jalankan: python -m pytest -q test_server_options.py
+"""
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+# Jangan sentuh folder data/ milik repo saat server di-import
+os.environ.setdefault("FACTS_DATA_DIR", tempfile.mkdtemp(prefix="facts-test-"))
+
+import server
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "CAMERA_FILE", str(tmp_path / "cameras.json"))
+    monkeypatch.setattr(server, "camera_configs", {})
+    return server.app.test_client()
+
+
+@pytest.mark.parametrize("value, expected", [
+    (True, True), (False, False), (1, True), (0, False),
+    ("true", True), ("False", False), ("0", False), (" yes ", True), ("off", False),
+])
+def test_parse_bool(value, expected):
+    assert server.parse_bool(value, "tiled") is expected
+
+
+@pytest.mark.parametrize("value", ["maybe", 2, None, [True]])
+def test_parse_bool_rejects_other_values(value):
+    with pytest.raises(ValueError):
+        server.parse_bool(value, "tiled")
+
+
+def test_camera_config_stores_string_false_as_false(client):
+    roi = [[0, 0], [1, 0], [1, 1]]
+    assert client.put("/cameras/cam1", json={"roi": roi, "tiled": "false"}).status_code == 200
+    assert client.get("/cameras/cam1").get_json()["tiled"] is False
+
+    response = client.put("/cameras/cam1", json={"roi": roi, "tiled": "kadang"})
+    assert response.status_code == 400
+
+
+def test_tile_options_are_only_validated_when_tiled(client):
+    request = {"image": "", "model": "tidak-ada", "tile_size": 10}
+
+    # tiled "false": opsi tile diabaikan, request lanjut ke pengecekan model
+    response = client.post("/detect", json=dict(request, tiled="false"))
+    assert response.status_code == 400
+    assert "not available" in response.get_json()["error"]
+
+    response = client.post("/detect", json=dict(request, tiled="true"))
+    assert response.status_code == 400
+    assert "tile_size" in response.get_json()["error"]
+
+    response = client.post("/detect", json=dict(request, tiled="maybe"))
+    assert response.get_json()["error"] == "tiled must be a boolean"
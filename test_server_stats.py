@@ -0,0 +1,77 @@
+"""
+Test ringkasan /stats (server.py) dengan penyimpanan file JSON.
+
+Tanpa MongoDB, total di /stats harus sama dengan jumlah data di file JSON,
+yang hanya menyimpan max_entries data terakhir. Jika tidak ada penyimpanan
+yang berhasil, endpoint data mengembalikan 5xx.
+
+Jalankan: python -m pytest -q test_server_stats.py
+"""
+import json
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+# Jangan sentuh folder data/ milik repo saat server di-import
+os.environ.setdefault("FACTS_DATA_DIR", tempfile.mkdtemp(prefix="facts-test-"))
+
+import server
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Server membuat file kosong saat start; lakukan hal yang sama di folder sementara
+    for name in ("sensor_data.json", "cv_activity.json"):
+        (tmp_path / name).write_text("[]")
+    monkeypatch.setattr(server, "SENSOR_FILE", str(tmp_path / "sensor_data.json"))
+    monkeypatch.setattr(server, "CV_FILE", str(tmp_path / "cv_activity.json"))
+    monkeypatch.setattr(server, "MONGO_ENABLED", False)
+    monkeypatch.setattr(server, "data_stats", {kind: {"total": 0, "ternak": {}} for kind in server.STATS_FIELDS})
+    config = server.configparser.ConfigParser()
+    config["DATA"] = {"max_entries": "3"}
+    monkeypatch.setattr(server, "config", config)
+    return server.app.test_client()
+
+
+def sensor_record(ternak, suhu):
+    return {"ternak": ternak, "suhu": suhu, "kelembapan": 60.0, "kualitas_udara": 50.0}
+
+
+def test_stats_total_matches_the_stored_json_file(client):
+    for i in range(5):
+        ternak = "sapi" if i % 2 == 0 else "ayam"
+        assert client.post("/sensor-data", json=sensor_record(ternak, 30.0 + i)).status_code == 200
+
+    with open(server.SENSOR_FILE) as f:
+        stored = json.load(f)
+    stats = client.get("/stats").get_json()
+
+    assert len(stored) == 3
+    assert stats["storage"] == "json"
+    assert stats["sensor"]["total"] == 3
+    assert stats["sensor"]["ternak"]["sapi"]["total"] == 2
+    assert stats["sensor"]["ternak"]["ayam"]["total"] == 1
+    assert stats["sensor"]["ternak"]["sapi"]["last_values"]["suhu"] == 34.0
+
+
+def test_seeded_stats_match_the_file(client):
+    client.post("/sensor-data", json=[sensor_record("sapi", 30.0), sensor_record("kambing", 31.0)])
+    server.data_stats["sensor"] = {"total": 0, "ternak": {}}
+
+    # Seperti saat server baru dinyalakan
+    server.seed_stats()
+    stats = client.get("/stats?ternak=kambing").get_json()
+    assert server.data_stats["sensor"]["total"] == 2
+    assert stats["sensor"]["total"] == 1
+
+
+def test_nothing_persisted_returns_server_error(client, monkeypatch):
+    monkeypatch.setattr(server, "SENSOR_FILE", os.path.join(os.path.dirname(server.SENSOR_FILE), "missing", "x.json"))
+    response = client.post("/sensor-data", json=sensor_record("sapi", 30.0))
+    assert response.status_code == 503
+    assert response.get_json()["json_saved"] is False
+    assert client.get("/stats").get_json()["sensor"]["total"] == 0
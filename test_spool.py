@@ -0,0 +1,46 @@
+"""
+Test DiskSpool (spool.py): urutan FIFO, batas record, dan baris terpotong.
+
+Jalankan: python -m pytest -q test_spool.py
+"""
+import json
+
+from spool import DiskSpool
+
+
+def test_fifo_peek_discard_and_overflow(tmp_path):
+    spool = DiskSpool(str(tmp_path / "spool.jsonl"), max_records=3)
+    spool.extend([{"i": i} for i in range(4)])
+    assert len(spool) == 3 and spool.dropped == 1
+    assert spool.peek(2) == [{"i": 1}, {"i": 2}]
+
+    spool.discard(2)
+    assert spool.peek(10) == [{"i": 3}]
+
+
+def test_truncated_tail_line_is_skipped(tmp_path):
+    path = tmp_path / "spool.jsonl"
+    spool = DiskSpool(str(path))
+    spool.extend([{"i": 0}, {"i": 1}])
+    # Proses mati saat menulis: baris terakhir terpotong tanpa newline
+    with open(path, "a") as f:
+        f.write('{"i": 2, "nama": "sa')
+
+    reopened = DiskSpool(str(path))
+    assert len(reopened) == 2
+    assert reopened.peek(10) == [{"i": 0}, {"i": 1}]
+
+    # Record baru tidak tersambung ke baris rusak dan ikut terbaca
+    reopened.extend([{"i": 3}])
+    assert reopened.peek(10) == [{"i": 0}, {"i": 1}, {"i": 3}]
+    reopened.discard(2)
+    assert reopened.peek(10) == [{"i": 3}] and len(reopened) == 1
+
+
+def test_corrupt_line_in_the_middle_keeps_peek_and_discard_in_sync(tmp_path):
+    path = tmp_path / "spool.jsonl"
+    path.write_text("\n".join([json.dumps({"i": 0}), '{"i": 1', json.dumps({"i": 2})]) + "\n")
+    spool = DiskSpool(str(path))
+    assert spool.peek(10) == [{"i": 0}, {"i": 2}]
+    spool.discard(len(spool.peek(1)))
+    assert spool.peek(10) == [{"i": 2}]
@@ -0,0 +1,110 @@
+"""
+Test helper inferensi tiled (tiling.py): pembagian tile dan penggabungan deteksi.
+
+Jalankan: python -m pytest -q test_tiling.py
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tiling import compute_tiles, merge_detections, run_tiled_inference
+
+
+def coverage(tiles, height, width):
+    mask = np.zeros((height, width), dtype=int)
+    for x1, y1, x2, y2 in tiles:
+        mask[y1:y2, x1:x2] += 1
+    return mask
+
+
+@pytest.mark.parametrize("height, width", [(2160, 3840), (1080, 1920), (700, 1000), (641, 1281)])
+def test_tiles_cover_the_whole_image_and_touch_the_edges(height, width):
+    tiles = compute_tiles(height, width, tile_size=640, overlap=0.2)
+    assert (coverage(tiles, height, width) >= 1).all()
+    assert all(x2 - x1 == 640 and y2 - y1 == 640 for x1, y1, x2, y2 in tiles)
+    # Tile terakhir menempel ke tepi kanan dan bawah, tidak melewatinya
+    assert max(x2 for _, _, x2, _ in tiles) == width
+    assert max(y2 for _, _, _, y2 in tiles) == height
+    assert min(x1 for x1, _, _, _ in tiles) == 0 and min(y1 for _, y1, _, _ in tiles) == 0
+
+
+def test_neighbouring_tiles_overlap_by_at_least_the_requested_amount():
+    tiles = compute_tiles(640, 3000, tile_size=640, overlap=0.25)
+    starts = sorted(x1 for x1, _, _, _ in tiles)
+    assert all(b - a <= 640 * 0.75 for a, b in zip(starts, starts[1:]))
+
+
+def test_small_image_uses_a_single_clipped_tile():
+    assert compute_tiles(480, 600, tile_size=640) == [(0, 0, 600, 480)]
+    assert compute_tiles(480, 1000, tile_size=640, overlap=0.5) == [(0, 0, 640, 480), (320, 0, 960, 480),
+                                                                    (360, 0, 1000, 480)]
+
+
+@pytest.mark.parametrize("tile_size, overlap", [(0, 0.2), (640, 1.0), (640, -0.1)])
+def test_invalid_tile_options_raise(tile_size, overlap):
+    with pytest.raises(ValueError):
+        compute_tiles(1080, 1920, tile_size, overlap)
+
+
+def test_duplicate_detections_from_overlapping_tiles_are_merged():
+    preds = np.array([
+        [100, 100, 200, 200, 0.9, 0],   # objek utuh di tile kiri
+        [102, 101, 201, 199, 0.8, 0],   # objek yang sama dari tile kanan
+        [500, 500, 560, 560, 0.7, 0],   # objek lain
+    ], dtype=np.float32)
+    merged = merge_detections(preds)
+    assert len(merged) == 2
+    assert merged[0, 4] == pytest.approx(0.9)
+
+
+def test_edge_fragment_merges_with_ios_but_not_with_iou():
+    preds = np.array([
+        [100, 100, 300, 200, 0.9, 0],   # deteksi utuh
+        [250, 100, 300, 200, 0.6, 0],   # potongan objek di tepi tile
+    ], dtype=np.float32)
+    assert len(merge_detections(preds, match_metric="ios")) == 1
+    assert len(merge_detections(preds, match_metric="iou")) == 2
+
+
+def test_different_classes_are_not_merged_and_empty_input_is_kept():
+    preds = np.array([
+        [100, 100, 200, 200, 0.9, 0],
+        [100, 100, 200, 200, 0.8, 1],
+    ], dtype=np.float32)
+    assert sorted(merge_detections(preds)[:, 5]) == [0, 1]
+    assert merge_detections(np.zeros((0, 6), dtype=np.float32)).shape == (0, 6)
+
+
+class FakeTensor:
+    def __init__(self, array):
+        self.array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array.copy()
+
+
+class FakeModel:
+    """Model palsu: satu deteksi di koordinat tile (10, 10, 50, 50) untuk setiap input"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, crops, size):
+        self.batches.append([crop.shape for crop in crops])
+        pred = np.array([[10, 10, 50, 50, 0.9, 0]], dtype=np.float32)
+        return type("Results", (), {"xyxy": [FakeTensor(pred) for _ in crops], "names": {0: "sapi"}})()
+
+
+def test_tiled_inference_runs_one_batch_and_maps_boxes_to_image_coordinates():
+    model = FakeModel()
+    image = np.zeros((640, 1200, 3), dtype=np.uint8)
+    preds, names = run_tiled_inference(model, image, tile_size=640, overlap=0.2)
+
+    # Tiga tile (x = 0, 512, 560) + frame penuh dalam satu panggilan model
+    assert model.batches == [[(640, 640, 3)] * 3 + [(640, 1200, 3)]]
+    assert names == {0: "sapi"}
+    # Box digeser sejauh posisi tile; box frame penuh tergabung dengan box tile pertama
+    assert sorted(preds[:, 0].tolist()) == [10.0, 522.0, 570.0]
@@ -0,0 +1,113 @@
+"""
+Helper untuk inferensi tiled (sliced) pada gambar resolusi tinggi.
+
+Gambar besar (misalnya 4K dari kamera kandang) dipotong menjadi tile yang
+saling tumpang tindih, semua tile diproses sebagai satu batch oleh model YOLO,
+lalu hasilnya digabung kembali ke koordinat gambar asli dengan NMS lintas tile.
+"""
+import numpy as np
+
+# Nilai default untuk mode tiled
+DEFAULT_TILE_SIZE = 640
+DEFAULT_TILE_OVERLAP = 0.2
+DEFAULT_MERGE_IOU = 0.5
+
+
+def compute_tiles(height, width, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP):
+    """Hitung koordinat tile (x1, y1, x2, y2) yang menutupi seluruh gambar"""
+    if tile_size <= 0:
+        raise ValueError("tile_size harus lebih besar dari 0")
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap harus di antara 0 dan 1")
+
+    stride = max(1, int(tile_size * (1 - overlap)))
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, stride))
+        # Tile terakhir selalu menempel ke tepi gambar
+        positions.append(length - tile_size)
+        return positions
+
+    tiles = []
+    for y in starts(height):
+        for x in starts(width):
+            tiles.append((x, y, min(x + tile_size, width), min(y + tile_size, height)))
+    return tiles
+
+
+def merge_detections(preds, iou_threshold=DEFAULT_MERGE_IOU, match_metric="ios"):
+    """NMS per kelas untuk menggabungkan deteksi dari tile yang tumpang tindih.
+
+    preds berupa array Nx6 (x1, y1, x2, y2, conf, cls). Dengan match_metric "ios"
+    (intersection over smaller) potongan objek di tepi tile ikut tergabung dengan
+    deteksi utuhnya, sesuatu yang sering lolos dari IoU biasa.
+    """
+    if len(preds) == 0:
+        return preds.reshape(0, 6)
+
+    # Geser box per kelas supaya NMS tidak menggabungkan kelas yang berbeda
+    offsets = preds[:, 5:6] * (preds[:, :4].max() + 1)
+    boxes = preds[:, :4] + offsets
+    scores = preds[:, 4]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+
+        if match_metric == "ios":
+            denom = np.minimum(areas[i], areas[rest])
+        else:
+            denom = areas[i] + areas[rest] - inter
+        overlap = inter / np.maximum(denom, 1e-9)
+
+        order = rest[overlap <= iou_threshold]
+
+    return preds[np.array(keep)]
+
+
+def run_tiled_inference(model, image, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP,
+                        iou_threshold=DEFAULT_MERGE_IOU, include_full_frame=True):
+    """Jalankan model YOLOv5 (torch.hub) pada tile gambar dalam satu batch.
+
+    Mengembalikan tuple (preds, names) dengan preds array Nx6 dalam koordinat
+    gambar asli, format yang sama dengan results.xyxy[0].
+    """
+    height, width = image.shape[:2]
+    tiles = compute_tiles(height, width, tile_size, overlap)
+
+    crops = [np.ascontiguousarray(image[y1:y2, x1:x2]) for x1, y1, x2, y2 in tiles]
+    offsets = [(x1, y1) for x1, y1, _, _ in tiles]
+
+    # Frame penuh ikut diproses agar objek besar yang terpotong tile tetap terdeteksi
+    if include_full_frame and len(tiles) > 1:
+        crops.append(image)
+        offsets.append((0, 0))
+
+    results = model(crops, size=tile_size)
+
+    merged = []
+    for pred, (dx, dy) in zip(results.xyxy, offsets):
+        pred = pred.cpu().numpy()
+        if len(pred) == 0:
+            continue
+        pred[:, [0, 2]] += dx
+        pred[:, [1, 3]] += dy
+        merged.append(pred)
+
+    if not merged:
+        return np.zeros((0, 6), dtype=np.float32), results.names
+
+    preds = merge_detections(np.concatenate(merged), iou_threshold)
+    return preds, results.names
@@ -0,0 +1,54 @@
+"""
+Load model YOLOv5 lewat torch.hub tanpa bergantung pada jaringan.
+
+Repo YOLOv5 diambil dari clone lokal (models/yolov5 atau FACTS_YOLOV5_DIR)
+jika ada; jika tidak, dari GitHub yang cukup diunduh sekali ke cache hub di
+models/hub. Bobot yolov5s disimpan di models/yolov5s.pt. Dipakai app.py,
+test_models.py, dan skrip benchmark (model, tiling, render).
+"""
+import os
+
+import torch
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+# Bobot default dan repo YOLOv5 disimpan lokal agar load model tidak butuh jaringan.
+# Isi models/yolov5 dengan clone github.com/ultralytics/yolov5 untuk mode offline penuh.
+DEFAULT_WEIGHTS = os.path.join(MODEL_DIR, "yolov5s.pt")
+YOLOV5_REPO_DIR = os.environ.get("FACTS_YOLOV5_DIR", os.path.join(MODEL_DIR, "yolov5"))
+
+# Model per jenis ternak
+SPECIES_MODELS = {
+    "sapi": os.path.join(MODEL_DIR, "sapi.pt"),
+    "ayam": os.path.join(MODEL_DIR, "ayam.pt"),
+    "kambing": os.path.join(MODEL_DIR, "kambing.pt"),
+}
+
+os.makedirs(MODEL_DIR, exist_ok=True)
+torch.hub.set_dir(os.path.join(MODEL_DIR, "hub"))
+
+
+def hub_source():
+    """Sumber repo YOLOv5 untuk torch.hub: clone lokal jika ada, jika tidak GitHub (cache)"""
+    if os.path.isfile(os.path.join(YOLOV5_REPO_DIR, "hubconf.py")):
+        return YOLOV5_REPO_DIR, "local"
+    return "ultralytics/yolov5", "github"
+
+
+def hub_load(weights_path, device=None):
+    """Load model YOLOv5 dari file bobot lokal tanpa validasi ke GitHub"""
+    repo, source = hub_source()
+    options = {"path": weights_path}
+    if device is not None:
+        options["device"] = device
+    if source == "local":
+        return torch.hub.load(repo, 'custom', source="local", **options)
+    # Repo GitHub yang sudah ada di cache hub dipakai ulang tanpa memanggil API GitHub
+    return torch.hub.load(repo, 'custom', skip_validation=True, **options)
+
+
+def model_path(name):
+    """Path bobot untuk nama model (jenis ternak atau 'yolov5s')"""
+    if name == "yolov5s":
+        return DEFAULT_WEIGHTS
+    return SPECIES_MODELS.get(name, name)